@@ -8,14 +8,28 @@ Main bot entry point.
 """
 
 import os
+import time
+import asyncio
 import logging
 from pathlib import Path
+
+# Taken before the heavier imports below, for the start-to-READY log line
+START_TIME = time.monotonic()
+
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
 # Import secrets management
 from utils.secrets import get_secret
+from utils.http_client import get_http_client
+from utils.story_index import StoryIndex
+from utils.outbox import Outbox
+from utils.response_cache import ResponseCache, DEFAULT_TTL
+from utils.parse_pool import get_parse_pool
+from utils.scheduler import Scheduler, DEFAULT_MAX_CONCURRENT
+from utils.cog_loader import cog_manifest, load_cogs
+from cogs import COG_MANIFEST
 
 # Set up logging
 logging.basicConfig(
@@ -56,30 +70,79 @@ class PenguinOverlord(commands.Bot):
         
         # Completely disable the default help command
         self.help_command = None
+        
+        # Shared pooled HTTP client used by all cogs
+        self.http_client = get_http_client()
+        
+        # Near-duplicate index of posted stories, shared with the news runners
+        self.story_index = StoryIndex('data/story_index.db')
+        
+        # Single timer for all periodic cog jobs (auto-posters, pollers)
+        self.scheduler = Scheduler(
+            max_concurrent=int(os.getenv('SCHEDULER_MAX_CONCURRENT', DEFAULT_MAX_CONCURRENT))
+        )
+        
+        # Queued news/alert posts, shared with the runners; failed sends are retried every minute
+        self.outbox = Outbox('data/outbox.db')
+        self.scheduler.register('outbox', self.drain_outbox, interval=60, jitter=0)
+        
+        # Results of manual fetch commands (/cve), shared by users asking within the TTL
+        self.response_cache = ResponseCache(ttl=int(os.getenv('RESPONSE_CACHE_TTL', DEFAULT_TTL)))
+        
+        # Background load of the cogs COG_MANIFEST marks as deferred
+        self.deferred_cogs = None
+        self._ready_logged = False
     
     async def setup_hook(self):
-        """Load extensions/cogs when bot starts."""
-        logger.info("Loading extensions...")
-        
-        # Load all cogs from the cogs directory
+        """Load eager cogs now and deferred cogs once the bot is ready."""
+        eager, deferred = [], []
         cogs_path = Path(__file__).parent / 'cogs'
         if cogs_path.exists():
-            for file in cogs_path.glob('*.py'):
-                if file.name.startswith('_'):
-                    continue
-                
-                try:
-                    await self.load_extension(f'cogs.{file.stem}')
-                    logger.info(f"✓ Loaded extension: {file.stem}")
-                except Exception as e:
-                    logger.error(f"✗ Failed to load extension {file.stem}: {e}")
+            eager, deferred = cog_manifest(cogs_path, COG_MANIFEST)
+        
+        logger.info(f"Loading {len(eager)} extension(s), deferring {len(deferred)}...")
+        await load_cogs(self, eager)
+        self.deferred_cogs = asyncio.create_task(self._load_deferred_cogs(deferred))
+        
+        # Jobs of deferred cogs register as they load; the first runs wait for the gateway
+        self.scheduler.start(self.wait_until_ready)
+    
+    async def _load_deferred_cogs(self, names: list):
+        await self.wait_until_ready()
+        await load_cogs(self, names)
+    
+    async def wait_for_cogs(self):
+        """Wait until the deferred cogs have finished loading."""
+        if self.deferred_cogs and not self.deferred_cogs.done():
+            await asyncio.shield(self.deferred_cogs)
+    
+    async def drain_outbox(self) -> int:
+        """Deliver due outbox messages to the channels this bot can see (webhook rows are left to runners)."""
+        return await self.outbox.drain(
+            self.get_channel,
+            story_index=self.story_index,
+            channels_only=True
+        )
+    
+    async def close(self):
+        """Stop scheduled jobs and close the shared HTTP pool, story index, outbox and parse workers."""
+        await self.scheduler.close()
+        await self.http_client.close()
+        self.story_index.close()
+        self.outbox.close()
+        get_parse_pool().close()
+        await super().close()
     
     async def on_ready(self):
         """Called when the bot is ready."""
         logger.info(f'🐧 {self.user} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guild(s)')
+        if not self._ready_logged:
+            logger.info(f"Ready {time.monotonic() - START_TIME:.1f}s after start")
+            self._ready_logged = True
         
-        # Sync slash commands with Discord
+        # Sync slash commands with Discord, including the deferred cogs'
+        await self.wait_for_cogs()
         try:
             synced = await self.tree.sync()
             logger.info(f"✓ Synced {len(synced)} slash command(s)")
@@ -97,6 +160,10 @@ class PenguinOverlord(commands.Bot):
     async def on_command_error(self, ctx, error):
         """Handle command errors."""
         if isinstance(error, commands.CommandNotFound):
+            # The command may belong to a deferred cog that is still loading
+            if self.deferred_cogs and not self.deferred_cogs.done():
+                await self.wait_for_cogs()
+                await self.process_commands(ctx.message)
             return
         
         if isinstance(error, commands.MissingRequiredArgument):
@@ -1 +1,38 @@
 # This file makes the cogs directory a Python package
+
+# When each cog loads (see utils/cog_loader.py). 'eager' cogs load in
+# setup_hook, before the bot connects; 'deferred' cogs load once the bot is
+# ready. Cogs missing from this manifest load eagerly.
+COG_MANIFEST = {
+    # Owner tools and help must work as soon as the bot is online
+    'admin': 'eager',
+    'help_categorized': 'eager',
+    'scheduler_status': 'eager',
+
+    # News: the scheduler waits for READY anyway, and NewsManager applies
+    # schedule overrides whichever of it and the posting cogs loads first
+    'news_manager': 'deferred',
+    'apple_google_news': 'deferred',
+    'cve': 'deferred',
+    'cybersecurity_news': 'deferred',
+    'eu_legislation': 'deferred',
+    'gaming_news': 'deferred',
+    'general_news': 'deferred',
+    'kev': 'deferred',
+    'tech_news': 'deferred',
+    'uk_legislation': 'deferred',
+    'us_legislation': 'deferred',
+
+    # Fun and reference commands, including the large quote/manpage tables
+    'comics': 'deferred',
+    'eventpinger': 'deferred',
+    'fortune': 'deferred',
+    'manpage': 'deferred',
+    'patchgremlin': 'deferred',
+    'planespotter': 'deferred',
+    'radiohead': 'deferred',
+    'sigint': 'deferred',
+    'techquote': 'deferred',
+    'xkcd': 'deferred',
+    'xkcd_poster': 'deferred',
+}
@@ -10,6 +10,7 @@ import logging
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
+from utils.secrets import refresh_secrets
 
 logger = logging.getLogger(__name__)
 
@@ -122,6 +123,19 @@ class Admin(commands.Cog):
             await ctx.send(f"❌ Failed to sync commands: {e}")
             logger.error(f"Manual sync failed: {e}")
     
+    @commands.command(name='refreshsecrets', hidden=True)
+    @commands.is_owner()
+    async def refreshsecrets(self, ctx: commands.Context):
+        """
+        Drop cached Doppler/AWS/Vault secrets so rotated values are picked up (owner only).
+        
+        Usage:
+            !refreshsecrets - Next secret lookups fetch from the backends again
+        """
+        dropped = refresh_secrets()
+        await ctx.send(f"🔑 Dropped {dropped} cached secret set(s); they will be re-fetched on next use.")
+        logger.info(f"Secrets cache refreshed by {ctx.author} ({dropped} snapshot(s) dropped)")
+    
     @commands.hybrid_command(name='source_code', description='Get the link to the bot source code')
     async def source_code(self, ctx: commands.Context):
         """
@@ -395,7 +409,10 @@ class Admin(commands.Cog):
         )
         embed.add_field(
             name="🔧 Admin Commands (Owner Only)",
-            value="`!sync` - Manually sync slash commands with Discord",
+            value=(
+                "`!sync` - Manually sync slash commands with Discord\n"
+                "`!refreshsecrets` - Re-fetch secrets from the secrets manager"
+            ),
             inline=False
         )
         embed.add_field(
@@ -24,14 +24,14 @@ Admin commands:
 import os
 import json
 import random
-import asyncio
 import logging
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 
-import aiohttp
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+
+from utils.http_client import API_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +50,6 @@ class Comics(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.session = None
-        self._session_lock = asyncio.Lock()
         self.state_file = Path(self.STATE_PATH)
         
         # Ensure data directory exists
@@ -73,28 +72,23 @@ class Comics(commands.Cog):
         if env_chan and env_chan.isdigit():
             self.state['channel_id'] = int(env_chan)
         
-        # Start daily poster (9 AM UTC)
-        self.daily_comic_poster.start()
+        # Daily at 9 AM UTC; a day missed while the bot was down is not made up
+        bot.scheduler.register(
+            'daily_comic', self.daily_comic_poster,
+            interval=24 * 3600, offset=9 * 3600, catch_up='skip'
+        )
     
     async def _ensure_session(self):
-        """Ensure aiohttp session is created"""
-        if self.session is None or self.session.closed:
-            async with self._session_lock:
-                if self.session is None or self.session.closed:
-                    self.session = aiohttp.ClientSession()
+        """Get the bot's shared aiohttp session"""
+        self.session = await self.bot.http_client.get_session()
     
     async def cog_load(self):
-        """Initialize aiohttp session when cog loads"""
+        """Attach the shared aiohttp session when cog loads"""
         await self._ensure_session()
     
     async def cog_unload(self):
         """Cleanup when cog unloads"""
-        try:
-            self.daily_comic_poster.cancel()
-        except Exception:
-            pass
-        if self.session:
-            await self.session.close()
+        self.bot.scheduler.unregister('daily_comic')
     
     def _write_state(self):
         try:
@@ -107,7 +101,7 @@ class Comics(commands.Cog):
         """Fetch latest XKCD comic via JSON API"""
         await self._ensure_session()
         try:
-            async with self.session.get(self.XKCD_API, timeout=15) as resp:
+            async with self.session.get(self.XKCD_API, timeout=API_TIMEOUT) as resp:
                 if resp.status != 200:
                     return None
                 
@@ -128,7 +122,7 @@ class Comics(commands.Cog):
         """Fetch latest Joy of Tech comic via RSS"""
         await self._ensure_session()
         try:
-            async with self.session.get(self.JOYOFTECH_RSS, timeout=15) as resp:
+            async with self.session.get(self.JOYOFTECH_RSS, timeout=API_TIMEOUT) as resp:
                 if resp.status != 200:
                     return None
                 
@@ -162,7 +156,7 @@ class Comics(commands.Cog):
         """Fetch latest TurnOff.us comic via RSS"""
         await self._ensure_session()
         try:
-            async with self.session.get(self.TURNOFF_RSS, timeout=15) as resp:
+            async with self.session.get(self.TURNOFF_RSS, timeout=API_TIMEOUT) as resp:
                 if resp.status != 200:
                     return None
                 
@@ -199,7 +193,7 @@ class Comics(commands.Cog):
         await self._ensure_session()
         try:
             url = f"https://www.explainxkcd.com/wiki/api.php?action=query&prop=extracts&exintro&explaintext&titles={comic_num}&format=json"
-            async with self.session.get(url, timeout=15) as resp:
+            async with self.session.get(url, timeout=API_TIMEOUT) as resp:
                 if resp.status != 200:
                     return None
                 
@@ -305,7 +299,6 @@ class Comics(commands.Cog):
         else:
             await ctx.send(f"❌ Could not find explanation for XKCD #{comic_number}")
     
-    @tasks.loop(hours=24)
     async def daily_comic_poster(self):
         """Post a daily tech comic at 9 AM UTC"""
         try:
@@ -345,22 +338,6 @@ class Comics(commands.Cog):
         except Exception:
             logger.exception('Error in daily comic poster')
     
-    @daily_comic_poster.before_loop
-    async def before_daily_poster(self):
-        """Wait until 9 AM UTC"""
-        await self.bot.wait_until_ready()
-        
-        now = datetime.utcnow()
-        target = now.replace(hour=9, minute=0, second=0, microsecond=0)
-        
-        # If it's past 9 AM today, target tomorrow
-        if now.hour >= 9:
-            target += timedelta(days=1)
-        
-        wait_seconds = (target - now).total_seconds()
-        logger.info('Daily comic poster will start in %d seconds (at 9 AM UTC)', wait_seconds)
-        await asyncio.sleep(wait_seconds)
-    
     @commands.hybrid_command(name='daily_comic', description='Force post daily comic now')
     async def daily_comic(self, ctx: commands.Context):
         """Force post today's tech comic"""
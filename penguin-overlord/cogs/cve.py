@@ -7,24 +7,47 @@ CVE Cog - Tracks and posts Common Vulnerabilities and Exposures from NVD and Ubu
 For CISA Known Exploited Vulnerabilities (high priority), see the KEV cog.
 """
 
+import asyncio
 import logging
 import discord
-from discord.ext import commands, tasks
-import aiohttp
+from discord import app_commands
+from discord.ext import commands
 import re
 import json
 import os
+import time
 import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+from datetime import datetime
 from html import unescape
+from utils.http_client import API_TIMEOUT
+from utils.parse_pool import parse_xml
+from utils.dedup import SeenCache
+from utils.outbox import outbox_key
+from utils.nvd_sync import DATE_FORMAT, NVD_URL, fetch_nvd_latest, nvd_item
+from utils.cve_mirror import CVEMirror, record_item
+from utils.secrets import get_secret
 
 logger = logging.getLogger(__name__)
 
+# Posted CVE IDs remembered (count and seconds since last seen in a source)
+POSTED_CVE_LIMIT = 1000
+POSTED_CVE_MAX_AGE = 90 * 24 * 3600
+
+# Newest newly published NVD CVEs posted per run (after a long outage the rest are skipped)
+NVD_POST_LIMIT = 50
+
+# A CVE first seen by the mirror is only posted if published within this long before the
+# previous run (older ones are re-analysed CVEs or backfill, not news)
+NVD_PUBLISHED_SLACK = 2 * 24 * 3600
+
+# Matches listed per /cve search or product reply
+CVE_RESULT_LIMIT = 10
+
 
 CVE_SOURCES = {
     'nvd': {
         'name': 'NVD Recent CVEs',
-        'url': 'https://services.nvd.nist.gov/rest/json/cves/2.0',
+        'url': NVD_URL,
         'type': 'json_api',
         'color': 0x1C4E80,
         'icon': '📊'
@@ -49,7 +72,9 @@ class CVENews(commands.Cog):
         self.session = None
         self.state_file = 'data/cve_state.json'
         self.state = self._load_state()
-        self.cve_auto_poster.start()
+        self.mirror = CVEMirror()
+        self.backfill_task = None
+        bot.scheduler.register('cve', self.cve_auto_poster, interval=8 * 3600)
     
     def _load_state(self):
         """Load CVE poster state from file."""
@@ -76,75 +101,53 @@ class CVENews(commands.Cog):
             logger.error(f"Error saving CVE state: {e}")
     
     async def cog_load(self):
-        """Create aiohttp session when cog loads."""
-        self.session = aiohttp.ClientSession()
+        """Attach the bot's shared aiohttp session when cog loads."""
+        self.session = await self.bot.http_client.get_session()
+        # Separate from the auto-poster so the mirror stays current while posting is off
+        self.bot.scheduler.register('cve_mirror', self.sync_mirror, interval=2 * 3600)
     
     def cog_unload(self):
-        """Close aiohttp session and stop auto-poster when cog unloads."""
-        self.cve_auto_poster.cancel()
-        if self.session:
-            self.bot.loop.create_task(self.session.close())
+        """Stop auto-poster and mirror sync when cog unloads."""
+        self.bot.scheduler.unregister('cve')
+        self.bot.scheduler.unregister('cve_mirror')
+        if self.backfill_task:
+            self.backfill_task.cancel()
+        self.mirror.close()
+    
+    def _nvd_api_key(self):
+        """Optional NVD API key (NVD_API_KEY), for the higher rate limit."""
+        return get_secret('NVD', 'api_key')
+    
+    async def sync_mirror(self):
+        """Apply NVD changes since the last sync to the local CVE mirror."""
+        await self.mirror.sync(self.session, api_key=self._nvd_api_key())
     
     async def _fetch_nvd_cves(self) -> list:
-        """Fetch recent CVEs from NVD (last 7 days)."""
-        try:
-            # Build URL with date parameters for recent CVEs
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=7)
-            
-            start_str = start_date.strftime('%Y-%m-%dT%H:%M:%S.000')
-            end_str = end_date.strftime('%Y-%m-%dT%H:%M:%S.000')
-            
-            url = f"{CVE_SOURCES['nvd']['url']}?pubStartDate={start_str}&pubEndDate={end_str}&resultsPerPage=10"
-            
-            async with self.session.get(url, timeout=15) as resp:
-                if resp.status != 200:
-                    logger.warning(f"Failed to fetch NVD CVEs: HTTP {resp.status}")
-                    return []
-                
-                data = await resp.json()
-                vulnerabilities = data.get('vulnerabilities', [])
-                
-                items = []
-                for vuln_wrapper in vulnerabilities[:5]:  # Get latest 5
-                    vuln = vuln_wrapper.get('cve', {})
-                    cve_id = vuln.get('id', 'Unknown')
-                    
-                    # Get description
-                    descriptions = vuln.get('descriptions', [])
-                    desc = next((d['value'] for d in descriptions if d.get('lang') == 'en'), 'No description')
-                    desc = desc[:300] + '...' if len(desc) > 300 else desc
-                    
-                    # Get CVSS score if available
-                    metrics = vuln.get('metrics', {})
-                    cvss_data = metrics.get('cvssMetricV31', [])
-                    severity = 'UNKNOWN'
-                    if cvss_data:
-                        severity = cvss_data[0].get('cvssData', {}).get('baseSeverity', 'UNKNOWN')
-                    
-                    # Get published date
-                    published = vuln.get('published', '')
-                    
-                    items.append({
-                        'cve_id': cve_id,
-                        'title': f"CVE {cve_id}",
-                        'description': desc,
-                        'severity': severity,
-                        'date_added': published,
-                        'source': 'nvd',
-                        'link': f"https://nvd.nist.gov/vuln/detail/{cve_id}"
-                    })
-                
-                return items
+        """Fetch the 5 newest CVEs published on NVD in the last 7 days."""
+        cves = await fetch_nvd_latest(self.session, count=5, api_key=self._nvd_api_key())
+        return [nvd_item(cve) for cve in cves]
+    
+    async def _sync_nvd_cves(self) -> list:
+        """
+        Fetch the CVEs published on NVD since the last run, newest first.
         
-        except Exception as e:
-            logger.error(f"Error fetching NVD CVEs: {e}")
-            return []
+        The mirror requests only the lastModified window since its last sync
+        (every page of it); the CVEs it has seen for the first time since this
+        poster's previous run are the new ones.
+        """
+        since = self.state.get('nvd_seen_through', time.time())
+        await self.sync_mirror()
+        until = time.time()
+        
+        published_after = datetime.utcfromtimestamp(since - NVD_PUBLISHED_SLACK).strftime(DATE_FORMAT)
+        records = self.mirror.first_seen_between(since, until, published_after, limit=NVD_POST_LIMIT)
+        self.state['nvd_seen_through'] = until
+        return [record_item(record) for record in records]
     
     async def _fetch_ubuntu_cves(self) -> list:
         """Fetch Ubuntu Security Notices."""
         try:
-            async with self.session.get(CVE_SOURCES['ubuntu']['url'], timeout=15) as resp:
+            async with self.session.get(CVE_SOURCES['ubuntu']['url'], timeout=API_TIMEOUT) as resp:
                 if resp.status != 200:
                     logger.warning(f"Failed to fetch Ubuntu USN: HTTP {resp.status}")
                     return []
@@ -155,7 +158,7 @@ class CVENews(commands.Cog):
                 # Fix for: RSS feeds with item tag attributes
                 items = []
                 try:
-                    root = ET.fromstring(content)
+                    root = await parse_xml(content)
                 except ET.ParseError as e:
                     logger.error(f"Ubuntu USN: XML parse error: {e}")
                     return []
@@ -228,7 +231,8 @@ class CVENews(commands.Cog):
         else:
             return '⚪'
     
-    @commands.hybrid_command(name='cve', description='Get recent CVEs from NVD and Ubuntu')
+    @commands.hybrid_group(name='cve', fallback='latest', invoke_without_command=True,
+                           description='Get recent CVEs from NVD and Ubuntu')
     async def cve(self, ctx: commands.Context, source: str = None):
         """
         Get recent Common Vulnerabilities and Exposures.
@@ -239,6 +243,7 @@ class CVENews(commands.Cog):
             !cve                - Get CVEs from all sources (NVD + Ubuntu)
             !cve nvd           - Get recent NVD CVEs
             !cve ubuntu        - Get Ubuntu Security Notices
+            /cve latest source:nvd
         """
         await ctx.defer()
         
@@ -253,10 +258,12 @@ class CVENews(commands.Cog):
         else:
             sources_to_fetch = list(CVE_SOURCES.keys())
         
-        all_items = []
-        for src in sources_to_fetch:
-            items = await self._fetch_cves(src)
-            all_items.extend(items)
+        # Sources fetched concurrently; repeated or simultaneous requests share one fetch
+        results = await asyncio.gather(*(
+            self.bot.response_cache.get(('cve', src), lambda src=src: self._fetch_cves(src))
+            for src in sources_to_fetch
+        ))
+        all_items = [item for items in results for item in items]
         
         if not all_items:
             await ctx.send("❌ No CVEs found. Sources may be temporarily unavailable.")
@@ -294,7 +301,137 @@ class CVENews(commands.Cog):
             
             await ctx.send(embed=embed)
     
-    @tasks.loop(hours=8)
+    def _record_embed(self, record: dict) -> discord.Embed:
+        """Full details of one mirrored CVE."""
+        src_info = CVE_SOURCES['nvd']
+        item = record_item(record)
+        
+        embed = discord.Embed(
+            title=f"{src_info['icon']} {record['id']}",
+            url=item['link'],
+            description=(record['description'] or 'No description')[:1000],
+            color=src_info['color']
+        )
+        
+        for version in ('cvss3', 'cvss4'):
+            if record[f'{version}_score'] is not None:
+                severity = record[f'{version}_severity'] or 'UNKNOWN'
+                embed.add_field(
+                    name=f"CVSS {'v3' if version == 'cvss3' else 'v4'}",
+                    value=f"{self._get_severity_emoji(severity)} {record[f'{version}_score']} {severity}\n"
+                          f"`{record[f'{version}_vector']}`",
+                    inline=True
+                )
+        
+        embed.add_field(
+            name="Published / Modified",
+            value=f"{(record['published'] or '?')[:10]} / {(record['last_modified'] or '?')[:10]}",
+            inline=False
+        )
+        
+        if record['cpes']:
+            cpes = [f"`{cpe}`" for cpe in record['cpes'][:5]]
+            if len(record['cpes']) > 5:
+                cpes.append(f"…and {len(record['cpes']) - 5} more")
+            embed.add_field(name="Affected (CPE)", value="\n".join(cpes)[:1024], inline=False)
+        
+        if record['refs']:
+            embed.add_field(name="References", value="\n".join(record['refs'][:3])[:1024], inline=False)
+        
+        embed.set_footer(text=f"Source: {src_info['name']} • Local mirror")
+        return embed
+    
+    def _records_embed(self, title: str, records: list, empty: str) -> discord.Embed:
+        """List mirrored CVEs, one line each."""
+        src_info = CVE_SOURCES['nvd']
+        lines = []
+        for record in records:
+            item = record_item(record)
+            lines.append(
+                f"{self._get_severity_emoji(item['severity'])} **[{record['id']}]({item['link']})** "
+                f"({item['date_added'][:10]}) {item['description'][:120]}"
+            )
+        
+        embed = discord.Embed(
+            title=f"{src_info['icon']} {title}",
+            description="\n\n".join(lines)[:4000] if lines else empty,
+            color=src_info['color']
+        )
+        embed.set_footer(text=f"Source: {src_info['name']} • {self.mirror.count()} CVEs in the local mirror")
+        return embed
+    
+    @cve.command(name='id', description='Look up a CVE in the local mirror')
+    @app_commands.describe(cve_id='CVE ID, e.g. CVE-2024-3094')
+    async def cve_id(self, ctx: commands.Context, cve_id: str):
+        """
+        Show a CVE's details from the local mirror (no upstream call).
+        
+        Usage:
+            !cve id CVE-2024-3094
+            /cve id cve_id:CVE-2024-3094
+        """
+        record = self.mirror.get(cve_id)
+        if not record:
+            await ctx.send(f"❌ `{cve_id[:30]}` is not in the local CVE mirror.")
+            return
+        await ctx.send(embed=self._record_embed(record))
+    
+    @cve.command(name='search', description='Full-text search of the local CVE mirror')
+    @app_commands.describe(query='Words to look for, e.g. "openssh race condition"')
+    async def cve_search(self, ctx: commands.Context, *, query: str):
+        """
+        Search CVE descriptions and affected products in the local mirror.
+        
+        Usage:
+            !cve search openssh race condition
+            /cve search query:xz backdoor
+        """
+        records = self.mirror.search(query, limit=CVE_RESULT_LIMIT)
+        await ctx.send(embed=self._records_embed(
+            f"CVEs matching \"{query[:50]}\"", records, f"No CVEs in the local mirror match **{query[:50]}**."
+        ))
+    
+    @cve.command(name='product', description='List CVEs affecting a product or vendor')
+    @app_commands.describe(name='CPE product or vendor name, e.g. "http server" or apache')
+    async def cve_product(self, ctx: commands.Context, *, name: str):
+        """
+        List the newest CVEs whose CPEs name this product or vendor.
+        
+        Usage:
+            !cve product http_server
+            /cve product name:openssl
+        """
+        records = self.mirror.product(name, limit=CVE_RESULT_LIMIT)
+        await ctx.send(embed=self._records_embed(
+            f"Newest CVEs for {name[:50]}", records, f"No CVEs in the local mirror affect **{name[:50]}**."
+        ))
+    
+    @commands.hybrid_command(name='cve_backfill', description='Backfill the local CVE mirror from NVD')
+    @commands.is_owner()
+    async def cve_backfill(self, ctx: commands.Context, days: int = 365):
+        """
+        Add the CVEs last modified in the days before the mirror's first sync.
+        
+        Runs in the background; a multi-year backfill takes a while without
+        an NVD API key.
+        
+        Usage:
+            !cve_backfill 3650
+        
+        Requires: Bot owner only
+        """
+        if self.backfill_task and not self.backfill_task.done():
+            await ctx.send("⏳ A backfill is already running.")
+            return
+        
+        async def run():
+            delta = await self.mirror.backfill(self.session, days, api_key=self._nvd_api_key())
+            status = "✅ Backfill complete" if delta.status == 'updated' else "❌ Backfill failed (run it again to retry)"
+            await ctx.channel.send(f"{status}: {self.mirror.count()} CVEs in the local mirror.")
+        
+        self.backfill_task = asyncio.create_task(run())
+        await ctx.send(f"⏳ Backfilling {days} days of NVD changes into the local mirror...")
+    
     async def cve_auto_poster(self):
         """Automatically post new CVEs from NVD and Ubuntu."""
         try:
@@ -317,25 +454,27 @@ class CVENews(commands.Cog):
                 logger.warning(f"CVE auto-poster: Channel not found")
                 return
             
-            # Update interval dynamically
-            interval = config.get('interval_hours', 8)
-            if interval != self.cve_auto_poster.hours:
-                self.cve_auto_poster.change_interval(hours=interval)
-            
-            posted_cves = set(self.state.get('posted_cves', []))
+            posted_cves = SeenCache.from_state(
+                self.state.get('posted_cves'), POSTED_CVE_LIMIT, POSTED_CVE_MAX_AGE
+            )
             
-            # Post from each enabled source
+            # Collect new CVEs from each enabled source, then post them together
+            embeds = []
+            new_ids = []
             for source_key in CVE_SOURCES.keys():
                 if not manager.is_source_enabled('cve', source_key):
                     continue
                 
-                items = await self._fetch_cves(source_key)
+                if source_key == 'nvd':
+                    items = await self._sync_nvd_cves()
+                else:
+                    items = await self._fetch_cves(source_key)
                 
                 # Post only new CVEs we haven't posted before
                 for item in items:
                     cve_id = item['cve_id']
                     
-                    if cve_id not in posted_cves:
+                    if not posted_cves.touch(cve_id) and cve_id not in new_ids:
                         src_info = CVE_SOURCES[source_key]
                         severity_emoji = self._get_severity_emoji(item['severity'])
                         
@@ -361,27 +500,27 @@ class CVENews(commands.Cog):
                             )
                         
                         embed.set_footer(text=f"Source: {src_info['name']} • CVE Auto-Poster")
-                        
-                        await channel.send(embed=embed)
-                        
-                        posted_cves.add(cve_id)
-                        logger.info(f"CVE auto-poster: Posted {cve_id} from {source_key}")
+                        embeds.append(embed)
+                        new_ids.append(cve_id)
+            
+            # Queued in the high-priority outbox lane; a CVE counts as posted once delivered
+            keys = {outbox_key('cve', cve_id): cve_id for cve_id in new_ids}
+            for key, embed in zip(keys, embeds):
+                self.bot.outbox.enqueue(key, 'cve', embed, channel_id=channel_id, batch=config.get('batch_embeds', True))
+            if embeds:
+                await self.bot.drain_outbox()
+            for key in self.bot.outbox.delivered(keys):
+                posted_cves.add(keys[key])
+                logger.info(f"CVE auto-poster: Posted {keys[key]}")
             
-            # Keep only last 1000 CVE IDs to prevent state file from growing too large
-            self.state['posted_cves'] = list(posted_cves)[-1000:]
+            # Bounded by count and age so the state file can't grow without limit
+            self.state['posted_cves'] = posted_cves.to_dict()
             self.state['last_check'] = datetime.utcnow().isoformat()
             self._save_state()
         
         except Exception as e:
             logger.error(f"CVE auto-poster error: {e}")
     
-    @cve_auto_poster.before_loop
-    async def before_cve_auto_poster(self):
-        """Wait for the bot to be ready before starting the auto-poster."""
-        await self.bot.wait_until_ready()
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-    
     @commands.hybrid_command(name='cve_set_channel', description='Set the channel for automatic CVE updates')
     @commands.has_permissions(manage_guild=True)
     async def cve_set_channel(self, ctx: commands.Context, channel: discord.TextChannel = None):
@@ -422,8 +561,7 @@ class CVENews(commands.Cog):
         self.state['enabled'] = True
         self._save_state()
         
-        if not self.cve_auto_poster.is_running():
-            self.cve_auto_poster.start()
+        self.bot.scheduler.resume('cve', run_now=True)
         
         channel = self.bot.get_channel(self.state['channel_id'])
         await ctx.send(f"✅ CVE auto-posting **enabled** in {channel.mention if channel else 'the configured channel'}!\n"
@@ -445,8 +583,7 @@ class CVENews(commands.Cog):
         self.state['enabled'] = False
         self._save_state()
         
-        if self.cve_auto_poster.is_running():
-            self.cve_auto_poster.cancel()
+        self.bot.scheduler.pause('cve')
         
         await ctx.send("✅ CVE auto-posting **disabled**.")
     
@@ -501,6 +638,12 @@ class CVENews(commands.Cog):
             inline=True
         )
         
+        embed.add_field(
+            name="Local Mirror",
+            value=f"{self.mirror.count()} CVEs",
+            inline=True
+        )
+        
         # List sources
         source_list = []
         for src in sources:
@@ -12,7 +12,7 @@ import csv
 import os
 from datetime import datetime, timedelta
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 logger = logging.getLogger(__name__)
 
@@ -89,15 +89,13 @@ class EventPinger(commands.Cog):
         self.bot = bot
         self.events = []
         self.load_events()
-        # Start the background task to check for upcoming events
-        # Uncomment when ready to enable automatic reminders
-        # self.check_upcoming_events.start()
+        # Daily check for upcoming events, registered paused
+        # Resume the 'event_reminders' job when ready to enable automatic reminders
+        bot.scheduler.register('event_reminders', self.check_upcoming_events, interval=24 * 3600, paused=True)
     
     def cog_unload(self):
         """Clean up when cog is unloaded."""
-        # Cancel the background task if it's running
-        if hasattr(self, 'check_upcoming_events'):
-            self.check_upcoming_events.cancel()
+        self.bot.scheduler.unregister('event_reminders')
     
     def load_events(self):
         """Load all events from CSV files in the events folder."""
@@ -622,14 +620,13 @@ class EventPinger(commands.Cog):
         
         await ctx.send(embed=embed)
     
-    @tasks.loop(hours=24)
     async def check_upcoming_events(self):
         """
         Background task that checks for upcoming events and posts reminders.
         Runs once per day.
         
         This is currently disabled. To enable:
-        1. Uncomment the start call in __init__
+        1. Register the job unpaused in __init__
         2. Set up a channel ID where reminders should be posted
         """
         # Get events happening in the next 7, 3, and 1 days
@@ -644,11 +641,6 @@ class EventPinger(commands.Cog):
                 #     embed = self.create_reminder_embed(event)
                 #     await channel.send(embed=embed)
                 logger.info(f"Reminder: {event['name']} in {days_threshold} days")
-    
-    @check_upcoming_events.before_loop
-    async def before_check_events(self):
-        """Wait for bot to be ready before starting the loop."""
-        await self.bot.wait_until_ready()
 
 
 async def setup(bot):
@@ -8,15 +8,18 @@ Gaming News Cog - Gaming industry news aggregator.
 
 import logging
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import re
 import json
 import os
 from datetime import datetime
 from html import unescape
 import xml.etree.ElementTree as ET
+from utils.http_client import FEED_TIMEOUT
+from utils.parse_pool import parse_xml
+from utils.feed_cache import category_cache_path
+from utils.news_fetcher import OptimizedNewsFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -95,15 +98,15 @@ class GamingNews(commands.Cog):
         self.session = None
         self.state_file = 'data/gaming_news_state.json'
         self.state = self._load_state()
-        self.news_auto_poster.start()
+        self.fetcher = OptimizedNewsFetcher(cache_file=category_cache_path('gaming'), http_client=bot.http_client)
+        bot.scheduler.register('gaming', self.news_auto_poster, interval=6 * 3600)
     
-    def cog_unload(self):
-        self.news_auto_poster.cancel()
-        if self.session:
-            self.bot.loop.create_task(self.session.close())
+    async def cog_unload(self):
+        self.bot.scheduler.unregister('gaming')
+        await self.fetcher.close()
     
     async def cog_load(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await self.bot.http_client.get_session()
     
     def _load_state(self) -> dict:
         """Load state from file."""
@@ -135,10 +138,9 @@ class GamingNews(commands.Cog):
             return None, None, None
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            self.session = await self.bot.http_client.get_session()
             
-            async with self.session.get(source['url'], timeout=aiohttp.ClientTimeout(total=10)) as response:
+            async with self.session.get(source['url'], timeout=FEED_TIMEOUT) as response:
                 if response.status != 200:
                     logger.warning(f"Failed to fetch {source['name']}: HTTP {response.status}")
                     return None, None, None
@@ -148,7 +150,7 @@ class GamingNews(commands.Cog):
                 # Parse RSS/Atom feed using proper XML parser
                 # This handles item tags with attributes (e.g., <item rdf:about="...">)
                 try:
-                    root = ET.fromstring(content)
+                    root = await parse_xml(content)
                 except ET.ParseError as e:
                     logger.warning(f"XML parse error for {source['name']}: {e}")
                     return None, None, None
@@ -195,7 +197,6 @@ class GamingNews(commands.Cog):
             logger.error(f"Error fetching {source['name']}: {e}")
             return None, None, None
     
-    @tasks.loop(hours=6)
     async def news_auto_poster(self):
         """Automatically post gaming news."""
         try:
@@ -216,27 +217,15 @@ class GamingNews(commands.Cog):
             if not channel:
                 return
             
-            # Update interval dynamically
-            interval = config.get('interval_hours', 6)
-            if interval != self.news_auto_poster.hours:
-                self.news_auto_poster.change_interval(hours=interval)
-            
-            # Post from each enabled source
-            for source_key in NEWS_SOURCES.keys():
-                if not manager.is_source_enabled('gaming', source_key):
-                    continue
-                
-                title, link, description = await self._fetch_rss_feed(source_key)
-                
-                if not title or not link:
-                    continue
-                
+            # Enabled sources are fetched concurrently, newest unseen item per source
+            new_items = await manager.fetch_new_items('gaming', self.fetcher, NEWS_SOURCES)
+            embeds = []
+            for source_key, title, link, description, source, _guid in new_items:
                 # Check if already posted
                 if self.state['last_posted'].get(source_key) == link:
+                    embeds.append(None)
                     continue
                 
-                source = NEWS_SOURCES[source_key]
-                
                 embed = discord.Embed(
                     title=f"{source['icon']} {title}",
                     url=link,
@@ -245,23 +234,19 @@ class GamingNews(commands.Cog):
                     timestamp=datetime.utcnow()
                 )
                 embed.set_footer(text=f"Source: {source['name']}")
-                
-                try:
-                    await channel.send(embed=embed)
-                    self.state['last_posted'][source_key] = link
-                    self._save_state()
-                except Exception as e:
-                    logger.error(f"Failed to post from {source['name']}: {e}")
+                embeds.append(embed)
+            
+            # Sent through the outbox: near-duplicates of stories posted in any category are
+            # suppressed or threaded, the rest go out several embeds per message
+            delivered = await manager.deliver('gaming', self.fetcher, new_items, embeds)
+            for source_key, _, link, _, _, _ in delivered:
+                self.state['last_posted'][source_key] = link
+            if delivered:
+                self._save_state()
         
         except Exception as e:
             logger.error(f"Error in gaming news auto-poster: {e}")
     
-    @news_auto_poster.before_loop
-    async def before_news_auto_poster(self):
-        await self.bot.wait_until_ready()
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-    
     @app_commands.command(name="gaming", description="Fetch latest gaming news from a specific source")
     @app_commands.describe(source="News source to fetch from")
     async def gaming_news(self, interaction: discord.Interaction, source: str):
@@ -8,8 +8,7 @@ General News Tracker - Monitor general news from major outlets
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 import asyncio
 import re
 import logging
@@ -19,9 +18,18 @@ from datetime import datetime
 from html import unescape
 from typing import Optional, Literal
 import xml.etree.ElementTree as ET
+from utils.http_client import FEED_TIMEOUT
+from utils.parse_pool import parse_xml
+from utils.dedup import SeenCache
+from utils.feed_cache import category_cache_path
+from utils.news_fetcher import OptimizedNewsFetcher
 
 logger = logging.getLogger(__name__)
 
+# Posted links remembered per source (items older than a week are skipped anyway)
+POSTED_ITEM_LIMIT = 50
+POSTED_ITEM_MAX_AGE = 30 * 24 * 3600
+
 NEWS_SOURCES = {
     'npr_news': {
         'name': 'NPR News',
@@ -94,20 +102,23 @@ class GeneralNews(commands.Cog):
         self.session = None
         self.state_file = 'data/general_news_state.json'
         self.posted_items = self._load_state()
-        self.news_auto_poster.start()
+        self.fetcher = OptimizedNewsFetcher(cache_file=category_cache_path('general_news'), http_client=bot.http_client)
+        bot.scheduler.register('general_news', self.news_auto_poster, interval=2 * 3600)
         logger.info("General News cog loaded")
     
-    def cog_unload(self):
-        self.news_auto_poster.cancel()
-        if self.session:
-            asyncio.create_task(self.session.close())
+    async def cog_unload(self):
+        self.bot.scheduler.unregister('general_news')
+        await self.fetcher.close()
     
     def _load_state(self) -> dict:
         """Load posted items from state file"""
         if os.path.exists(self.state_file):
             try:
                 with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                    return {
+                        source_key: SeenCache.from_state(links, POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE)
+                        for source_key, links in json.load(f).items()
+                    }
             except Exception as e:
                 logger.error(f"Failed to load state: {e}")
         return {}
@@ -117,15 +128,15 @@ class GeneralNews(commands.Cog):
         try:
             os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
             with open(self.state_file, 'w') as f:
-                json.dump(self.posted_items, f, indent=2)
+                json.dump({
+                    source_key: links.to_dict() for source_key, links in self.posted_items.items()
+                }, f, indent=2)
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
     
     async def _ensure_session(self):
-        """Ensure aiohttp session exists"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=10, connect=5)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Get the bot's shared aiohttp session"""
+        self.session = await self.bot.http_client.get_session()
     
     def _is_recent(self, item: str, max_days: int = 7) -> bool:
         """Check if item is from the last N days"""
@@ -186,7 +197,7 @@ class GeneralNews(commands.Cog):
         await self._ensure_session()
         
         try:
-            async with self.session.get(source['url']) as response:
+            async with self.session.get(source['url'], timeout=FEED_TIMEOUT) as response:
                 if response.status != 200:
                     logger.warning(f"{source['name']}: HTTP {response.status}")
                     return None
@@ -196,7 +207,7 @@ class GeneralNews(commands.Cog):
                 # Parse RSS/Atom feed using proper XML parser
                 # This handles item tags with attributes (e.g., <item rdf:about="...">)
                 try:
-                    root = ET.fromstring(content)
+                    root = await parse_xml(content)
                 except ET.ParseError as e:
                     logger.warning(f"XML parse error for {source['name']}: {e}")
                     return None
@@ -235,7 +246,7 @@ class GeneralNews(commands.Cog):
                     
                     # Check if already posted
                     if source_key not in self.posted_items:
-                        self.posted_items[source_key] = []
+                        self.posted_items[source_key] = SeenCache(POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE)
                     
                     if link in self.posted_items[source_key]:
                         continue  # Skip already posted
@@ -253,8 +264,7 @@ class GeneralNews(commands.Cog):
                         description = desc[:300] + "..." if len(desc) > 300 else desc
                     
                     # Mark as posted
-                    self.posted_items[source_key].append(link)
-                    self.posted_items[source_key] = self.posted_items[source_key][-50:]  # Keep last 50
+                    self.posted_items[source_key].add(link)
                     self._save_state()
                     
                     return title, link, description, source
@@ -269,20 +279,8 @@ class GeneralNews(commands.Cog):
             logger.error(f"{source['name']}: Error: {e}")
             return None
     
-    async def _post_news(self, channel_id: int, source_key: str):
-        """Post news item to a channel"""
-        result = await self._fetch_rss_feed(source_key)
-        
-        if not result:
-            return
-        
-        title, link, description, source = result
-        
-        channel = self.bot.get_channel(channel_id)
-        if not channel:
-            logger.error(f"Channel not found for general news")
-            return
-        
+    def _news_embed(self, title: str, link: str, description: str, source: dict) -> discord.Embed:
+        """Build the embed for a news item"""
         embed = discord.Embed(
             title=title,
             url=link,
@@ -292,14 +290,8 @@ class GeneralNews(commands.Cog):
         )
         
         embed.set_footer(text=f"{source['emoji']} {source['name']}")
-        
-        try:
-            await channel.send(embed=embed)
-            logger.info(f"Posted: {title[:50]}...")
-        except Exception as e:
-            logger.error(f"Failed to post: {e}")
+        return embed
     
-    @tasks.loop(hours=2)
     async def news_auto_poster(self):
         """Automatically post news items every 2 hours"""
         try:
@@ -319,25 +311,33 @@ class GeneralNews(commands.Cog):
                 logger.warning("No channel configured for general news")
                 return
             
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                logger.error(f"Channel not found for general news")
+                return
+            
             logger.info("Checking general news sources...")
             
-            # Check each source
-            for source_key in NEWS_SOURCES:
-                # Check if source is enabled
-                sources_config = config.get('sources', {})
-                if source_key in sources_config and not sources_config[source_key].get('enabled', True):
-                    continue
-                
-                await self._post_news(channel_id, source_key)
-                await asyncio.sleep(2)  # Rate limiting
+            # Enabled sources are fetched concurrently; items older than a week are skipped
+            new_items = await news_manager.fetch_new_items(
+                'general_news', self.fetcher, NEWS_SOURCES, max_age=7 * 24 * 3600
+            )
+            embeds = []
+            for source_key, title, link, description, source, _guid in new_items:
+                # Skip links already posted through the manual command
+                posted = self.posted_items.setdefault(source_key, SeenCache(POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE))
+                embeds.append(None if link in posted else self._news_embed(title, link, description, source))
+            
+            delivered = await news_manager.deliver('general_news', self.fetcher, new_items, embeds)
+            for source_key, _, link, _, _, _ in delivered:
+                self.posted_items[source_key].add(link)
+            
+            if new_items:
+                self._save_state()
         
         except Exception as e:
             logger.error(f"Error in news auto-poster: {e}")
     
-    @news_auto_poster.before_loop
-    async def before_news_auto_poster(self):
-        await self.bot.wait_until_ready()
-    
     @app_commands.command(name="generalnews", description="Manually fetch latest general news")
     @app_commands.describe(source="News source to fetch")
     async def fetch_news(
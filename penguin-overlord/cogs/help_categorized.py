@@ -243,7 +243,10 @@ def get_category_embed(category: str) -> discord.Embed:
                 "`/uslegislation <source>` - Fetch US legislation\n"
                 "`/eulegislation <source>` - Fetch EU legislation\n"
                 "`/generalnews <source>` - Fetch general news\n"
-                "`/cve <source>` - Fetch CVE alerts"
+                "`/cve <source>` - Fetch CVE alerts\n"
+                "`/cve id|search|product` - Query the local CVE mirror\n"
+                "`/kev latest` - Newest CISA KEV entries\n"
+                "`/kev search|vendor|due_soon` - Query the local KEV catalog"
             ),
             inline=False
         )
@@ -9,19 +9,32 @@ High priority vulnerabilities that are actively being exploited in the wild.
 
 import logging
 import discord
-from discord.ext import commands, tasks
-import aiohttp
+from discord import app_commands
+from discord.ext import commands
 import json
 import os
 from datetime import datetime
+from utils.dedup import SeenCache
+from utils.outbox import outbox_key
+from utils.kev_catalog import KEV_URL, KEVIndex, fetch_kev_delta, kev_item
 
 logger = logging.getLogger(__name__)
 
+# Posted KEV IDs remembered (count and seconds since last seen in the feed)
+POSTED_KEV_LIMIT = 500
+POSTED_KEV_MAX_AGE = 365 * 24 * 3600
+
+# Newest new KEVs posted per run (after a long outage the rest are skipped)
+KEV_POST_LIMIT = 10
+
+# Matches listed per /kev search, vendor or due_soon reply
+KEV_RESULT_LIMIT = 10
+
 
 KEV_SOURCES = {
     'cisa_kev': {
         'name': 'CISA Known Exploited Vulnerabilities',
-        'url': 'https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json',
+        'url': KEV_URL,
         'type': 'json',
         'color': 0xC41230,
         'icon': '🚨'
@@ -39,7 +52,8 @@ class KEVNews(commands.Cog):
         self.session = None
         self.state_file = 'data/kev_state.json'
         self.state = self._load_state()
-        self.kev_auto_poster.start()
+        self.index = KEVIndex()
+        bot.scheduler.register('kev', self.kev_auto_poster, interval=4 * 3600)
     
     def _load_state(self):
         """Load KEV poster state from file."""
@@ -68,51 +82,101 @@ class KEVNews(commands.Cog):
             logger.error(f"Error saving KEV state: {e}")
     
     async def cog_load(self):
-        """Create aiohttp session when cog loads."""
-        self.session = aiohttp.ClientSession()
+        """Attach the bot's shared aiohttp session and load the local catalog when cog loads."""
+        self.session = await self.bot.http_client.get_session()
+        await self.index.load()
+        # Separate from the auto-poster so the local catalog stays current while posting is off
+        self.bot.scheduler.register('kev_index', self.refresh_index, interval=4 * 3600)
     
     def cog_unload(self):
-        """Close aiohttp session and stop auto-poster when cog unloads."""
-        self.kev_auto_poster.cancel()
-        if self.session:
-            self.bot.loop.create_task(self.session.close())
+        """Stop auto-poster and catalog refresh when cog unloads."""
+        self.bot.scheduler.unregister('kev')
+        self.bot.scheduler.unregister('kev_index')
     
-    async def _fetch_kevs(self) -> list:
-        """Fetch CISA Known Exploited Vulnerabilities."""
-        try:
-            async with self.session.get(KEV_SOURCES['cisa_kev']['url'], timeout=15) as resp:
-                if resp.status != 200:
-                    logger.warning(f"Failed to fetch CISA KEV: HTTP {resp.status}")
-                    return []
-                
-                data = await resp.json()
-                vulnerabilities = data.get('vulnerabilities', [])
-                
-                # Get the most recent ones (first 10, as array is ordered newest-first)
-                recent = vulnerabilities[:10] if len(vulnerabilities) > 10 else vulnerabilities
-                
-                items = []
-                for vuln in recent:
-                    items.append({
-                        'cve_id': vuln.get('cveID', 'Unknown'),
-                        'title': vuln.get('vulnerabilityName', 'Unknown Vulnerability'),
-                        'description': vuln.get('shortDescription', 'No description'),
-                        'severity': 'CRITICAL',  # CISA KEV are all critical by nature
-                        'date_added': vuln.get('dateAdded', ''),
-                        'due_date': vuln.get('dueDate', ''),
-                        'required_action': vuln.get('requiredAction', ''),
-                        'vendor': vuln.get('vendorProject', ''),
-                        'product': vuln.get('product', ''),
-                        'link': f"https://nvd.nist.gov/vuln/detail/{vuln.get('cveID', '')}"
-                    })
-                
-                return items
+    async def refresh_index(self):
+        """Bring the local KEV catalog up to date (usually a 304)."""
+        await self.index.refresh(self.session)
+    
+    def _kev_embed(self, item: dict, footer: str) -> discord.Embed:
+        """Build the embed for one KEV item (see kev_item)."""
+        src_info = KEV_SOURCES['cisa_kev']
         
-        except Exception as e:
-            logger.error(f"Error fetching CISA KEV: {e}")
-            return []
+        embed = discord.Embed(
+            title=f"{src_info['icon']} {item['cve_id']}: {item['title'][:100]}",
+            url=item['link'],
+            description=item['description'][:300],
+            color=src_info['color'],
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(
+            name="Severity",
+            value="🔴 CRITICAL (Actively Exploited)",
+            inline=True
+        )
+        
+        if item['date_added']:
+            embed.add_field(
+                name="Date Added",
+                value=item['date_added'][:10],
+                inline=True
+            )
+        
+        if item['due_date']:
+            embed.add_field(
+                name="Due Date",
+                value=item['due_date'][:10],
+                inline=True
+            )
+        
+        if item['vendor'] and item['product']:
+            embed.add_field(
+                name="Affected Product",
+                value=f"{item['vendor']} {item['product']}",
+                inline=False
+            )
+        
+        if item['required_action']:
+            embed.add_field(
+                name="Required Action",
+                value=item['required_action'][:200],
+                inline=False
+            )
+        
+        embed.set_footer(text=footer)
+        return embed
     
-    @commands.hybrid_command(name='kev', description='Get CISA Known Exploited Vulnerabilities')
+    def _results_embed(self, title: str, vulns: list, empty: str) -> discord.Embed:
+        """List index matches, one line each."""
+        src_info = KEV_SOURCES['cisa_kev']
+        lines = [
+            f"**[{vuln['cveID']}](https://nvd.nist.gov/vuln/detail/{vuln['cveID']})** — "
+            f"{vuln.get('vendorProject', '')} {vuln.get('product', '')}: {vuln.get('vulnerabilityName', '')[:80]}\n"
+            f"Added {vuln.get('dateAdded', '?')} • Due {vuln.get('dueDate', '?')}"
+            for vuln in vulns[:KEV_RESULT_LIMIT]
+        ]
+        if len(vulns) > KEV_RESULT_LIMIT:
+            lines.append(f"…and {len(vulns) - KEV_RESULT_LIMIT} more")
+        
+        embed = discord.Embed(
+            title=f"{src_info['icon']} {title}",
+            description="\n\n".join(lines) if lines else empty,
+            color=src_info['color']
+        )
+        embed.set_footer(text=f"Source: {src_info['name']} • {len(self.index.entries)} entries in the local catalog")
+        return embed
+    
+    async def _index_ready(self, ctx: commands.Context) -> bool:
+        """Make sure the local catalog is loaded; only the very first query downloads it."""
+        if not self.index.entries:
+            await self.index.refresh(self.session)
+        if not self.index.entries:
+            await ctx.send("❌ The KEV catalog is not available yet. CISA feed may be temporarily unavailable.")
+            return False
+        return True
+    
+    @commands.hybrid_group(name='kev', fallback='latest', invoke_without_command=True,
+                           description='Get CISA Known Exploited Vulnerabilities')
     async def kev(self, ctx: commands.Context):
         """
         Get CISA Known Exploited Vulnerabilities (KEV).
@@ -122,67 +186,80 @@ class KEVNews(commands.Cog):
         
         Usage:
             !kev
-            /kev
+            /kev latest
         """
         await ctx.defer()
         
-        items = await self._fetch_kevs()
+        # Show latest 5 from the local catalog (kept current by the kev_index job)
+        if not await self._index_ready(ctx):
+            return
+        
+        footer = f"Source: {KEV_SOURCES['cisa_kev']['name']} • Local catalog"
+        for vuln in self.index.latest(5):
+            await ctx.send(embed=self._kev_embed(kev_item(vuln), footer))
+    
+    @kev.command(name='search', description='Search the KEV catalog by CVE ID, vendor, product or keywords')
+    @app_commands.describe(query='A CVE ID (CVE-2024-3400) or words, e.g. "fortinet fortios"')
+    async def kev_search(self, ctx: commands.Context, *, query: str):
+        """
+        Check whether a CVE or product is on the KEV list (answered from the local catalog).
         
-        if not items:
-            await ctx.send("❌ No KEV data found. CISA feed may be temporarily unavailable.")
+        Usage:
+            !kev search CVE-2024-3400
+            /kev search query:exchange server
+        """
+        if not await self._index_ready(ctx):
             return
         
-        # Show latest 5
-        for item in items[:5]:
-            src_info = KEV_SOURCES['cisa_kev']
-            
-            embed = discord.Embed(
-                title=f"{src_info['icon']} {item['cve_id']}: {item['title'][:100]}",
-                url=item['link'],
-                description=item['description'][:300],
-                color=src_info['color'],
-                timestamp=datetime.utcnow()
-            )
-            
-            embed.add_field(
-                name="Severity",
-                value="🔴 CRITICAL (Actively Exploited)",
-                inline=True
-            )
-            
-            if item['date_added']:
-                embed.add_field(
-                    name="Date Added",
-                    value=item['date_added'][:10],
-                    inline=True
-                )
-            
-            if item['due_date']:
-                embed.add_field(
-                    name="Due Date",
-                    value=item['due_date'][:10],
-                    inline=True
-                )
-            
-            if item['vendor'] and item['product']:
-                embed.add_field(
-                    name="Affected Product",
-                    value=f"{item['vendor']} {item['product']}",
-                    inline=False
-                )
-            
-            if item['required_action']:
-                embed.add_field(
-                    name="Required Action",
-                    value=item['required_action'][:200],
-                    inline=False
-                )
-            
-            embed.set_footer(text=f"Source: {src_info['name']}")
-            
-            await ctx.send(embed=embed)
+        vulns = self.index.search(query)
+        if len(vulns) == 1:
+            footer = f"Source: {KEV_SOURCES['cisa_kev']['name']} • Local catalog"
+            await ctx.send(embed=self._kev_embed(kev_item(vulns[0]), footer))
+            return
+        
+        await ctx.send(embed=self._results_embed(
+            f"KEV matches for \"{query[:50]}\" ({len(vulns)})", vulns,
+            f"✅ Nothing matching **{query[:50]}** is on the KEV list."
+        ))
+    
+    @kev.command(name='vendor', description='List KEV entries for a vendor')
+    @app_commands.describe(vendor='Vendor or project name, e.g. Microsoft')
+    async def kev_vendor(self, ctx: commands.Context, *, vendor: str):
+        """
+        List a vendor's known exploited vulnerabilities, newest first.
+        
+        Usage:
+            !kev vendor Ivanti
+            /kev vendor vendor:Ivanti
+        """
+        if not await self._index_ready(ctx):
+            return
+        
+        vulns = self.index.vendor(vendor)
+        await ctx.send(embed=self._results_embed(
+            f"KEV entries for {vendor[:50]} ({len(vulns)})", vulns,
+            f"✅ No KEV entries for vendor **{vendor[:50]}**."
+        ))
+    
+    @kev.command(name='due_soon', description='List KEV entries whose remediation is due soon')
+    @app_commands.describe(days='Days ahead to look (default 14)')
+    async def kev_due_soon(self, ctx: commands.Context, days: app_commands.Range[int, 1, 365] = 14):
+        """
+        List KEV entries with a federal remediation due date in the next few days.
+        
+        Usage:
+            !kev due_soon
+            /kev due_soon days:7
+        """
+        if not await self._index_ready(ctx):
+            return
+        
+        vulns = self.index.due_soon(days)
+        await ctx.send(embed=self._results_embed(
+            f"KEV remediation due in the next {days} days ({len(vulns)})", vulns,
+            f"✅ Nothing is due in the next {days} days."
+        ))
     
-    @tasks.loop(hours=4)
     async def kev_auto_poster(self):
         """Automatically post new KEVs."""
         try:
@@ -202,10 +279,6 @@ class KEVNews(commands.Cog):
             if manager:
                 config = manager.get_category_config('kev')
                 channel_id = config.get('channel_id')
-                # Update interval dynamically
-                interval = config.get('interval_hours', 4)
-                if interval != self.kev_auto_poster.hours:
-                    self.kev_auto_poster.change_interval(hours=interval)
             else:
                 channel_id = self.state.get('channel_id')
             
@@ -217,85 +290,51 @@ class KEVNews(commands.Cog):
                 logger.warning(f"KEV auto-poster: Channel not found")
                 return
             
-            posted_kevs = set(self.state.get('posted_kevs', []))
+            posted_kevs = SeenCache.from_state(
+                self.state.get('posted_kevs'), POSTED_KEV_LIMIT, POSTED_KEV_MAX_AGE
+            )
             
             # Check if source is enabled
             if manager and not manager.is_source_enabled('kev', 'cisa_kev'):
                 return
             
-            items = await self._fetch_kevs()
+            # Only entries added since the last poll; usually a 304 with no body
+            delta = await fetch_kev_delta(self.session, self.state.get('catalog'))
+            if delta.status == 'error':
+                return
+            items = [kev_item(vuln) for vuln in delta.entries[:KEV_POST_LIMIT]]
             
             # Post only new KEVs we haven't posted before
+            embeds = []
+            new_ids = []
             for item in items:
                 cve_id = item['cve_id']
                 
-                if cve_id not in posted_kevs:
-                    src_info = KEV_SOURCES['cisa_kev']
-                    
-                    embed = discord.Embed(
-                        title=f"{src_info['icon']} {item['cve_id']}: {item['title'][:100]}",
-                        url=item['link'],
-                        description=item['description'][:300],
-                        color=src_info['color'],
-                        timestamp=datetime.utcnow()
-                    )
-                    
-                    embed.add_field(
-                        name="Severity",
-                        value="🔴 CRITICAL (Actively Exploited)",
-                        inline=True
-                    )
-                    
-                    if item['date_added']:
-                        embed.add_field(
-                            name="Date Added",
-                            value=item['date_added'][:10],
-                            inline=True
-                        )
-                    
-                    if item['due_date']:
-                        embed.add_field(
-                            name="Due Date",
-                            value=item['due_date'][:10],
-                            inline=True
-                        )
-                    
-                    if item['vendor'] and item['product']:
-                        embed.add_field(
-                            name="Affected Product",
-                            value=f"{item['vendor']} {item['product']}",
-                            inline=False
-                        )
-                    
-                    if item['required_action']:
-                        embed.add_field(
-                            name="Required Action",
-                            value=item['required_action'][:200],
-                            inline=False
-                        )
-                    
-                    embed.set_footer(text=f"Source: {src_info['name']} • KEV Auto-Poster")
-                    
-                    await channel.send(embed=embed)
-                    
-                    posted_kevs.add(cve_id)
-                    logger.info(f"KEV auto-poster: Posted {cve_id}")
+                if not posted_kevs.touch(cve_id):
+                    footer = f"Source: {KEV_SOURCES['cisa_kev']['name']} • KEV Auto-Poster"
+                    embeds.append(self._kev_embed(item, footer))
+                    new_ids.append(cve_id)
             
-            # Keep only last 500 KEV IDs to prevent state file from growing too large
-            self.state['posted_kevs'] = list(posted_kevs)[-500:]
+            # Queued in the high-priority outbox lane; a KEV counts as posted once delivered
+            batch = config.get('batch_embeds', True) if manager else True
+            keys = {outbox_key('kev', cve_id): cve_id for cve_id in new_ids}
+            for key, embed in zip(keys, embeds):
+                self.bot.outbox.enqueue(key, 'kev', embed, channel_id=channel_id, batch=batch)
+            if embeds:
+                await self.bot.drain_outbox()
+            for key in self.bot.outbox.delivered(keys):
+                posted_kevs.add(keys[key])
+                logger.info(f"KEV auto-poster: Posted {keys[key]}")
+            
+            # Bounded by count and age so the state file can't grow without limit
+            self.state['posted_kevs'] = posted_kevs.to_dict()
+            self.state['catalog'] = delta.feed_state
             self.state['last_check'] = datetime.utcnow().isoformat()
             self._save_state()
         
         except Exception as e:
             logger.error(f"KEV auto-poster error: {e}")
     
-    @kev_auto_poster.before_loop
-    async def before_kev_auto_poster(self):
-        """Wait for the bot to be ready before starting the auto-poster."""
-        await self.bot.wait_until_ready()
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-    
     @commands.hybrid_command(name='kev_set_channel', description='Set the channel for automatic KEV alerts')
     @commands.has_permissions(manage_guild=True)
     async def kev_set_channel(self, ctx: commands.Context, channel: discord.TextChannel = None):
@@ -333,8 +372,7 @@ class KEVNews(commands.Cog):
         self.state['enabled'] = True
         self._save_state()
         
-        if not self.kev_auto_poster.is_running():
-            self.kev_auto_poster.start()
+        self.bot.scheduler.resume('kev', run_now=True)
         
         channel = self.bot.get_channel(self.state['channel_id'])
         await ctx.send(f"✅ KEV auto-posting **enabled** in {channel.mention if channel else 'the configured channel'}!\n"
@@ -356,8 +394,7 @@ class KEVNews(commands.Cog):
         self.state['enabled'] = False
         self._save_state()
         
-        if self.kev_auto_poster.is_running():
-            self.kev_auto_poster.cancel()
+        self.bot.scheduler.pause('kev')
         
         await ctx.send("✅ KEV auto-posting **disabled**.")
     
@@ -11,10 +11,17 @@ import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
+import io
 import json
 import os
+import time
+from urllib.parse import urlparse
 from typing import Optional, Literal
 from utils.secrets import get_secret
+from utils.feed_cache import category_cache_path, open_feed_cache
+from utils.fetch_metrics import summarize
+from utils.news_fetcher import OptimizedNewsFetcher
+from utils.outbox import outbox_key
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +34,11 @@ class NewsManager(commands.Cog):
         self.config_file = 'data/news_config.json'
         self.config = self._load_config()
     
+    async def cog_load(self):
+        """Apply each category's interval and minute offset to its scheduled job."""
+        for category in self.config:
+            self._sync_schedule(category)
+    
     def _get_channel_id_from_env(self, category: str) -> Optional[int]:
         """Get channel ID from environment variable or secrets manager."""
         # Try secrets manager first (Doppler/AWS/Vault)
@@ -98,6 +110,18 @@ class NewsManager(commands.Cog):
         except Exception as e:
             logger.error(f"Failed to save news config: {e}")
     
+    def _sync_schedule(self, category: str):
+        """Push a category's interval_hours/minute_offset to the scheduler job of the same name."""
+        config = self.config.get(category, {})
+        if 'interval_hours' not in config:
+            return
+        # Jobs registered later pick this up when they register
+        self.bot.scheduler.reschedule(
+            category,
+            interval=config['interval_hours'] * 3600,
+            offset=config.get('minute_offset', 0) * 60
+        )
+    
     def get_category_config(self, category: str) -> dict:
         """Get configuration for a specific category."""
         return self.config.get(category, {})
@@ -106,6 +130,132 @@ class NewsManager(commands.Cog):
         """Check if a specific source is enabled."""
         return self.config.get(category, {}).get('sources', {}).get(source_key, True)
     
+    async def fetch_new_items(
+        self,
+        category: str,
+        fetcher: OptimizedNewsFetcher,
+        sources: dict,
+        max_age: float = None
+    ) -> list:
+        """
+        Fetch the newest unseen item from each enabled source of a category.
+        
+        Feeds are requested concurrently through the fetcher (bounded by the
+        category's concurrency_limit, with ETag/Last-Modified validation if
+        use_etag_cache is on), so a cycle takes as long as the slowest feed.
+        
+        Items stay unseen until deliver() has posted them.
+        
+        Returns:
+            List of (source_key, title, link, description, source, guid) tuples
+        """
+        config = self.get_category_config(category)
+        fetcher.set_concurrency_limit(config.get('concurrency_limit', 5))
+        fetcher.set_defer_seen(True)
+        
+        enabled = [key for key in sources if self.is_source_enabled(category, key)]
+        items = await fetcher.fetch_multiple_feeds(
+            sources,
+            enabled,
+            use_cache=config.get('use_etag_cache', True),
+            max_age=max_age
+        )
+        
+        keys = {source['url']: key for key, source in sources.items()}
+        return [
+            (keys[source['url']], title, link, description, source, guid)
+            for title, link, description, guid, source in items
+        ]
+    
+    async def deliver(
+        self,
+        category: str,
+        fetcher: OptimizedNewsFetcher,
+        items: list,
+        embeds: list,
+        check_duplicates: bool = True
+    ) -> list:
+        """
+        Post fetched items through the bot's outbox.
+        
+        embeds[i] is the embed for items[i], or None to skip that item. Embeds
+        are queued for the category's channel (checked against the story index
+        with the category's dedup_mode unless check_duplicates is False) and
+        the outbox is drained. Only items that were delivered, or skipped, are
+        marked as seen; the rest stay queued and are retried by the outbox.
+        
+        Returns:
+            The items that were delivered (including suppressed duplicates)
+        """
+        config = self.get_category_config(category)
+        outbox = self.bot.outbox
+        keys = []
+        for (_, title, link, description, source, guid), embed in zip(items, embeds):
+            key = outbox_key(category, source['url'], guid)
+            keys.append(key)
+            if embed is not None:
+                outbox.enqueue(
+                    key, category, embed,
+                    channel_id=config.get('channel_id'),
+                    story=(title, description, link, source['name']) if check_duplicates else None,
+                    dedup_mode=config.get('dedup_mode', 'suppress'),
+                    batch=config.get('batch_embeds', True)
+                )
+        
+        if any(embed is not None for embed in embeds):
+            await self.bot.drain_outbox()
+        
+        sent = outbox.delivered(keys)
+        done = [
+            (item, embed is not None)
+            for item, embed, key in zip(items, embeds, keys)
+            if embed is None or key in sent
+        ]
+        fetcher.mark_seen([(item[4]['url'], item[5]) for item, _ in done])
+        
+        delivered = [item for item, queued in done if queued]
+        queued = sum(1 for embed in embeds if embed is not None)
+        if queued:
+            logger.info(f"{category}: delivered {len(delivered)} of {queued} new items")
+        return delivered
+    
+    def _source_names(self) -> dict:
+        """Map feed URLs to source names across all loaded news cogs."""
+        return {
+            source['url']: source['name']
+            for cog in self.bot.cogs.values()
+            for source in getattr(cog, 'NEWS_SOURCES', {}).values()
+            if 'url' in source
+        }
+    
+    def _tripped_sources_text(self, category: str) -> Optional[str]:
+        """Describe sources whose circuit breaker is open, from the category's feed cache."""
+        cache_path = category_cache_path(category)
+        if not os.path.exists(cache_path):
+            return None
+        
+        try:
+            cache = open_feed_cache(cache_path)
+            health = cache.all_health()
+            cache.close()
+        except Exception as e:
+            logger.error(f"Failed to read feed health for {category}: {e}")
+            return None
+        
+        names = self._source_names()
+        
+        now = time.time()
+        lines = []
+        for url, stats in sorted(health.items(), key=lambda kv: kv[1].get('open_until', 0)):
+            open_until = stats.get('open_until')
+            if not open_until:
+                continue  # Failing, but below the trip threshold
+            name = names.get(url, urlparse(url).netloc)
+            retry = f"retry <t:{open_until}:R>" if open_until > now else "probing next run"
+            lines.append(f"🔌 {name} — {stats['failures']} failures ({stats.get('last_error', 'unknown')}), {retry}")
+        
+        return "\n".join(lines)[:1024] if lines else None
+    
     def has_permission(self, interaction: discord.Interaction, category: str) -> bool:
         """Check if user has permission to configure this category."""
         if interaction.user.guild_permissions.administrator:
@@ -226,6 +376,7 @@ class NewsManager(commands.Cog):
         
         self.config[category]['interval_hours'] = hours
         self._save_config()
+        self._sync_schedule(category)
         
         await interaction.response.send_message(
             f"✅ {category.title()} news will post every {hours} hour(s).",
@@ -382,6 +533,11 @@ class NewsManager(commands.Cog):
                 inline=False
             )
         
+        # Sources skipped by the circuit breaker (dead or rate-limited feeds)
+        tripped = self._tripped_sources_text(category)
+        if tripped:
+            embed.add_field(name="Tripped Sources", value=tripped, inline=False)
+        
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @news_group.command(name="list_sources", description="List all available sources for a category")
@@ -602,6 +758,10 @@ class NewsManager(commands.Cog):
             else:
                 embed.add_field(name="Channel", value="Not configured", inline=True)
             
+            tripped = self._tripped_sources_text(category)
+            if tripped:
+                embed.add_field(name="Tripped Sources", value=tripped, inline=False)
+            
             if channel_id and not enabled:
                 embed.set_footer(text=f"ℹ️ Channel is set but posting is disabled. Use !news_enable {category} to enable.")
             
@@ -649,6 +809,76 @@ class NewsManager(commands.Cog):
                 embed.set_footer(text=f"ℹ️ {len(ready_to_enable)} categories have channels set but are disabled. Use !news_enable <category> to enable.")
             
             await ctx.send(embed=embed)
+    
+    @commands.command(name='news_metrics', hidden=True)
+    @commands.is_owner()
+    async def news_metrics_prefix(self, ctx: commands.Context, category: str, output: str = None):
+        """
+        Show per-source fetch telemetry for a news category.
+        
+        Usage:
+            !news_metrics tech       # Slowest sources, 304 ratio, errors
+            !news_metrics tech json  # Attach the full metrics as JSON
+        
+        Requires: Bot owner only
+        """
+        cache_path = category_cache_path(category)
+        if not os.path.exists(cache_path):
+            await ctx.send(f"❌ No feed cache for {category} yet.")
+            return
+        
+        try:
+            cache = open_feed_cache(cache_path)
+            metrics = {url: summarize(stats) for url, stats in cache.all_metrics().items()}
+            cache.close()
+        except Exception as e:
+            logger.error(f"Failed to read fetch metrics for {category}: {e}")
+            await ctx.send(f"❌ Failed to read fetch metrics for {category}.")
+            return
+        
+        if not metrics:
+            await ctx.send(f"ℹ️ No fetch metrics recorded for {category} yet.")
+            return
+        
+        names = self._source_names()
+        
+        if output == 'json':
+            dump = {
+                url: dict(stats, source=names.get(url, urlparse(url).netloc))
+                for url, stats in metrics.items()
+            }
+            data = io.BytesIO(json.dumps(dump, indent=2).encode())
+            await ctx.send(file=discord.File(data, filename=f'fetch_metrics_{category}.json'))
+            return
+        
+        requests = sum(stats['requests'] for stats in metrics.values())
+        not_modified = sum(stats['status'].get('304', 0) for stats in metrics.values())
+        total_bytes = sum(stats['bytes'] for stats in metrics.values())
+        embed = discord.Embed(
+            title=f"📊 {category.title()} Fetch Metrics",
+            description=(
+                f"{len(metrics)} sources, {requests} requests, "
+                f"{not_modified / requests:.0%} not modified, {total_bytes / 1024 / 1024:.1f} MB"
+            ),
+            color=0x5865F2
+        )
+        
+        # Sources costing the most wall time first
+        slowest = sorted(metrics.items(), key=lambda kv: kv[1]['total_latency_ms'], reverse=True)
+        for url, stats in slowest[:10]:
+            errors = {code: n for code, n in stats['status'].items() if code not in ('200', '304')}
+            value = (
+                f"p50 {stats['latency_p50_ms']:.0f} ms · p95 {stats['latency_p95_ms']:.0f} ms · "
+                f"TTFB p50 {stats['ttfb_p50_ms'] or 0:.0f} ms\n"
+                f"304 {stats['not_modified_ratio'] or 0:.0%} · avg {stats['avg_bytes'] / 1024:.0f} KB · "
+                f"{stats['items']} items"
+            )
+            if errors:
+                value += "\n⚠️ " + ", ".join(f"{code}×{n}" for code, n in errors.items())
+            embed.add_field(name=names.get(url, urlparse(url).netloc), value=value, inline=False)
+        
+        embed.set_footer(text=f"Use !news_metrics {category} json for the full dump")
+        await ctx.send(embed=embed)
 
 
 async def setup(bot):
@@ -10,11 +10,11 @@ Integrates with NOAA space weather API for real-time propagation data.
 import logging
 import random
 import discord
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 from datetime import datetime
 import json
 import os
+from utils.http_client import FEED_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -131,16 +131,16 @@ class Radiohead(commands.Cog):
             logger.error(f"Error saving solar state: {e}")
     
     async def cog_load(self):
-        """Create aiohttp session and start auto-poster when cog loads."""
-        self.session = aiohttp.ClientSession()
-        if self.state.get('enabled', False):
-            self.solar_auto_poster.start()
+        """Attach the bot's shared aiohttp session and schedule the auto-poster when cog loads."""
+        self.session = await self.bot.http_client.get_session()
+        self.bot.scheduler.register(
+            'solar', self.solar_auto_poster, interval=12 * 3600,
+            paused=not self.state.get('enabled', False)
+        )
     
     async def cog_unload(self):
-        """Close aiohttp session and stop auto-poster when cog unloads."""
-        self.solar_auto_poster.cancel()
-        if self.session:
-            await self.session.close()
+        """Stop auto-poster when cog unloads."""
+        self.bot.scheduler.unregister('solar')
     
     @commands.hybrid_command(name='hamradio', description='Get HAM radio trivia and facts')
     async def hamradio(self, ctx: commands.Context):
@@ -233,11 +233,10 @@ class Radiohead(commands.Cog):
         await ctx.defer()
         
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            self.session = await self.bot.http_client.get_session()
             
             # Fetch NOAA scales (R, S, G scales)
-            async with self.session.get('https://services.swpc.noaa.gov/products/noaa-scales.json', timeout=10) as resp:
+            async with self.session.get('https://services.swpc.noaa.gov/products/noaa-scales.json', timeout=FEED_TIMEOUT) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     
@@ -254,7 +253,7 @@ class Radiohead(commands.Cog):
                     
                     # Fetch solar flux from JSON endpoint
                     sfi = 'N/A'
-                    async with self.session.get('https://services.swpc.noaa.gov/json/f107_cm_flux.json', timeout=10) as flux_resp:
+                    async with self.session.get('https://services.swpc.noaa.gov/json/f107_cm_flux.json', timeout=FEED_TIMEOUT) as flux_resp:
                         if flux_resp.status == 200:
                             flux_data = await flux_resp.json()
                             # Get the most recent entry with reporting_schedule="Noon" (official value)
@@ -269,7 +268,7 @@ class Radiohead(commands.Cog):
                     
                     # Fetch K-index from JSON endpoint
                     k_index = 'N/A'
-                    async with self.session.get('https://services.swpc.noaa.gov/json/planetary_k_index_1m.json', timeout=10) as k_resp:
+                    async with self.session.get('https://services.swpc.noaa.gov/json/planetary_k_index_1m.json', timeout=FEED_TIMEOUT) as k_resp:
                         if k_resp.status == 200:
                             k_data = await k_resp.json()
                             # Get the most recent K-index
@@ -474,7 +473,6 @@ class Radiohead(commands.Cog):
             logger.error(f"Error fetching solar weather data: {e}")
             await ctx.send("❌ Error fetching solar weather data. Please try again later!")
     
-    @tasks.loop(hours=12)
     async def solar_auto_poster(self):
         """Automatically post solar/propagation data every 12 hours."""
         try:
@@ -493,12 +491,12 @@ class Radiohead(commands.Cog):
             
             # Fetch and post solar data
             try:
-                async with self.session.get("https://services.swpc.noaa.gov/json/f10_7cm_flux.json", timeout=10) as resp:
+                async with self.session.get("https://services.swpc.noaa.gov/json/f10_7cm_flux.json", timeout=FEED_TIMEOUT) as resp:
                     if resp.status == 200:
                         flux_data = await resp.json()
                         flux = flux_data[0]['flux'] if flux_data else 'N/A'
                         
-                        async with self.session.get("https://services.swpc.noaa.gov/json/planetary_k_index_1m.json", timeout=10) as resp2:
+                        async with self.session.get("https://services.swpc.noaa.gov/json/planetary_k_index_1m.json", timeout=FEED_TIMEOUT) as resp2:
                             if resp2.status == 200:
                                 k_data = await resp2.json()
                                 k_index = k_data[-1]['kp_index'] if k_data else 'N/A'
@@ -572,11 +570,6 @@ class Radiohead(commands.Cog):
         except Exception as e:
             logger.error(f"Solar auto-poster error: {e}")
     
-    @solar_auto_poster.before_loop
-    async def before_solar_auto_poster(self):
-        """Wait for the bot to be ready before starting the auto-poster."""
-        await self.bot.wait_until_ready()
-    
     @commands.hybrid_command(name='solar_set_channel', description='Set the channel for automatic solar/propagation updates')
     @commands.has_permissions(manage_guild=True)
     async def solar_set_channel(self, ctx: commands.Context, channel: discord.TextChannel = None):
@@ -614,8 +607,7 @@ class Radiohead(commands.Cog):
         self.state['enabled'] = True
         self._save_state()
         
-        if not self.solar_auto_poster.is_running():
-            self.solar_auto_poster.start()
+        self.bot.scheduler.resume('solar', run_now=True)
         
         channel = self.bot.get_channel(self.state['channel_id'])
         await ctx.send(f"✅ Solar/propagation auto-posting **enabled** in {channel.mention if channel else 'the configured channel'}!\n"
@@ -636,8 +628,7 @@ class Radiohead(commands.Cog):
         self.state['enabled'] = False
         self._save_state()
         
-        if self.solar_auto_poster.is_running():
-            self.solar_auto_poster.cancel()
+        self.bot.scheduler.pause('solar')
         
         await ctx.send("✅ Solar/propagation auto-posting **disabled**.")
     
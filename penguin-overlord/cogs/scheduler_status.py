@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Scheduler Status Cog - Inspect the bot's periodic jobs.
+"""
+
+import logging
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+logger = logging.getLogger(__name__)
+
+STATE_ICONS = {
+    'scheduled': '🕒',
+    'queued': '⏳',
+    'running': '▶️',
+    'paused': '⏸️'
+}
+
+
+def _format_interval(seconds: float) -> str:
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600:g}h"
+    return f"{seconds / 60:g}m"
+
+
+class SchedulerStatus(commands.Cog):
+    """Status view for the unified job scheduler."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    def _status_embed(self) -> discord.Embed:
+        scheduler = self.bot.scheduler
+        jobs = scheduler.status()
+        active = sum(1 for job in jobs if job['state'] == 'running')
+        
+        embed = discord.Embed(
+            title="🗓️ Scheduler Status",
+            description=f"{len(jobs)} jobs, {active}/{scheduler.max_concurrent} running",
+            color=0x5865F2
+        )
+        
+        for job in jobs[:25]:
+            lines = [
+                f"{STATE_ICONS.get(job['state'], '❔')} {job['state'].title()} · every "
+                f"{_format_interval(job['interval'])} at +{job['offset'] / 60:g}m"
+            ]
+            if job['next_run'] and job['state'] == 'scheduled':
+                lines.append(f"Next: <t:{int(job['next_run'])}:R>")
+            if job['last_run']:
+                duration = f" ({job['last_duration']:.1f}s)" if job['last_duration'] is not None else ""
+                lines.append(f"Last: <t:{int(job['last_run'])}:R>{duration}")
+            if job['failures']:
+                lines.append(f"⚠️ {job['failures']}/{job['runs']} failed")
+            if job['last_error']:
+                lines.append(f"Error: {job['last_error'][:100]}")
+            embed.add_field(name=job['name'], value="\n".join(lines), inline=True)
+        
+        return embed
+    
+    scheduler_group = app_commands.Group(name="scheduler", description="Periodic job scheduler")
+    
+    @scheduler_group.command(name="status", description="Show scheduled jobs and their next runs")
+    async def status(self, interaction: discord.Interaction):
+        """Show all scheduled jobs."""
+        await interaction.response.send_message(embed=self._status_embed(), ephemeral=True)
+    
+    @commands.command(name='scheduler_status')
+    async def scheduler_status_prefix(self, ctx: commands.Context):
+        """
+        Show all scheduled jobs (prefix command fallback).
+        
+        Usage:
+            !scheduler_status
+        """
+        await ctx.send(embed=self._status_embed())
+
+
+async def setup(bot):
+    await bot.add_cog(SchedulerStatus(bot))
+    logger.info("Scheduler Status cog loaded")
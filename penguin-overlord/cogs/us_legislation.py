@@ -8,8 +8,7 @@ US Legislation Tracker - Monitor US legislative activity
 
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 import asyncio
 import re
 import logging
@@ -19,9 +18,18 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 from html import unescape
 from typing import Optional, Literal
+from utils.http_client import FEED_TIMEOUT
+from utils.parse_pool import parse_xml
+from utils.dedup import SeenCache
+from utils.feed_cache import category_cache_path
+from utils.news_fetcher import OptimizedNewsFetcher
 
 logger = logging.getLogger(__name__)
 
+# Posted links remembered per source (items older than a week are skipped anyway)
+POSTED_ITEM_LIMIT = 50
+POSTED_ITEM_MAX_AGE = 30 * 24 * 3600
+
 LEGISLATION_SOURCES = {
     'presented_to_president': {
         'name': 'Congress.gov - Bills Presented to President',
@@ -62,20 +70,23 @@ class USLegislation(commands.Cog):
         self.session = None
         self.state_file = 'data/us_legislation_state.json'
         self.posted_items = self._load_state()
-        self.legislation_auto_poster.start()
+        self.fetcher = OptimizedNewsFetcher(cache_file=category_cache_path('us_legislation'), http_client=bot.http_client)
+        bot.scheduler.register('us_legislation', self.legislation_auto_poster, interval=3600)
         logger.info("US Legislation cog loaded")
     
-    def cog_unload(self):
-        self.legislation_auto_poster.cancel()
-        if self.session:
-            asyncio.create_task(self.session.close())
+    async def cog_unload(self):
+        self.bot.scheduler.unregister('us_legislation')
+        await self.fetcher.close()
     
     def _load_state(self) -> dict:
         """Load posted items from state file"""
         if os.path.exists(self.state_file):
             try:
                 with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                    return {
+                        source_key: SeenCache.from_state(links, POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE)
+                        for source_key, links in json.load(f).items()
+                    }
             except Exception as e:
                 logger.error(f"Failed to load state: {e}")
         return {}
@@ -85,15 +96,15 @@ class USLegislation(commands.Cog):
         try:
             os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
             with open(self.state_file, 'w') as f:
-                json.dump(self.posted_items, f, indent=2)
+                json.dump({
+                    source_key: links.to_dict() for source_key, links in self.posted_items.items()
+                }, f, indent=2)
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
     
     async def _ensure_session(self):
-        """Ensure aiohttp session exists"""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=10, connect=5)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Get the bot's shared aiohttp session"""
+        self.session = await self.bot.http_client.get_session()
     
     def _is_recent(self, item: str, max_days: int = 7) -> bool:
         """Check if item is from the last N days"""
@@ -154,7 +165,7 @@ class USLegislation(commands.Cog):
         await self._ensure_session()
         
         try:
-            async with self.session.get(source['url']) as response:
+            async with self.session.get(source['url'], timeout=FEED_TIMEOUT) as response:
                 if response.status != 200:
                     logger.warning(f"{source['name']}: HTTP {response.status}")
                     return None
@@ -164,7 +175,7 @@ class USLegislation(commands.Cog):
                 # Parse RSS/Atom feed using XML parser (replaces regex approach)
                 # Fix for: RSS feeds with item tag attributes (e.g., <item rdf:about="...">)
                 try:
-                    root = ET.fromstring(content)
+                    root = await parse_xml(content)
                 except ET.ParseError as e:
                     logger.error(f"{source['name']}: XML parse error: {e}")
                     return None
@@ -204,7 +215,7 @@ class USLegislation(commands.Cog):
                     
                     # Check if already posted
                     if source_key not in self.posted_items:
-                        self.posted_items[source_key] = []
+                        self.posted_items[source_key] = SeenCache(POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE)
                     
                     if link in self.posted_items[source_key]:
                         continue  # Skip already posted
@@ -222,8 +233,7 @@ class USLegislation(commands.Cog):
                         description = desc[:300] + "..." if len(desc) > 300 else desc
                     
                     # Mark as posted
-                    self.posted_items[source_key].append(link)
-                    self.posted_items[source_key] = self.posted_items[source_key][-50:]  # Keep last 50
+                    self.posted_items[source_key].add(link)
                     self._save_state()
                     
                     return title, link, description, source
@@ -238,7 +248,6 @@ class USLegislation(commands.Cog):
             logger.error(f"{source['name']}: Error: {e}")
             return None
     
-    @tasks.loop(hours=1)
     async def legislation_auto_poster(self):
         """Auto-post new legislation updates every hour"""
         try:
@@ -263,36 +272,38 @@ class USLegislation(commands.Cog):
             
             logger.info("Checking US legislation sources...")
             
-            # Fetch all sources
-            for source_key in LEGISLATION_SOURCES:
-                # Check if source is enabled
-                if manager and not manager.is_source_enabled('us_legislation', source_key):
+            # Enabled sources are fetched concurrently; items older than a week are skipped
+            new_items = await manager.fetch_new_items(
+                'us_legislation', self.fetcher, LEGISLATION_SOURCES, max_age=7 * 24 * 3600
+            )
+            embeds = []
+            for source_key, title, link, description, source, _guid in new_items:
+                # Skip links already posted through the manual command
+                posted = self.posted_items.setdefault(source_key, SeenCache(POSTED_ITEM_LIMIT, POSTED_ITEM_MAX_AGE))
+                if link in posted:
+                    embeds.append(None)
                     continue
                 
-                result = await self._fetch_rss_feed(source_key)
-                if result:
-                    title, link, description, source = result
-                    
-                    embed = discord.Embed(
-                        title=f"{source['emoji']} {title}",
-                        url=link,
-                        description=description,
-                        color=discord.Color.blue(),
-                        timestamp=datetime.utcnow()
-                    )
-                    embed.set_footer(text=f"Source: {source['name']}")
-                    
-                    await channel.send(embed=embed)
-                    logger.info(f"Posted: {title[:50]}... from {source['name']}")
-                    await asyncio.sleep(0.5)  # Rate limiting
+                embed = discord.Embed(
+                    title=f"{source['emoji']} {title}",
+                    url=link,
+                    description=description,
+                    color=discord.Color.blue(),
+                    timestamp=datetime.utcnow()
+                )
+                embed.set_footer(text=f"Source: {source['name']}")
+                embeds.append(embed)
+            
+            delivered = await manager.deliver('us_legislation', self.fetcher, new_items, embeds, check_duplicates=False)
+            for source_key, _, link, _, _, _ in delivered:
+                self.posted_items[source_key].add(link)
+            
+            if new_items:
+                self._save_state()
         
         except Exception as e:
             logger.error(f"Error in legislation auto-poster: {e}")
     
-    @legislation_auto_poster.before_loop
-    async def before_legislation_auto_poster(self):
-        await self.bot.wait_until_ready()
-    
     @app_commands.command(name="uslegislation", description="Manually fetch latest US legislation")
     @app_commands.describe(source="Legislation source to fetch")
     async def fetch_legislation(
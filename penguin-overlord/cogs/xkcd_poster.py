@@ -27,7 +27,7 @@ from pathlib import Path
 
 import aiohttp
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 
 logger = logging.getLogger(__name__)
 
@@ -63,17 +63,10 @@ class XKCDPoster(commands.Cog):
         if env_chan and env_chan.isdigit():
             self.state['channel_id'] = int(env_chan)
 
-        # Change loop interval dynamically before starting
-        self.poll_loop.change_interval(minutes=self.poll_minutes)
-        
-        # Start background task
-        self.poll_loop.start()
+        bot.scheduler.register('xkcd_poll', self.poll_loop, interval=self.poll_minutes * 60)
 
     def cog_unload(self):
-        try:
-            self.poll_loop.cancel()
-        except Exception:
-            pass
+        self.bot.scheduler.unregister('xkcd_poll')
 
     def _write_state(self):
         try:
@@ -84,12 +77,12 @@ class XKCDPoster(commands.Cog):
 
     async def _fetch_latest(self) -> dict | None:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.API_URL, timeout=20) as resp:
-                    if resp.status != 200:
-                        logger.warning('XKCD fetch returned status %s', resp.status)
-                        return None
-                    return await resp.json()
+            session = await self.bot.http_client.get_session()
+            async with session.get(self.API_URL, timeout=aiohttp.ClientTimeout(total=20)) as resp:
+                if resp.status != 200:
+                    logger.warning('XKCD fetch returned status %s', resp.status)
+                    return None
+                return await resp.json()
         except asyncio.TimeoutError:
             logger.warning('Timeout fetching XKCD')
             return None
@@ -115,7 +108,6 @@ class XKCDPoster(commands.Cog):
             pass
         return embed
 
-    @tasks.loop(minutes=30)
     async def poll_loop(self):
         """Poll XKCD API and post new comics if found."""
         try:
@@ -153,12 +145,6 @@ class XKCDPoster(commands.Cog):
         except Exception:
             logger.exception('Error in XKCD poll loop')
 
-    @poll_loop.before_loop
-    async def before_poll(self):
-        # Delay initial poll slightly to stagger startup
-        await self.bot.wait_until_ready()
-        await asyncio.sleep(10)
-
     # Admin commands to manage the poster
     @commands.hybrid_command(name='xkcd_set_channel', description='Set channel ID for automated XKCD posts')
     async def xkcd_set_channel(self, ctx: commands.Context, channel: str):
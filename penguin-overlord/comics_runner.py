@@ -7,7 +7,8 @@
 Comics Runner - Standalone execution for systemd timers
 
 Posts daily tech comics from XKCD, Joy of Tech, and TurnOff.us.
-Runs independently of the main bot process for reliability.
+Runs independently of the main bot process for reliability, posting over
+the REST API (no gateway connection).
 
 Usage:
     python comics_runner.py
@@ -15,6 +16,7 @@ Usage:
 Environment Variables:
     DISCORD_BOT_TOKEN - Required (supports Doppler via get_secret)
     COMIC_POST_CHANNEL_ID - Required (channel ID for posting)
+    COMIC_WEBHOOK_URL - Optional (post through a channel webhook instead)
 """
 
 import os
@@ -38,6 +40,8 @@ load_dotenv()
 
 # Import secrets utility
 from utils.secrets import get_secret
+from utils.http_client import get_http_client
+from utils.discord_rest import delivery_channel
 
 # Configure logging
 logging.basicConfig(
@@ -164,12 +168,9 @@ async def post_comic_update():
     # Prefer persisted channel in state if present (set via runtime command)
     state = load_state()
     channel_id = state.get('channel_id') or get_secret('COMIC', 'POST_CHANNEL_ID')
+    webhook_url = get_secret('COMIC', 'WEBHOOK_URL')
     
-    if not token:
-        logger.error("DISCORD_BOT_TOKEN not set")
-        return False
-    
-    if not channel_id:
+    if not channel_id and not webhook_url:
         logger.error("COMIC_POST_CHANNEL_ID not set")
         return False
     
@@ -199,89 +200,79 @@ async def post_comic_update():
     # Fetch random comic from available sources
     # NOTE: XKCD removed - handled by dedicated xkcd_runner.py (every 30 min)
     comic = None
-    async with aiohttp.ClientSession() as session:
-        # Try all sources
-        comics = await asyncio.gather(
-            fetch_joyoftech(session),
-            fetch_turnoff(session),
-            return_exceptions=True
-        )
+    session = await get_http_client().get_session()
+    # Try all sources
+    comics = await asyncio.gather(
+        fetch_joyoftech(session),
+        fetch_turnoff(session),
+        return_exceptions=True
+    )
         
-        # Filter out None and exceptions
-        valid_comics = [c for c in comics if isinstance(c, dict)]
+    # Filter out None and exceptions
+    valid_comics = [c for c in comics if isinstance(c, dict)]
         
-        if not valid_comics:
-            logger.error("Failed to fetch any comics")
-            return False
+    if not valid_comics:
+        logger.error("Failed to fetch any comics")
+        return False
         
-        # Pick first available
-        comic = valid_comics[0]
+    # Pick first available
+    comic = valid_comics[0]
     
-    # Create Discord client
-    intents = discord.Intents.default()
-    client = discord.Client(intents=intents)
+    channel = delivery_channel(token, channel_id, webhook_url)
+    if not channel:
+        logger.error("DISCORD_BOT_TOKEN not set")
+        return False
     
-    @client.event
-    async def on_ready():
-        logger.info(f"Connected as {client.user}")
+    try:
+        await channel.resolve()
         
-        try:
-            channel = client.get_channel(channel_id)
-            if not channel:
-                channel = await client.fetch_channel(channel_id)
-            
-            if not channel:
-                logger.error(f"Channel {channel_id} not found")
-                await client.close()
-                return
-            
-            # Source emojis and colors (XKCD removed - has dedicated runner)
-            source_info = {
-                'joyoftech': {'emoji': '😄', 'name': 'Joy of Tech', 'color': 0xFF6B6B},
-                'turnoff': {'emoji': '💻', 'name': 'TurnOff.us', 'color': 0x4ECDC4}
-            }
-            
-            info = source_info.get(comic['source'], {'emoji': '📰', 'name': comic['source'].title(), 'color': 0x95A5A6})
-            
-            # Create embed
-            embed = discord.Embed(
-                title=f"{info['emoji']} {comic['title']}",
-                url=comic['url'],
-                color=info['color']
-            )
-            embed.set_image(url=comic['img'])
-            
-            if comic.get('alt'):
-                embed.description = f"_{comic['alt']}_"
-            
-            embed.set_footer(text=f"Daily Tech Comic from {info['name']} • Use !comic for more")
-            
-            # Send message
-            await channel.send(embed=embed)
-            logger.info(f"Posted {comic['source']} comic to channel {channel_id}")
-            
-            # Update state
-            state['last_posted'] = today
-            save_state(state)
-            
-        except Exception as e:
-            logger.error(f"Error posting comic: {e}", exc_info=True)
+        # Source emojis and colors (XKCD removed - has dedicated runner)
+        source_info = {
+            'joyoftech': {'emoji': '😄', 'name': 'Joy of Tech', 'color': 0xFF6B6B},
+            'turnoff': {'emoji': '💻', 'name': 'TurnOff.us', 'color': 0x4ECDC4}
+        }
         
-        finally:
-            await client.close()
-    
-    try:
-        await client.start(token)
+        info = source_info.get(comic['source'], {'emoji': '📰', 'name': comic['source'].title(), 'color': 0x95A5A6})
+        
+        # Create embed
+        embed = discord.Embed(
+            title=f"{info['emoji']} {comic['title']}",
+            url=comic['url'],
+            color=info['color']
+        )
+        embed.set_image(url=comic['img'])
+        
+        if comic.get('alt'):
+            embed.description = f"_{comic['alt']}_"
+        
+        embed.set_footer(text=f"Daily Tech Comic from {info['name']} • Use !comic for more")
+        
+        # Send message
+        await channel.send(embed=embed)
+        logger.info(f"Posted {comic['source']} comic to channel {channel.id}")
+        
+        # Update state
+        state['last_posted'] = today
+        save_state(state)
         return True
+    
     except Exception as e:
-        logger.error(f"Error running client: {e}", exc_info=True)
+        logger.error(f"Error posting comic: {e}", exc_info=True)
         return False
 
 
+async def main():
+    """Run one update and release the shared HTTP pool."""
+    try:
+        return await post_comic_update()
+    finally:
+        await get_http_client().close()
+
+
 if __name__ == '__main__':
     logger.info("Comics runner starting...")
     try:
-        asyncio.run(post_comic_update())
+        asyncio.run(main())
         logger.info("Comics runner completed")
         sys.exit(0)
     except Exception as e:
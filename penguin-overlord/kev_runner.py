@@ -7,7 +7,8 @@
 KEV Runner - Standalone execution for systemd timers
 
 Fetches CISA Known Exploited Vulnerabilities and posts to configured Discord channel.
-Runs independently of the main bot process for reliability.
+Runs independently of the main bot process for reliability, posting over
+the REST API (no gateway connection).
 
 Usage:
     python kev_runner.py
@@ -15,6 +16,7 @@ Usage:
 Environment Variables:
     DISCORD_TOKEN - Required
     NEWS_KEV_CHANNEL_ID - Required (channel ID for posting)
+    NEWS_KEV_WEBHOOK_URL - Optional (post through a channel webhook instead)
 """
 
 import os
@@ -26,13 +28,18 @@ from pathlib import Path
 from datetime import datetime
 
 import discord
-import aiohttp
 from dotenv import load_dotenv
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.secrets import get_secret
+from utils.http_client import get_http_client
+from utils.parse_pool import configure_parse_pool, get_parse_pool
+from utils.dedup import SeenCache
+from utils.discord_rest import delivery_channel
+from utils.outbox import Outbox, outbox_key
+from utils.kev_catalog import fetch_kev_delta, kev_item
 
 # Load environment
 load_dotenv()
@@ -49,7 +56,13 @@ logger = logging.getLogger('kev_runner')
 
 
 STATE_FILE = Path('data/kev_state.json')
-KEV_URL = 'https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json'
+
+# Posted KEV IDs remembered (count and seconds since last seen in the feed)
+POSTED_KEV_LIMIT = 500
+POSTED_KEV_MAX_AGE = 365 * 24 * 3600
+
+# Newest new KEVs posted per run (after a long outage the rest are skipped)
+KEV_POST_LIMIT = 10
 
 
 def load_state() -> dict:
@@ -74,43 +87,26 @@ def save_state(state: dict):
         logger.error(f"Error saving KEV state: {e}")
 
 
-async def fetch_kevs() -> list:
-    """Fetch CISA Known Exploited Vulnerabilities."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(KEV_URL, timeout=30) as resp:
-                if resp.status != 200:
-                    logger.error(f"Failed to fetch CISA KEV: HTTP {resp.status}")
-                    return []
-                
-                data = await resp.json()
-                vulnerabilities = data.get('vulnerabilities', [])
-                
-                logger.info(f"Fetched {len(vulnerabilities)} KEVs from CISA")
-                
-                # Get the most recent ones (first 10, as array is ordered newest-first)
-                recent = vulnerabilities[:10] if len(vulnerabilities) > 10 else vulnerabilities
-                
-                items = []
-                for vuln in recent:
-                    items.append({
-                        'cve_id': vuln.get('cveID', 'Unknown'),
-                        'title': vuln.get('vulnerabilityName', 'Unknown Vulnerability'),
-                        'description': vuln.get('shortDescription', 'No description'),
-                        'severity': 'CRITICAL',  # CISA KEV are all critical by nature
-                        'date_added': vuln.get('dateAdded', ''),
-                        'due_date': vuln.get('dueDate', ''),
-                        'required_action': vuln.get('requiredAction', ''),
-                        'vendor': vuln.get('vendorProject', ''),
-                        'product': vuln.get('product', ''),
-                        'link': f"https://nvd.nist.gov/vuln/detail/{vuln.get('cveID', '')}"
-                    })
-                
-                return items
+async def fetch_kevs(feed_state: dict):
+    """
+    Fetch KEVs added since the last run.
     
-    except Exception as e:
-        logger.error(f"Error fetching CISA KEV: {e}", exc_info=True)
-        return []
+    Returns:
+        (items newest-first or None on error, feed state to save)
+    """
+    session = await get_http_client().get_session()
+    delta = await fetch_kev_delta(session, feed_state, timeout=30)
+    if delta.status == 'error':
+        return None, feed_state
+    
+    if delta.status == 'not_modified':
+        logger.info("KEV catalog not modified since last run")
+    else:
+        logger.info(
+            f"KEV catalog {delta.feed_state.get('catalog_version')}: {len(delta.entries)} new entries "
+            f"({delta.bytes_read / 1024:.1f} KB read)"
+        )
+    return [kev_item(vuln) for vuln in delta.entries[:KEV_POST_LIMIT]], delta.feed_state
 
 
 async def post_kev_update():
@@ -120,143 +116,139 @@ async def post_kev_update():
     if not token:
         token = os.getenv('DISCORD_BOT_TOKEN') or os.getenv('DISCORD_TOKEN')
     
-    if not token:
-        logger.error("DISCORD_TOKEN not found")
-        return False
-    
     channel_id_str = get_secret('NEWS', 'KEV_CHANNEL_ID')
     if not channel_id_str:
         channel_id_str = os.getenv('NEWS_KEV_CHANNEL_ID')
+    webhook_url = get_secret('NEWS', 'KEV_WEBHOOK_URL')
     
-    if not channel_id_str:
+    if not channel_id_str and not webhook_url:
         logger.error("NEWS_KEV_CHANNEL_ID not set")
         return False
     
-    try:
-        channel_id = int(channel_id_str)
-    except ValueError:
+    if channel_id_str and not channel_id_str.isdigit():
         logger.error("Invalid NEWS_KEV_CHANNEL_ID (not numeric)")
         return False
     
+    channel = delivery_channel(token, channel_id_str, webhook_url)
+    if not channel:
+        logger.error("DISCORD_TOKEN not found")
+        return False
+    
     # Load state
     state = load_state()
-    posted_cves = set(state.get('posted_cves', []))
+    posted_cves = SeenCache.from_state(state.get('posted_cves'), POSTED_KEV_LIMIT, POSTED_KEV_MAX_AGE)
     
-    # Fetch KEVs
-    kevs = await fetch_kevs()
-    if not kevs:
+    # Fetch KEVs added since the last run (usually a 304 with no body)
+    kevs, feed_state = await fetch_kevs(state.get('catalog'))
+    if kevs is None:
         logger.error("Failed to fetch KEVs")
         return False
     
     # Filter to only new KEVs
-    new_kevs = [k for k in kevs if k['cve_id'] not in posted_cves]
-    
-    if not new_kevs:
-        logger.info("No new KEVs to post")
-        return True
-    
-    logger.info(f"Found {len(new_kevs)} new KEVs to post")
+    new_kevs = [k for k in kevs if not posted_cves.touch(k['cve_id'])]
     
     # IMPORTANT: Reverse so oldest posts first, newest posts last
     # CISA API returns newest-first, we want oldest→newest in Discord
     new_kevs.reverse()
     
-    # Create Discord client
-    intents = discord.Intents.default()
-    client = discord.Client(intents=intents)
-    
-    @client.event
-    async def on_ready():
-        logger.info(f"Connected as {client.user}")
-        
-        try:
-            channel = client.get_channel(channel_id)
-            if not channel:
-                channel = await client.fetch_channel(channel_id)
+    # Queued in the outbox shared with the bot (high-priority lane); a KEV is
+    # only remembered as posted once its message was delivered
+    outbox = Outbox('data/outbox.db')
+    keys = {}
+    try:
+        for kev in new_kevs:
+            embed = discord.Embed(
+                title=f"🚨 {kev['cve_id']}: {kev['title']}",
+                description=kev['description'],
+                color=0xC41230,  # Red for critical
+                url=kev['link']
+            )
             
-            if not channel:
-                logger.error(f"Channel {channel_id} not found")
-                await client.close()
-                return
+            embed.add_field(
+                name="Severity",
+                value="🔴 **CRITICAL**",
+                inline=True
+            )
             
-            # Post each new KEV
-            for kev in new_kevs:
-                embed = discord.Embed(
-                    title=f"🚨 {kev['cve_id']}: {kev['title']}",
-                    description=kev['description'],
-                    color=0xC41230,  # Red for critical
-                    url=kev['link']
-                )
-                
-                embed.add_field(
-                    name="Severity",
-                    value="🔴 **CRITICAL**",
-                    inline=True
-                )
-                
+            embed.add_field(
+                name="Vendor/Product",
+                value=f"{kev['vendor']} - {kev['product']}",
+                inline=True
+            )
+            
+            embed.add_field(
+                name="Date Added to KEV",
+                value=kev['date_added'],
+                inline=True
+            )
+            
+            if kev['due_date']:
                 embed.add_field(
-                    name="Vendor/Product",
-                    value=f"{kev['vendor']} - {kev['product']}",
+                    name="⚠️ Due Date",
+                    value=kev['due_date'],
                     inline=True
                 )
-                
+            
+            if kev['required_action']:
                 embed.add_field(
-                    name="Date Added to KEV",
-                    value=kev['date_added'],
-                    inline=True
+                    name="Required Action",
+                    value=kev['required_action'],
+                    inline=False
                 )
-                
-                if kev['due_date']:
-                    embed.add_field(
-                        name="⚠️ Due Date",
-                        value=kev['due_date'],
-                        inline=True
-                    )
-                
-                if kev['required_action']:
-                    embed.add_field(
-                        name="Required Action",
-                        value=kev['required_action'],
-                        inline=False
-                    )
-                
-                embed.set_footer(text="CISA Known Exploited Vulnerabilities Catalog")
-                
-                await channel.send(embed=embed)
-                logger.info(f"Posted KEV: {kev['cve_id']}")
-                
-                # Add to posted list
-                posted_cves.add(kev['cve_id'])
-                
-                # Small delay to avoid rate limits
-                await asyncio.sleep(1)
-            
-            # Update state
-            # Keep only last 500 CVEs in memory
-            state['posted_cves'] = list(posted_cves)[-500:]
-            state['last_posted'] = datetime.utcnow().isoformat()
-            save_state(state)
-            
-            logger.info(f"Posted {len(new_kevs)} new KEVs")
             
-        except Exception as e:
-            logger.error(f"Error posting KEVs: {e}", exc_info=True)
+            embed.set_footer(text="CISA Known Exploited Vulnerabilities Catalog")
+            key = outbox_key('kev', kev['cve_id'])
+            outbox.enqueue(key, 'kev', embed, channel_id=int(channel_id_str) if channel_id_str else None)
+            keys[key] = kev['cve_id']
+        
+        if not outbox.counts(['kev']).get('pending'):
+            logger.info("No new KEVs to post")
+            return True
+        
+        logger.info(f"Found {len(new_kevs)} new KEVs to post")
+        
+        try:
+            await channel.resolve()
+        except discord.HTTPException as e:
+            logger.error(f"Channel not available: {e}")
+            return False
         
-        finally:
-            await client.close()
+        # Several embeds go out per message
+        delivered = await outbox.drain(lambda _channel_id: channel, categories=['kev'])
+        left = outbox.counts(['kev']).get('pending', 0)
+        logger.info(f"Delivered {delivered} KEV alerts ({left} still queued)")
+        return left == 0
     
-    try:
-        await client.start(token)
-        return True
     except Exception as e:
-        logger.error(f"Error running client: {e}", exc_info=True)
+        logger.error(f"Error posting KEVs: {e}", exc_info=True)
         return False
+    
+    finally:
+        # Includes KEVs delivered earlier by the bot or a previous run
+        for key in outbox.delivered(keys):
+            posted_cves.add(keys[key])
+        outbox.close()
+        # Bounded by count and age so the state file can't grow without limit
+        state['posted_cves'] = posted_cves.to_dict()
+        state['catalog'] = feed_state
+        state['last_posted'] = datetime.utcnow().isoformat()
+        save_state(state)
+
+
+async def main():
+    """Run one update and release the shared HTTP pool and parse workers."""
+    configure_parse_pool(use_processes=False)
+    try:
+        return await post_kev_update()
+    finally:
+        await get_http_client().close()
+        get_parse_pool().close()
 
 
 if __name__ == '__main__':
     logger.info("KEV runner starting...")
     try:
-        asyncio.run(post_kev_update())
+        asyncio.run(main())
         logger.info("KEV runner completed")
         sys.exit(0)
     except Exception as e:
@@ -7,7 +7,14 @@
 Standalone News Runner - Fetch and post news without keeping bot running.
 
 This script can be run by cron or systemd timers for efficient resource usage.
-Each run fetches news for one category and exits.
+Each run fetches news for one or more categories, posts it over the Discord
+REST API (bot token, or NEWS_<CATEGORY>_WEBHOOK_URL if set) and exits.
+
+With several categories (a comma-separated list, or "all") one process
+serves them all: the HTTP pool, Discord REST client, outbox and parse
+workers are shared. Only categories whose interval_hours/minute_offset slot
+has come up since their last run are fetched (--force runs them anyway), so
+a single timer firing every 15 minutes can replace the per-category timers.
 
 Usage:
     python3 news_runner.py --category cybersecurity
@@ -20,6 +27,9 @@ Usage:
     python3 news_runner.py --category eu_legislation
     python3 news_runner.py --category uk_legislation
     python3 news_runner.py --category general_news
+    python3 news_runner.py --category all                 # Every due category
+    python3 news_runner.py --category tech,gaming --force  # Both, due or not
+    python3 news_runner.py --category tech --dump-metrics  # Print fetch metrics as JSON
 """
 
 import sys
@@ -28,6 +38,7 @@ import argparse
 import asyncio
 import logging
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -37,9 +48,16 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / "penguin-overlord"))
 
 import discord
-from discord.ext import commands
-from utils.news_fetcher import OptimizedNewsFetcher
+from utils.news_fetcher import OptimizedNewsFetcher, MAX_BATCH_ITEMS
+from utils.http_client import get_http_client
+from utils.parse_pool import configure_parse_pool, get_parse_pool
+from utils.feed_cache import category_cache_path, open_feed_cache
+from utils.fetch_metrics import summarize
+from utils.story_index import StoryIndex, DEFAULT_WINDOW_HOURS
+from utils.outbox import Outbox, outbox_key
 from utils.secrets import get_secret
+from utils.discord_rest import DiscordREST, delivery_channel
+from utils.scheduler import slot_before
 
 # Configure logging - will be set to DEBUG if --verbose flag is used
 logging.basicConfig(
@@ -48,6 +66,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CATEGORIES = [
+    'cybersecurity', 'tech', 'gaming', 'apple_google', 'cve', 'kev',
+    'us_legislation', 'eu_legislation', 'uk_legislation', 'general_news'
+]
+MAX_PARALLEL_CATEGORIES = 3
+RUN_STATE_FILE = 'news_runner_state.json'  # Last run time per category
+
 
 class StandaloneNewsRunner:
     """Standalone news fetcher and poster."""
@@ -60,8 +85,11 @@ class StandaloneNewsRunner:
         # Use /app/data for cache (mounted volume) instead of /app/penguin-overlord/data
         cache_dir = Path('/app/data')
         cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_path = cache_dir / f'feed_cache_{category}.json'
-        self.fetcher = OptimizedNewsFetcher(cache_file=str(cache_path))
+        # SQLite cache; an existing feed_cache_<category>.json is imported on first run
+        cache_path = category_cache_path(category, str(cache_dir))
+        self.fetcher = OptimizedNewsFetcher(cache_file=cache_path)
+        self.cache_dir = cache_dir
+        self.stats = {'status': 'ok', 'found': 0, 'delivered': 0, 'fetch': 0.0, 'deliver': 0.0}
         
         # Load category-specific config
         self.category_config = self.config.get(category, {})
@@ -71,6 +99,13 @@ class StandaloneNewsRunner:
         # Set concurrency limit
         limit = self.category_config.get('concurrency_limit', 5)
         self.fetcher.set_concurrency_limit(limit)
+        self.fetcher.set_streaming_parse(self.category_config.get('streaming_parse', True))
+        self.fetcher.set_parse_offload(self.category_config.get('parse_offload', True))
+        self.fetcher.set_adaptive_polling(
+            self.category_config.get('adaptive_polling', True),
+            min_interval_minutes=self.category_config.get('min_poll_minutes', 15),
+            max_interval_minutes=self.category_config.get('max_poll_minutes', 24 * 60)
+        )
     
     def _load_config(self) -> dict:
         """Load news configuration."""
@@ -149,108 +184,252 @@ class StandaloneNewsRunner:
         
         return enabled
     
-    async def fetch_and_post(self):
-        """Fetch news and post to Discord."""
+    async def fetch_and_post(self, rest: DiscordREST, outbox: Outbox):
+        """
+        Fetch news and post to Discord.
+        
+        Args:
+            rest: Discord REST client (shared between categories in one process)
+            outbox: Outbox the category's items are queued in and delivered from
+        
+        Timings and counts are left in self.stats.
+        """
         # Check if category is enabled
         if not self.category_config.get('enabled', False):
             logger.info(f"Category {self.category} is disabled, skipping")
+            self.stats['status'] = 'disabled'
             return
         
+        # A channel webhook can be used instead of the bot token
+        webhook_url = get_secret('NEWS', f'{self.category.upper()}_WEBHOOK_URL')
         channel_id = self.category_config.get('channel_id')
-        if not channel_id:
+        if not channel_id and not webhook_url:
             logger.warning(f"No channel configured for {self.category}")
+            self.stats['status'] = 'no channel'
             return
         
-        # Load bot token from secrets manager (Doppler/AWS/Vault) or env
-        token = get_secret('DISCORD', 'BOT_TOKEN')
-        if not token:
-            # Fallback to direct env var
-            token = os.getenv('DISCORD_BOT_TOKEN') or os.getenv('DISCORD_TOKEN')
-        
-        if not token:
-            logger.error("No Discord token found in secrets or environment")
+        channel = delivery_channel(rest.token, channel_id, webhook_url, rest=rest)
+        if not channel:
+            logger.error("No Discord token or webhook found in secrets or environment")
+            self.stats['status'] = 'no token'
             return
         
         # Get sources
         all_sources = self._get_sources()
         if not all_sources:
             logger.error(f"No sources found for {self.category}")
+            self.stats['status'] = 'no sources'
             return
         
         enabled_sources = self._get_enabled_sources(all_sources)
         logger.info(f"Fetching from {len(enabled_sources)} sources")
         
-        # Fetch news with caching
+        # Fetch every unseen item per source so a backlog drains in one run.
+        # Items are only marked seen once delivered; until then they wait in the outbox.
+        started = time.perf_counter()
         use_cache = self.category_config.get('use_etag_cache', True)
+        self.fetcher.set_defer_seen(True)
         new_items = await self.fetcher.fetch_multiple_feeds(
             all_sources,
             enabled_sources,
-            use_cache=use_cache
+            use_cache=use_cache,
+            batch=True,
+            max_items_per_source=self.category_config.get('max_items_per_source', MAX_BATCH_ITEMS)
         )
-        
-        if not new_items:
-            logger.info(f"No new items for {self.category}")
-            await self.fetcher.close()
-            return
-        
-        logger.info(f"Found {len(new_items)} new items")
+        self.stats['fetch'] = time.perf_counter() - started
+        self.stats['found'] = len(new_items)
         
         # IMPORTANT: Reverse items so oldest posts first, newest posts last
         # This ensures newest content appears at bottom (most recent) in Discord
         new_items.reverse()
         
-        # Create bot instance
-        intents = discord.Intents.default()
-        intents.message_content = True
-        bot = commands.Bot(command_prefix='!', intents=intents)
+        # Shared with the bot, so an item queued by either is only posted once
+        dedup_mode = self.category_config.get('dedup_mode', 'suppress')
+        keys = []
+        for title, link, description, guid, source in new_items:
+            embed = discord.Embed(
+                title=f"{source.get('icon', '📰')} {title}",
+                url=link,
+                description=description,
+                color=source.get('color', 0x5865F2),
+                timestamp=datetime.utcnow()
+            )
+            embed.set_footer(text=f"Source: {source['name']}")
+            key = outbox_key(self.category, source['url'], guid)
+            outbox.enqueue(
+                key, self.category, embed,
+                channel_id=channel_id,
+                story=(title, description, link, source['name']),
+                dedup_mode=dedup_mode,
+                batch=self.category_config.get('batch_embeds', True)
+            )
+            keys.append(key)
         
-        @bot.event
-        async def on_ready():
-            """Post news when bot is ready."""
-            try:
-                channel = bot.get_channel(channel_id)
-                if not channel:
-                    logger.error(f"Channel not found for {self.category}")
-                    await bot.close()
-                    return
-                
-                posted_count = 0
-                for title, link, description, guid, source in new_items:
-                    try:
-                        embed = discord.Embed(
-                            title=f"{source.get('icon', '📰')} {title}",
-                            url=link,
-                            description=description,
-                            color=source.get('color', 0x5865F2),
-                            timestamp=datetime.utcnow()
-                        )
-                        embed.set_footer(text=f"Source: {source['name']}")
-                        
-                        await channel.send(embed=embed)
-                        posted_count += 1
-                        
-                        # Small delay between posts
-                        await asyncio.sleep(0.5)
-                    
-                    except Exception as e:
-                        logger.error(f"Failed to post {source['name']}: {e}")
-                
-                logger.info(f"Posted {posted_count} items to {self.category} channel")
+        queued = outbox.counts([self.category]).get('pending', 0)
+        logger.info(f"Found {len(new_items)} new items, {queued} queued for {self.category}")
+        if not queued:
+            return
+        
+        # Shared across categories (and the bot) to catch the same story from several outlets
+        story_index = None
+        started = time.perf_counter()
+        
+        # Posted over the REST API - no gateway login needed for a few messages
+        try:
+            await channel.resolve()
             
-            except Exception as e:
-                logger.error(f"Error in on_ready: {e}")
+            if dedup_mode != 'off':
+                story_index = StoryIndex(
+                    str(self.cache_dir / 'story_index.db'),
+                    window_hours=self.category_config.get('dedup_window_hours', DEFAULT_WINDOW_HOURS)
+                )
             
-            finally:
-                await self.fetcher.close()
-                await bot.close()
+            # Includes items left queued by earlier runs; failed sends stay queued for the next run
+            delivered = await outbox.drain(lambda _channel_id: channel, story_index, categories=[self.category])
+            left = outbox.counts([self.category]).get('pending', 0)
+            logger.info(f"Delivered {delivered} items to {self.category} channel ({left} still queued)")
+            self.stats['delivered'] = delivered
+        
+        except discord.HTTPException as e:
+            logger.error(f"Channel not available for {self.category}: {e}")
+            self.stats['status'] = 'channel error'
         
-        # Run bot briefly to post and exit
+        finally:
+            self.stats['deliver'] = time.perf_counter() - started
+            sent = outbox.delivered(keys)
+            self.fetcher.mark_seen([
+                (source['url'], guid)
+                for (_, _, _, guid, source), key in zip(new_items, keys)
+                if key in sent
+            ])
+            if story_index:
+                story_index.close()
+    
+    def is_due(self, last_run: float = None, now: float = None) -> bool:
+        """Whether the category's interval_hours/minute_offset slot has passed since last_run."""
+        if last_run is None:
+            return True
+        interval = self.category_config.get('interval_hours', 3) * 3600
+        offset = self.category_config.get('minute_offset', 0) * 60
+        return last_run < slot_before(now or time.time(), interval, offset)
+
+
+def parse_categories(value: str) -> list:
+    """argparse type for --category: one category, a comma-separated list, or 'all'."""
+    if value == 'all':
+        return list(CATEGORIES)
+    categories = [category.strip() for category in value.split(',') if category.strip()]
+    unknown = [category for category in categories if category not in CATEGORIES]
+    if not categories or unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown category {', '.join(unknown) or value!r} (choose from all, {', '.join(CATEGORIES)})"
+        )
+    return list(dict.fromkeys(categories))
+
+
+def _load_token() -> str:
+    """Load the bot token from the secrets manager (Doppler/AWS/Vault) or env."""
+    token = get_secret('DISCORD', 'BOT_TOKEN')
+    if not token:
+        # Fallback to direct env var
+        token = os.getenv('DISCORD_BOT_TOKEN') or os.getenv('DISCORD_TOKEN')
+    return token
+
+
+def _load_run_state(path: Path) -> dict:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.error(f"Failed to load runner state: {e}")
+        return {}
+
+
+def _save_run_state(path: Path, state: dict):
+    try:
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=2)
+    except Exception as e:
+        logger.error(f"Failed to save runner state: {e}")
+
+
+async def run_categories(categories: list, force: bool = False) -> dict:
+    """
+    Fetch and post several categories in one process.
+    
+    A single category always runs (its timer decides when). With several,
+    only the ones that are due run, unless force is set; up to
+    MAX_PARALLEL_CATEGORIES run at a time.
+    
+    Returns:
+        Stats per category (status, found, delivered, fetch/deliver seconds)
+    """
+    data_dir = Path('/app/data')
+    data_dir.mkdir(parents=True, exist_ok=True)
+    state_path = data_dir / RUN_STATE_FILE
+    state = _load_run_state(state_path)
+    
+    rest = DiscordREST(_load_token())
+    outbox = Outbox(str(data_dir / 'outbox.db'))
+    slots = asyncio.Semaphore(MAX_PARALLEL_CATEGORIES)
+    results = {}
+    
+    async def run(category: str):
         try:
-            await bot.start(token)
-        except Exception as e:
-            logger.error(f"Bot error: {e}")
+            runner = StandaloneNewsRunner(category)
+        except ValueError as e:
+            logger.warning(f"Skipping {category}: {e}")
+            results[category] = {'status': 'unconfigured'}
+            return
+        
+        try:
+            if len(categories) > 1 and not force and not runner.is_due(state.get(category)):
+                runner.stats['status'] = 'not due'
+                return
+            async with slots:
+                logger.info(f"Starting news runner for category: {category}")
+                state[category] = time.time()
+                try:
+                    await runner.fetch_and_post(rest, outbox)
+                except Exception as e:
+                    logger.error(f"{category} failed: {e}", exc_info=True)
+                    runner.stats['status'] = 'error'
         finally:
-            await self.fetcher.close()
+            results[category] = runner.stats
+            await runner.fetcher.close()
+    
+    try:
+        await asyncio.gather(*(run(category) for category in categories))
+    finally:
+        outbox.close()
+        _save_run_state(state_path, state)
+    return results
+
+
+def log_summary(results: dict):
+    """Log a per-category table of statuses, counts and timings."""
+    logger.info(f"{'Category':<16} {'Status':<14} {'Found':>5} {'Posted':>6} {'Fetch':>7} {'Deliver':>8}")
+    for category, stats in results.items():
+        logger.info(
+            f"{category:<16} {stats['status']:<14} {stats.get('found', 0):>5} {stats.get('delivered', 0):>6} "
+            f"{stats.get('fetch', 0.0):>6.2f}s {stats.get('deliver', 0.0):>7.2f}s"
+        )
+
+
+def dump_metrics(categories: list):
+    """Print per-source fetch metrics as JSON on stdout (a list if several categories)."""
+    reports = []
+    for category in categories:
+        cache_path = category_cache_path(category, '/app/data')
+        metrics = {}
+        if os.path.exists(cache_path):
+            cache = open_feed_cache(cache_path)
+            metrics = {url: summarize(stats) for url, stats in cache.all_metrics().items()}
+            cache.close()
+        reports.append({'category': category, 'sources': metrics})
+    print(json.dumps(reports[0] if len(reports) == 1 else reports, indent=2))
 
 
 async def main():
@@ -259,17 +438,35 @@ async def main():
     parser.add_argument(
         '--category',
         required=True,
-        choices=['cybersecurity', 'tech', 'gaming', 'apple_google', 'cve', 'kev', 'us_legislation', 'eu_legislation', 'uk_legislation', 'general_news'],
-        help='News category to fetch'
+        type=parse_categories,
+        help=f"News category to fetch, a comma-separated list, or 'all' ({', '.join(CATEGORIES)})"
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='With several categories, run them even if their slot has not come up'
+    )
+    parser.add_argument(
+        '--dump-metrics',
+        action='store_true',
+        help='Print per-source fetch metrics as JSON and exit (no fetching)'
     )
     args = parser.parse_args()
     
-    logger.info(f"Starting news runner for category: {args.category}")
+    if args.dump_metrics:
+        dump_metrics(args.category)
+        return
     
-    runner = StandaloneNewsRunner(args.category)
-    await runner.fetch_and_post()
+    # Large feeds are still parsed off the loop, on threads rather than spawned processes
+    configure_parse_pool(use_processes=False)
+    try:
+        results = await run_categories(args.category, force=args.force)
+    finally:
+        await get_http_client().close()
+        get_parse_pool().close()
     
-    logger.info(f"News runner completed for {args.category}")
+    log_summary(results)
+    logger.info(f"News runner completed for {', '.join(args.category)}")
 
 
 if __name__ == '__main__':
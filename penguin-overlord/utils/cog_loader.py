@@ -0,0 +1,79 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Cog Loader - Manifest-driven extension loading for the bot.
+
+cogs.COG_MANIFEST marks each cog 'eager' or 'deferred'. Eager cogs are
+loaded in setup_hook, before the gateway connection, so they delay READY;
+deferred cogs are loaded in the background once the bot is ready (and a
+command that arrives before then waits for them instead of failing).
+
+The cogs of a group are loaded concurrently: setups that await I/O
+(sessions, state, the scheduler) overlap, and one failing cog does not stop
+the others. Module execution itself still happens one cog at a time, so most
+of the startup saving comes from deferring the large cogs.
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EAGER = 'eager'
+DEFERRED = 'deferred'
+LOAD_MODES = (EAGER, DEFERRED)
+
+
+def cog_manifest(cogs_dir: Path, manifest: Dict[str, str]) -> Tuple[List[str], List[str]]:
+    """
+    Split the cog modules in cogs_dir into (eager, deferred) names.
+
+    Cogs missing from the manifest (or with an unknown mode) load eagerly.
+    """
+    eager, deferred = [], []
+    for file in sorted(cogs_dir.glob('*.py')):
+        if file.name.startswith('_'):
+            continue
+
+        mode = manifest.get(file.stem)
+        if mode not in LOAD_MODES:
+            logger.warning(f"Cog {file.stem} has no valid entry in COG_MANIFEST ({mode!r}), loading eagerly")
+            mode = EAGER
+        (eager if mode == EAGER else deferred).append(file.stem)
+    return eager, deferred
+
+
+async def load_cogs(bot, names: List[str], package: str = 'cogs') -> Dict[str, Optional[float]]:
+    """
+    Load extensions concurrently, logging each one's load time.
+
+    Returns:
+        {name: load time in ms, or None if the extension failed to load}
+    """
+    async def load(name: str) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(f'{package}.{name}')
+        except Exception as e:
+            logger.error(f"✗ Failed to load extension {name}: {e}")
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(f"✓ Loaded extension: {name} ({elapsed:.0f}ms)")
+        return elapsed
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(load(name) for name in names))
+    timings = dict(zip(names, results))
+
+    loaded = [ms for ms in results if ms is not None]
+    if names:
+        logger.info(
+            f"Loaded {len(loaded)}/{len(names)} extension(s) in "
+            f"{(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+    return timings
@@ -17,6 +17,8 @@ from typing import Optional, Any
 
 from dotenv import load_dotenv
 
+from utils.secrets import get_resolver
+
 logger = logging.getLogger(__name__)
 
 # Global config instance
@@ -52,6 +54,27 @@ def load_config(env_path: str = ".env") -> bool:
         return False
 
 
+def _doppler_secrets() -> dict:
+    """Cached secrets of the configured Doppler project/config, or {} without DOPPLER_TOKEN."""
+    doppler_token = os.getenv('DOPPLER_TOKEN')
+    if not doppler_token:
+        return {}
+    return get_resolver().doppler(
+        doppler_token,
+        os.getenv('DOPPLER_PROJECT'),
+        os.getenv('DOPPLER_CONFIG', 'dev')
+    )
+
+
+def _first_value(secrets: dict, *names: str) -> Optional[str]:
+    """First non-placeholder value among names in a backend's secret set."""
+    for name in names:
+        value = secrets.get(name)
+        if value and not value.startswith('YOUR_'):
+            return value
+    return None
+
+
 def get_config(section: str, key: str, default: Any = None) -> Optional[str]:
     """
     Get configuration value from Doppler or environment variables.
@@ -78,38 +101,12 @@ def get_config(section: str, key: str, default: Any = None) -> Optional[str]:
     simple_key = key.upper()
     sectioned_key = f"{section}_{key}".upper()
     
-    # 1. Try Doppler first (if DOPPLER_TOKEN is set)
-    doppler_token = os.getenv('DOPPLER_TOKEN')
-    if doppler_token:
-        try:
-            from dopplersdk import DopplerSDK
-            
-            sdk = DopplerSDK(access_token=doppler_token)
-            secrets_response = sdk.secrets.list(
-                project=os.getenv('DOPPLER_PROJECT'),
-                config=os.getenv('DOPPLER_CONFIG', 'dev')
-            )
-            
-            if hasattr(secrets_response, 'secrets') and secrets_response.secrets:
-                # Try sectioned key first (e.g., BLUESKY_HANDLE)
-                if sectioned_key in secrets_response.secrets:
-                    value = secrets_response.secrets[sectioned_key].get('computed',
-                            secrets_response.secrets[sectioned_key].get('raw', ''))
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {sectioned_key}")
-                        return value
-                
-                # Try simple key format (e.g., CHECK_INTERVAL)
-                if simple_key in secrets_response.secrets:
-                    value = secrets_response.secrets[simple_key].get('computed',
-                            secrets_response.secrets[simple_key].get('raw', ''))
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler: {simple_key}")
-                        return value
-        except ImportError:
-            logger.debug("dopplersdk not installed, skipping Doppler lookup")
-        except Exception as e:
-            logger.debug(f"Failed to query Doppler for config: {e}")
+    # 1. Try Doppler first (if DOPPLER_TOKEN is set), sectioned key
+    # (e.g., BLUESKY_HANDLE) before simple key (e.g., CHECK_INTERVAL)
+    value = _first_value(_doppler_secrets(), sectioned_key, simple_key)
+    if value:
+        logger.debug(f"✓ Retrieved {section}.{key} from Doppler")
+        return value
     
     # 2. Try simple key format from env (e.g., CHECK_INTERVAL)
     value = os.getenv(simple_key)
@@ -212,108 +209,37 @@ def get_secret(section: str, key: str, default: Optional[str] = None) -> Optiona
             logger.debug(f"✓ Retrieved {section}.{key} from Doppler (env var)")
             return value
         
-        # If not in env, fetch from Doppler API using the SDK
-        try:
-            from dopplersdk import DopplerSDK
-            
-            sdk = DopplerSDK(access_token=doppler_token)
-            # Get all secrets for this project/config
-            secrets_response = sdk.secrets.list(
-                project=os.getenv('DOPPLER_PROJECT'),
-                config=os.getenv('DOPPLER_CONFIG', 'dev')
-            )
-            
-            # secrets is a dict of {name: {raw: ..., computed: ...}}
-            if hasattr(secrets_response, 'secrets') and secrets_response.secrets:
-                if env_var in secrets_response.secrets:
-                    secret_data = secrets_response.secrets[env_var]
-                    # Extract the computed value (or raw if computed not available)
-                    value = secret_data.get('computed', secret_data.get('raw'))
-                    # Skip placeholder values
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from Doppler (SDK)")
-                        return value
-        except ImportError:
-            logger.debug("dopplersdk not installed, skipping Doppler SDK lookup")
-        except Exception as e:
-            logger.debug(f"Doppler SDK lookup failed: {e}")
+        # If not in env, look it up in the cached Doppler snapshot
+        value = _first_value(_doppler_secrets(), env_var)
+        if value:
+            logger.debug(f"✓ Retrieved {section}.{key} from Doppler (SDK)")
+            return value
     
     # 2. Try AWS Secrets Manager (if enabled)
     if get_bool_config('Secrets', 'aws_enabled', default=False):
-        try:
-            import boto3
-            import json
-            
-            # Get the secret name for this section (e.g., boon-tube/youtube, boon-tube/discord)
-            secret_name = get_config('Secrets', 'aws_secret_name', default='boon-tube')
-            
-            client = boto3.client('secretsmanager')
-            response = client.get_secret_value(SecretId=f"{secret_name}/{section.lower()}")
-            
-            if 'SecretString' in response:
-                secret_dict = json.loads(response['SecretString'])
-                # Try exact key match first
-                if key in secret_dict:
-                    value = secret_dict[key]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from AWS Secrets Manager")
-                        return value
-                # Try uppercase key (for consistency)
-                if key.upper() in secret_dict:
-                    value = secret_dict[key.upper()]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from AWS Secrets Manager")
-                        return value
-                # Try the full env var name
-                if env_var in secret_dict:
-                    value = secret_dict[env_var]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from AWS Secrets Manager")
-                        return value
-        except ImportError:
-            logger.debug("boto3 not installed, skipping AWS Secrets Manager")
-        except Exception as e:
-            logger.debug(f"AWS Secrets Manager lookup failed: {e}")
+        # Get the secret name for this section (e.g., boon-tube/youtube, boon-tube/discord)
+        secret_name = get_config('Secrets', 'aws_secret_name', default='boon-tube')
+        secret_dict = get_resolver().aws(f"{secret_name}/{section.lower()}")
+        # Exact key, then uppercase key, then the full env var name
+        value = _first_value(secret_dict, key, key.upper(), env_var)
+        if value:
+            logger.debug(f"✓ Retrieved {section}.{key} from AWS Secrets Manager")
+            return value
     
     # 3. Try HashiCorp Vault (if enabled)
     if get_bool_config('Secrets', 'vault_enabled', default=False):
-        try:
-            import hvac
-            
-            vault_addr = get_config('Secrets', 'vault_url')
-            vault_token = get_config('Secrets', 'vault_token')
-            vault_path = get_config('Secrets', 'vault_path', default='secret/boon-tube')
-            
-            if vault_addr and vault_token:
-                client = hvac.Client(url=vault_addr, token=vault_token)
-                # Read from path like: secret/boon-tube/youtube
-                secret = client.secrets.kv.v2.read_secret_version(
-                    path=f"{vault_path}/{section.lower()}"
-                )
-                
-                data = secret['data']['data']
-                # Try exact key match first
-                if key in data:
-                    value = data[key]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from HashiCorp Vault")
-                        return value
-                # Try uppercase key
-                if key.upper() in data:
-                    value = data[key.upper()]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from HashiCorp Vault")
-                        return value
-                # Try the full env var name
-                if env_var in data:
-                    value = data[env_var]
-                    if value and not value.startswith('YOUR_'):
-                        logger.debug(f"✓ Retrieved {section}.{key} from HashiCorp Vault")
-                        return value
-        except ImportError:
-            logger.debug("hvac not installed, skipping HashiCorp Vault")
-        except Exception as e:
-            logger.debug(f"Vault lookup failed: {e}")
+        vault_addr = get_config('Secrets', 'vault_url')
+        vault_token = get_config('Secrets', 'vault_token')
+        vault_path = get_config('Secrets', 'vault_path', default='secret/boon-tube')
+        
+        if vault_addr and vault_token:
+            # Read from path like: secret/boon-tube/youtube
+            data = get_resolver().vault(vault_addr, vault_token, f"{vault_path}/{section.lower()}")
+            # Exact key, then uppercase key, then the full env var name
+            value = _first_value(data, key, key.upper(), env_var)
+            if value:
+                logger.debug(f"✓ Retrieved {section}.{key} from HashiCorp Vault")
+                return value
     
     # 4. Fallback to environment variable or .env file
     value = get_config(section, key, default=default)
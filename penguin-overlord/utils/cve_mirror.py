@@ -0,0 +1,332 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+CVE Mirror - Local SQLite copy of the NVD CVE records the bot has synced.
+
+Each record keeps the ID, English description, CVSS v3.x and v4.0 vectors
+and scores, the vulnerable CPEs, reference URLs and the published/modified
+dates. An FTS5 table (external content, kept in step by triggers) indexes
+descriptions and products for keyword search, and a vendor/product table
+taken from the CPEs answers product lookups from an index. Lookups never
+call NVD, and stay in the millisecond range at a full backfill (~250k CVEs).
+
+Rows are keyed by a number derived from the CVE ID (year, then sequence), so
+"newest first" is the primary key order and FTS5 can return the first few
+matches of a common word without ranking every one of them.
+
+sync() applies NVD deltas (see utils.nvd_sync); its sync state lives in the
+database with the records, so the two cannot drift apart. Writes go through
+a second connection on a worker thread, so storing a 2000-CVE page does not
+hold up the event loop; lookups keep reading the last committed state.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from utils.nvd_sync import DATE_FORMAT, NVDDelta, fetch_nvd_delta
+
+logger = logging.getLogger(__name__)
+
+
+def _cvss(metrics: dict, *versions: str) -> dict:
+    """Vector, score and severity of the first listed CVSS version (NVD's own score preferred)."""
+    for version in versions:
+        entries = metrics.get(version) or []
+        if entries:
+            metric = next((m for m in entries if m.get('type') == 'Primary'), entries[0])
+            data = metric.get('cvssData', {})
+            return {
+                'vector': data.get('vectorString'),
+                'score': data.get('baseScore'),
+                'severity': data.get('baseSeverity')
+            }
+    return {'vector': None, 'score': None, 'severity': None}
+
+
+def _cpes(cve: dict) -> List[str]:
+    """Vulnerable CPE match strings, in order, without duplicates."""
+    cpes = {}
+    for configuration in cve.get('configurations', []):
+        for node in configuration.get('nodes', []):
+            for match in node.get('cpeMatch', []):
+                if match.get('vulnerable') and match.get('criteria'):
+                    cpes[match['criteria']] = None
+    return list(cpes)
+
+
+def _cve_number(cve_id: str) -> int:
+    """Sortable key for a CVE ID (CVE-2024-3094 -> 202400003094)."""
+    _, year, sequence = cve_id.split('-')
+    return int(year) * 10 ** 8 + int(sequence)
+
+
+def _product_key(name: str) -> str:
+    """CPE spelling of a vendor or product name ("HTTP Server" -> "http_server")."""
+    return re.sub(r'\s+', '_', name.strip().lower())
+
+
+def record_item(record: dict) -> dict:
+    """Turn a mirror record into the item dict the CVE cog posts."""
+    desc = record['description'] or 'No description'
+    return {
+        'cve_id': record['id'],
+        'title': f"CVE {record['id']}",
+        'description': desc[:300] + '...' if len(desc) > 300 else desc,
+        'severity': record['cvss3_severity'] or record['cvss4_severity'] or 'UNKNOWN',
+        'date_added': record['published'] or '',
+        'source': 'nvd',
+        'link': f"https://nvd.nist.gov/vuln/detail/{record['id']}"
+    }
+
+
+class CVEMirror:
+    """SQLite mirror of NVD CVE records with full-text and product lookup."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cves (
+            num INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            description TEXT NOT NULL DEFAULT '',
+            products TEXT NOT NULL DEFAULT '',
+            cvss3_vector TEXT,
+            cvss3_score REAL,
+            cvss3_severity TEXT,
+            cvss4_vector TEXT,
+            cvss4_score REAL,
+            cvss4_severity TEXT,
+            cpes TEXT NOT NULL DEFAULT '[]',
+            refs TEXT NOT NULL DEFAULT '[]',
+            published TEXT,
+            last_modified TEXT,
+            first_seen REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cves_published ON cves (published);
+        CREATE INDEX IF NOT EXISTS idx_cves_first_seen ON cves (first_seen);
+        CREATE TABLE IF NOT EXISTS cve_products (
+            vendor TEXT NOT NULL,
+            product TEXT NOT NULL,
+            cve_num INTEGER NOT NULL REFERENCES cves (num) ON DELETE CASCADE,
+            PRIMARY KEY (product, vendor, cve_num)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_cve_products_vendor ON cve_products (vendor, cve_num);
+        CREATE INDEX IF NOT EXISTS idx_cve_products_cve ON cve_products (cve_num);
+        CREATE VIRTUAL TABLE IF NOT EXISTS cves_fts USING fts5 (
+            description, products, content='cves', content_rowid='num', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS cves_ai AFTER INSERT ON cves BEGIN
+            INSERT INTO cves_fts (rowid, description, products) VALUES (new.num, new.description, new.products);
+        END;
+        CREATE TRIGGER IF NOT EXISTS cves_ad AFTER DELETE ON cves BEGIN
+            INSERT INTO cves_fts (cves_fts, rowid, description, products)
+            VALUES ('delete', old.num, old.description, old.products);
+        END;
+        CREATE TRIGGER IF NOT EXISTS cves_au AFTER UPDATE ON cves BEGIN
+            INSERT INTO cves_fts (cves_fts, rowid, description, products)
+            VALUES ('delete', old.num, old.description, old.products);
+            INSERT INTO cves_fts (rowid, description, products) VALUES (new.num, new.description, new.products);
+        END;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = 'data/cve_mirror.db'):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+
+        # All writes, serialised by _write_lock; used from worker threads during syncs
+        self._writer = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._writer.execute('PRAGMA synchronous=NORMAL')
+        self._writer.execute('PRAGMA foreign_keys=ON')
+        self._write_lock = threading.Lock()
+        self._lock = asyncio.Lock()
+
+    def _meta(self, key: str, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row['value']) if row else default
+
+    def _set_meta(self, key: str, value):
+        with self._write_lock, self._writer:
+            self._writer.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value',
+                (key, json.dumps(value))
+            )
+
+    @property
+    def sync_state(self) -> dict:
+        return self._meta('nvd_sync', {})
+
+    def upsert(self, cves: Iterable[dict], now: Optional[float] = None) -> int:
+        """Store NVD 'cve' objects (rejected ones are removed). Returns the number stored."""
+        now = now or time.time()
+        rows, products, rejected = [], [], []
+        for cve in cves:
+            num = _cve_number(cve['id'])
+            if cve.get('vulnStatus') == 'Rejected':
+                rejected.append((num,))
+                continue
+
+            cpes = _cpes(cve)
+            pairs = {tuple(cpe.split(':')[3:5]) for cpe in cpes if cpe.count(':') >= 4}
+            metrics = cve.get('metrics', {})
+            cvss3 = _cvss(metrics, 'cvssMetricV31', 'cvssMetricV30')
+            cvss4 = _cvss(metrics, 'cvssMetricV40')
+            rows.append((
+                num, cve['id'],
+                next((d['value'] for d in cve.get('descriptions', []) if d.get('lang') == 'en'), ''),
+                ' '.join(f'{vendor} {product}' for vendor, product in sorted(pairs)),
+                cvss3['vector'], cvss3['score'], cvss3['severity'],
+                cvss4['vector'], cvss4['score'], cvss4['severity'],
+                json.dumps(cpes),
+                json.dumps(list(dict.fromkeys(r['url'] for r in cve.get('references', []) if r.get('url')))),
+                cve.get('published'), cve.get('lastModified'), now
+            ))
+            products.extend((vendor, product, num) for vendor, product in pairs)
+
+        with self._write_lock, self._writer:
+            self._writer.executemany('DELETE FROM cves WHERE num = ?', rejected)
+            self._writer.executemany(
+                """
+                INSERT INTO cves
+                    (num, id, description, products, cvss3_vector, cvss3_score, cvss3_severity,
+                     cvss4_vector, cvss4_score, cvss4_severity, cpes, refs, published, last_modified, first_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (num) DO UPDATE SET
+                    description = excluded.description, products = excluded.products,
+                    cvss3_vector = excluded.cvss3_vector, cvss3_score = excluded.cvss3_score,
+                    cvss3_severity = excluded.cvss3_severity, cvss4_vector = excluded.cvss4_vector,
+                    cvss4_score = excluded.cvss4_score, cvss4_severity = excluded.cvss4_severity,
+                    cpes = excluded.cpes, refs = excluded.refs, published = excluded.published,
+                    last_modified = excluded.last_modified
+                """,
+                rows
+            )
+            self._writer.executemany('DELETE FROM cve_products WHERE cve_num = ?', [(row[0],) for row in rows])
+            self._writer.executemany(
+                'INSERT OR IGNORE INTO cve_products (vendor, product, cve_num) VALUES (?, ?, ?)', products
+            )
+        return len(rows)
+
+    async def _store_page(self, cves: List[dict]):
+        """Upsert one NVD page on a worker thread."""
+        await asyncio.to_thread(self.upsert, cves)
+
+    def _record(self, row: sqlite3.Row) -> Dict:
+        record = dict(row)
+        del record['num']
+        record['cpes'] = json.loads(record['cpes'])
+        record['refs'] = json.loads(record['refs'])
+        return record
+
+    def get(self, cve_id: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT * FROM cves WHERE id = ?', (cve_id.strip().upper(),)).fetchone()
+        return self._record(row) if row else None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Records whose description or products contain every word of query, newest CVE first."""
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+        # Each word quoted, so user input is never parsed as FTS5 syntax
+        match = ' '.join(f'"{word}"' for word in words)
+        rows = self.conn.execute(
+            """
+            SELECT cves.* FROM cves_fts JOIN cves ON cves.num = cves_fts.rowid
+            WHERE cves_fts MATCH ? ORDER BY cves_fts.rowid DESC LIMIT ?
+            """,
+            (match, limit)
+        ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def product(self, name: str, limit: int = 10) -> List[Dict]:
+        """Records affecting a CPE product or vendor ("http server", "apache"), newest CVE first."""
+        key = _product_key(name)
+        rows = self.conn.execute(
+            """
+            SELECT * FROM cves WHERE num IN (
+                SELECT cve_num FROM cve_products WHERE product = ?
+                UNION SELECT cve_num FROM cve_products WHERE vendor = ?
+            ) ORDER BY num DESC LIMIT ?
+            """,
+            (key, key, limit)
+        ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def first_seen_between(self, since: float, until: float, published_after: str, limit: int = 50) -> List[Dict]:
+        """Records added to the mirror in (since, until] and published after published_after, newest first."""
+        rows = self.conn.execute(
+            """
+            SELECT * FROM cves WHERE first_seen > ? AND first_seen <= ? AND published >= ?
+            ORDER BY published DESC LIMIT ?
+            """,
+            (since, until, published_after, limit)
+        ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM cves').fetchone()[0]
+
+    async def sync(self, session, api_key: Optional[str] = None, **kwargs) -> NVDDelta:
+        """Apply the NVD changes since the last sync (pages are stored as they arrive)."""
+        async with self._lock:
+            state = self.sync_state
+            delta = await fetch_nvd_delta(session, state, api_key=api_key, on_page=self._store_page, **kwargs)
+            if not state and delta.sync_state:
+                await asyncio.to_thread(self._set_meta, 'nvd_synced_from', delta.window_start)
+            await asyncio.to_thread(self._set_meta, 'nvd_sync', delta.sync_state)
+            if delta.requests:
+                logger.info(
+                    f"CVE mirror sync: {delta.requests} request(s), {delta.bytes_read / 1024:.0f} KB, "
+                    f"{self.count()} records"
+                )
+            return delta
+
+    async def backfill(self, session, days: int, api_key: Optional[str] = None, **kwargs) -> NVDDelta:
+        """
+        Add the CVEs last modified in the days before the first sync.
+
+        Can take a while without an API key (a full ten-year backfill is
+        ~125 pages at NVD's anonymous limit); incremental syncs carry on
+        meanwhile.
+        """
+        if not self.sync_state:
+            await self.sync(session, api_key=api_key, **kwargs)
+        synced_from = self._meta('nvd_synced_from')
+        if not synced_from:
+            return NVDDelta('error')
+
+        end = datetime.strptime(synced_from, DATE_FORMAT)
+        start = (end - timedelta(days=days)).strftime(DATE_FORMAT)
+        delta = await fetch_nvd_delta(
+            session, {'last_mod_end': start}, api_key=api_key, now=end, on_page=self._store_page, **kwargs
+        )
+        if delta.status == 'updated':
+            await asyncio.to_thread(self._set_meta, 'nvd_synced_from', start)
+        logger.info(f"CVE mirror backfill from {start}: {delta.status}, {self.count()} records")
+        return delta
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+        if self._writer:
+            with self._write_lock:
+                self._writer.close()
+            self._writer = None
@@ -0,0 +1,111 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Dedup - Bounded "already posted" tracking shared by the fetcher, cogs and runners.
+
+SeenCache keeps keys in the order they were last seen, so membership checks
+are O(1) and eviction always drops the oldest entries first (by count and,
+optionally, by age). It serializes to a compact {key: unix_seconds} dict and
+still loads the plain lists older state files were written with.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+class SeenCache:
+    """Insertion-ordered set of keys with size and age limits."""
+
+    def __init__(self, max_size: int, max_age: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of keys kept; the oldest are evicted first
+            max_age: Seconds after which a key not seen again expires (None = never)
+        """
+        self.max_size = max_size
+        self.max_age = max_age
+        self._items: 'OrderedDict[str, float]' = OrderedDict()  # key -> last seen
+
+    @classmethod
+    def from_state(
+        cls,
+        data: Union[Dict[str, float], List[str], None],
+        max_size: int,
+        max_age: Optional[float] = None
+    ) -> 'SeenCache':
+        """
+        Build a cache from serialized state.
+
+        Accepts the {key: timestamp} dict written by to_dict() or a legacy list
+        of keys (oldest first), which is stamped as seen just now.
+        """
+        cache = cls(max_size, max_age)
+        if isinstance(data, dict):
+            entries = sorted(data.items(), key=lambda kv: kv[1])
+        else:
+            now = time.time()
+            keys = list(data or [])
+            entries = [(key, now - len(keys) + idx) for idx, key in enumerate(keys)]
+
+        for key, seen_at in entries:
+            cache._items[key] = float(seen_at)
+            cache._items.move_to_end(key)
+        cache._evict()
+        return cache
+
+    def _is_expired(self, seen_at: float, now: float) -> bool:
+        return self.max_age is not None and now - seen_at > self.max_age
+
+    def _evict(self, now: Optional[float] = None):
+        """Drop expired keys and anything over max_size, oldest first."""
+        now = time.time() if now is None else now
+        while self._items:
+            key, seen_at = next(iter(self._items.items()))
+            if len(self._items) > self.max_size or self._is_expired(seen_at, now):
+                self._items.popitem(last=False)
+            else:
+                break
+
+    def __contains__(self, key: str) -> bool:
+        seen_at = self._items.get(key)
+        return seen_at is not None and not self._is_expired(seen_at, time.time())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def items(self) -> List[Tuple[str, float]]:
+        """(key, last_seen) pairs, oldest first."""
+        return list(self._items.items())
+
+    def add(self, key: str, now: Optional[float] = None):
+        """Record a key as seen now, moving it to the newest position."""
+        now = time.time() if now is None else now
+        self._items[key] = now
+        self._items.move_to_end(key)
+        self._evict(now)
+
+    def touch(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Refresh a key if it is already known.
+
+        Use this when a source still lists an item that was posted before, so
+        it does not age out (and get re-posted) while it is still visible.
+
+        Returns:
+            True if the key was present (and not expired)
+        """
+        if key not in self:
+            return False
+        self.add(key, now)
+        return True
+
+    def to_dict(self) -> Dict[str, int]:
+        """Compact JSON-friendly form: {key: unix_seconds}."""
+        self._evict()
+        return {key: int(seen_at) for key, seen_at in self._items.items()}
@@ -0,0 +1,210 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Discord REST - Post messages without a gateway connection.
+
+The standalone runners only send a handful of embeds per run. Logging in to
+the gateway for that (identify, READY, guild streaming) costs seconds and tens
+of MB, so they post through the HTTP API instead: either the channel messages
+endpoint with the bot token, or a channel webhook.
+
+RESTChannel.send() mirrors discord.abc.Messageable.send() closely enough for
+post_story(), and raises the same discord.HTTPException subclasses. Requests
+honor Discord's per-route rate limit buckets and retry 429s and 5xx errors.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+import discord
+
+from utils.http_client import get_http_client, HTTPClient
+
+logger = logging.getLogger(__name__)
+
+API_BASE = 'https://discord.com/api/v10'
+MAX_RETRIES = 3
+USER_AGENT = 'DiscordBot (https://github.com/ChiefGyk3D/penguin-overlord, 1.0)'
+
+
+class RESTMessage:
+    """The parts of a discord.Message that callers of send() use."""
+
+    def __init__(self, channel: 'RESTChannel', data: dict):
+        self.channel = channel
+        self.id = int(data['id'])
+
+    @property
+    def jump_url(self) -> str:
+        return f"https://discord.com/channels/{self.channel.guild_id or '@me'}/{self.channel.id}/{self.id}"
+
+
+class DiscordREST:
+    """Minimal Discord HTTP API client with rate limit bucket handling."""
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        http_client: Optional[HTTPClient] = None,
+        api_base: str = API_BASE
+    ):
+        self.token = token
+        self.api_base = api_base
+        self.http_client = http_client or get_http_client()
+        self._route_buckets: Dict[str, str] = {}  # "POST /channels/1/messages" -> bucket hash
+        self._limits: Dict[str, Tuple[int, float]] = {}  # bucket -> (remaining, reset at)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._global_reset = 0.0
+
+    def channel(self, channel_id: int) -> 'RESTChannel':
+        """Channel posted to with the bot token."""
+        return RESTChannel(self, channel_id=int(channel_id))
+
+    def webhook(self, url: str) -> 'RESTChannel':
+        """Channel posted to through a webhook URL (no bot token needed)."""
+        return RESTChannel(self, webhook_url=url.rstrip('/'))
+
+    async def _wait_for_bucket(self, bucket: str):
+        now = time.time()
+        remaining, reset_at = self._limits.get(bucket, (1, 0.0))
+        delay = max(self._global_reset - now, reset_at - now if remaining <= 0 else 0)
+        if delay > 0:
+            logger.info(f"Rate limited on {bucket}, waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def _update_bucket(self, route: str, headers) -> str:
+        bucket = headers.get('X-RateLimit-Bucket')
+        if bucket:
+            self._route_buckets[route] = bucket
+        else:
+            bucket = self._route_buckets.get(route, route)
+        if 'X-RateLimit-Remaining' in headers and 'X-RateLimit-Reset-After' in headers:
+            self._limits[bucket] = (
+                int(headers['X-RateLimit-Remaining']),
+                time.time() + float(headers['X-RateLimit-Reset-After'])
+            )
+        return bucket
+
+    async def request(self, method: str, url: str, payload: Optional[dict] = None, auth: bool = True) -> Optional[dict]:
+        """
+        Send a request, waiting out rate limits.
+
+        Raises:
+            discord.HTTPException (Forbidden/NotFound/DiscordServerError) on failure
+        """
+        # Bucket key: method + path with its major parameter (channel or webhook id)
+        route = f"{method} {url.split('?')[0].replace(self.api_base, '')}"
+        headers = {'User-Agent': USER_AGENT}
+        if auth and self.token:
+            headers['Authorization'] = f'Bot {self.token}'
+
+        session = await self.http_client.get_session()
+        for attempt in range(MAX_RETRIES + 1):
+            bucket = self._route_buckets.get(route, route)
+            async with self._locks.setdefault(bucket, asyncio.Lock()):
+                await self._wait_for_bucket(bucket)
+                async with session.request(method, url, json=payload, headers=headers) as resp:
+                    bucket = self._update_bucket(route, resp.headers)
+                    text = await resp.text()
+                    data = json.loads(text) if text and resp.content_type == 'application/json' else text
+
+                    if 200 <= resp.status < 300:
+                        return data
+
+                    if resp.status == 429 and attempt < MAX_RETRIES:
+                        body = data if isinstance(data, dict) else {}
+                        retry_after = float(body.get('retry_after') or resp.headers.get('Retry-After', 1))
+                        if body.get('global') or resp.headers.get('X-RateLimit-Global'):
+                            self._global_reset = time.time() + retry_after
+                        else:
+                            self._limits[bucket] = (0, time.time() + retry_after)
+                        logger.warning(f"429 on {route} (bucket {bucket}), retrying in {retry_after:.2f}s")
+                        continue
+
+                    if resp.status >= 500 and attempt < MAX_RETRIES:
+                        logger.warning(f"HTTP {resp.status} on {route}, retrying")
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+
+                    if resp.status == 403:
+                        raise discord.Forbidden(resp, data)
+                    if resp.status == 404:
+                        raise discord.NotFound(resp, data)
+                    if resp.status >= 500:
+                        raise discord.DiscordServerError(resp, data)
+                    raise discord.HTTPException(resp, data)
+
+
+class RESTChannel:
+    """A text channel (or a webhook into one) that messages can be sent to."""
+
+    def __init__(self, rest: DiscordREST, channel_id: Optional[int] = None, webhook_url: Optional[str] = None):
+        self.rest = rest
+        self.id = channel_id
+        self.webhook_url = webhook_url
+        self.guild_id: Optional[int] = None
+        self._resolved = False
+
+    async def resolve(self) -> 'RESTChannel':
+        """
+        Look up the channel (or webhook) once: checks it exists and fills in
+        the ids needed for jump URLs and reply references.
+        """
+        if not self._resolved:
+            if self.webhook_url:
+                data = await self.rest.request('GET', self.webhook_url, auth=False)
+                self.id = int(data['channel_id'])
+            else:
+                data = await self.rest.request('GET', f"{self.rest.api_base}/channels/{self.id}")
+            self.guild_id = int(data['guild_id']) if data.get('guild_id') else None
+            self._resolved = True
+        return self
+
+    async def send(
+        self,
+        content: Optional[str] = None,
+        embed: Optional[discord.Embed] = None,
+        embeds: Optional[list] = None,
+        reference: Optional[discord.MessageReference] = None,
+        mention_author: bool = False
+    ) -> RESTMessage:
+        """Post a message. Returns the created message."""
+        await self.resolve()
+        payload = {'allowed_mentions': {'parse': [], 'replied_user': mention_author}}
+        if content:
+            payload['content'] = content
+        if embed or embeds:
+            payload['embeds'] = [e.to_dict() for e in (embeds or [embed])]
+
+        if self.webhook_url:
+            # Webhook messages can't be replies; the caller's fallback text/links still apply
+            data = await self.rest.request('POST', f"{self.webhook_url}?wait=true", payload, auth=False)
+        else:
+            if reference:
+                payload['message_reference'] = reference.to_dict()
+            data = await self.rest.request('POST', f"{self.rest.api_base}/channels/{self.id}/messages", payload)
+        return RESTMessage(self, data)
+
+
+def delivery_channel(
+    token: Optional[str],
+    channel_id=None,
+    webhook_url: Optional[str] = None,
+    rest: Optional[DiscordREST] = None
+) -> Optional[RESTChannel]:
+    """
+    Pick how a runner posts: a configured webhook wins, otherwise the channel
+    endpoint with the bot token. Returns None if neither is usable.
+
+    Pass rest to share one client (and its rate limit state) between channels.
+    """
+    if webhook_url:
+        return (rest or DiscordREST()).webhook(webhook_url)
+    if token and channel_id:
+        return (rest or DiscordREST(token)).channel(channel_id)
+    return None
@@ -0,0 +1,69 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Embed Batching - Pack several embeds into one Discord message.
+
+A message can carry up to 10 embeds as long as their combined text stays
+within 6000 characters. Sending a run's new items that way turns ten posts
+into one or two API calls. Works with discord.py channels and the runners'
+RESTChannel alike (both accept send(embeds=[...])).
+"""
+
+import logging
+from typing import List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS = 6000  # Combined title/description/fields/footer/author text of a message
+
+
+def pack_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """
+    Group embeds, in order, into as few messages as the limits allow.
+
+    An embed that is too long to share a message is sent on its own.
+    """
+    batches = []
+    current: List[discord.Embed] = []
+    size = 0
+
+    for embed in embeds:
+        length = len(embed)
+        if current and (len(current) >= MAX_EMBEDS_PER_MESSAGE or size + length > MAX_EMBED_CHARS):
+            batches.append(current)
+            current, size = [], 0
+        current.append(embed)
+        size += length
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def send_embeds(channel, embeds: List[discord.Embed], batch: bool = True) -> List[Optional[discord.Message]]:
+    """
+    Send embeds to a channel, batched into multi-embed messages unless batch is False.
+
+    Returns:
+        The message each embed went out in (same order as embeds), or None
+        where sending failed - failures are logged and the rest still sent.
+    """
+    groups = pack_embeds(embeds) if batch else [[embed] for embed in embeds]
+    messages: List[Optional[discord.Message]] = []
+
+    for group in groups:
+        try:
+            message = await channel.send(embeds=group)
+        except Exception as e:
+            logger.error(f"Failed to send {len(group)} embed(s): {e}")
+            message = None
+        messages.extend([message] * len(group))
+
+    if len(groups) < len(embeds):
+        logger.info(f"Sent {len(embeds)} embeds in {len(groups)} messages")
+    return messages
@@ -0,0 +1,340 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Feed Cache Storage - Persistence backends for OptimizedNewsFetcher.
+
+Stores per-URL HTTP validators (ETag/Last-Modified), recently posted GUIDs,
+adaptive polling stats, circuit breaker health and fetch metrics. SQLiteFeedCache is the default; JSONFeedCache
+keeps the original single-file format for existing cache files.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from utils.dedup import SeenCache
+
+logger = logging.getLogger(__name__)
+
+# GUIDs remembered per feed
+GUID_HISTORY_SIZE = 50
+
+
+class JSONFeedCache:
+    """Whole-file JSON feed cache (legacy format)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        """Load ETag and Last-Modified cache from file."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    cache = json.load(f)
+                cache.setdefault('etags', {})
+                cache.setdefault('last_modified', {})
+                cache.setdefault('last_guids', {})
+                cache.setdefault('schedule', {})
+                cache.setdefault('health', {})
+                cache.setdefault('metrics', {})
+                cache['last_guids'] = defaultdict(self._new_guid_cache, {
+                    url: SeenCache.from_state(guids, GUID_HISTORY_SIZE)
+                    for url, guids in cache['last_guids'].items()
+                })
+                return cache
+            except Exception as e:
+                logger.error(f"Failed to load feed cache: {e}")
+
+        return {
+            'etags': {},  # url -> etag
+            'last_modified': {},  # url -> last-modified header
+            'last_guids': defaultdict(self._new_guid_cache),  # url -> SeenCache of last N GUIDs
+            'schedule': {},  # url -> adaptive polling stats and next poll time
+            'health': {},  # url -> circuit breaker state for failing feeds
+            'metrics': {}  # url -> accumulated fetch telemetry
+        }
+
+    @staticmethod
+    def _new_guid_cache() -> SeenCache:
+        return SeenCache(GUID_HISTORY_SIZE)
+
+    def get_validators(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        return self.data['etags'].get(url), self.data['last_modified'].get(url)
+
+    def set_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Store validators; None leaves the existing value untouched."""
+        if etag:
+            self.data['etags'][url] = etag
+        if last_modified:
+            self.data['last_modified'][url] = last_modified
+
+    def has_guids(self, url: str) -> bool:
+        return bool(self.data['last_guids'].get(url))
+
+    def is_seen(self, url: str, guid: str) -> bool:
+        guids = self.data['last_guids'].get(url)
+        return guids is not None and guid in guids
+
+    def seen_guids(self, url: str) -> FrozenSet[str]:
+        return frozenset(self.data['last_guids'].get(url, ()))
+
+    def add_guid(self, url: str, guid: str):
+        self.data['last_guids'][url].add(guid)
+
+    def get_schedule(self, url: str) -> Optional[Dict]:
+        return self.data['schedule'].get(url)
+
+    def set_schedule(self, url: str, stats: Dict):
+        self.data['schedule'][url] = stats
+
+    def get_health(self, url: str) -> Optional[Dict]:
+        return self.data['health'].get(url)
+
+    def set_health(self, url: str, stats: Optional[Dict]):
+        """Store breaker state; None clears it (feed is healthy)."""
+        if stats is None:
+            self.data['health'].pop(url, None)
+        else:
+            self.data['health'][url] = stats
+
+    def all_health(self) -> Dict[str, Dict]:
+        return dict(self.data['health'])
+
+    def get_metrics(self, url: str) -> Optional[Dict]:
+        return self.data['metrics'].get(url)
+
+    def set_metrics(self, url: str, stats: Dict):
+        self.data['metrics'][url] = stats
+
+    def all_metrics(self) -> Dict[str, Dict]:
+        return dict(self.data['metrics'])
+
+    def save(self):
+        """Rewrite the whole cache file."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            cache_copy = {
+                'etags': self.data['etags'],
+                'last_modified': self.data['last_modified'],
+                'last_guids': {url: guids.to_dict() for url, guids in self.data['last_guids'].items()},
+                'schedule': self.data['schedule'],
+                'health': self.data['health'],
+                'metrics': self.data['metrics']
+            }
+            with open(self.path, 'w') as f:
+                json.dump(cache_copy, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save feed cache: {e}")
+
+    def close(self):
+        self.save()
+
+
+class SQLiteFeedCache:
+    """
+    SQLite feed cache in WAL mode.
+
+    Rows are read on demand and only changed rows are written, so cache I/O
+    scales with the number of changes rather than total feeds x history.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT
+        );
+        CREATE TABLE IF NOT EXISTS seen_guids (
+            url TEXT NOT NULL,
+            guid TEXT NOT NULL,
+            seen_at REAL NOT NULL,
+            PRIMARY KEY (url, guid)
+        );
+        CREATE INDEX IF NOT EXISTS idx_seen_guids_url_seen_at ON seen_guids (url, seen_at);
+        CREATE TABLE IF NOT EXISTS schedule (
+            url TEXT PRIMARY KEY,
+            stats TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS health (
+            url TEXT PRIMARY KEY,
+            stats TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS metrics (
+            url TEXT PRIMARY KEY,
+            stats TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: str, legacy_json: Optional[str] = None):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        is_new = not os.path.exists(path)
+
+        # Autocommit, so no write lock is held across awaits while the runner shares the file
+        self.conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self._pruned_urls = set()  # Feeds that received new GUIDs since last save
+
+        if is_new and legacy_json and os.path.exists(legacy_json):
+            self._import_json(legacy_json)
+
+    def _import_json(self, legacy_json: str):
+        """One-time migration from a legacy JSON cache file."""
+        legacy = JSONFeedCache(legacy_json).data
+        urls = set(legacy['etags']) | set(legacy['last_modified'])
+        self.conn.execute('BEGIN IMMEDIATE')
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO validators (url, etag, last_modified) VALUES (?, ?, ?)',
+            [(url, legacy['etags'].get(url), legacy['last_modified'].get(url)) for url in urls]
+        )
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO seen_guids (url, guid, seen_at) VALUES (?, ?, ?)',
+            [
+                (url, guid, seen_at)
+                for url, guids in legacy['last_guids'].items()
+                for guid, seen_at in guids.items()
+            ]
+        )
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO schedule (url, stats) VALUES (?, ?)',
+            [(url, json.dumps(stats)) for url, stats in legacy['schedule'].items()]
+        )
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO health (url, stats) VALUES (?, ?)',
+            [(url, json.dumps(stats)) for url, stats in legacy['health'].items()]
+        )
+        self.conn.execute('COMMIT')
+        logger.info(f"Migrated feed cache from {legacy_json} to {self.path}")
+
+    def get_validators(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        row = self.conn.execute(
+            'SELECT etag, last_modified FROM validators WHERE url = ?', (url,)
+        ).fetchone()
+        return row if row else (None, None)
+
+    def set_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Store validators; None leaves the existing value untouched."""
+        if not etag and not last_modified:
+            return
+        self.conn.execute(
+            """
+            INSERT INTO validators (url, etag, last_modified) VALUES (?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                etag = COALESCE(excluded.etag, etag),
+                last_modified = COALESCE(excluded.last_modified, last_modified)
+            """,
+            (url, etag, last_modified)
+        )
+
+    def has_guids(self, url: str) -> bool:
+        return self.conn.execute(
+            'SELECT 1 FROM seen_guids WHERE url = ? LIMIT 1', (url,)
+        ).fetchone() is not None
+
+    def is_seen(self, url: str, guid: str) -> bool:
+        return self.conn.execute(
+            'SELECT 1 FROM seen_guids WHERE url = ? AND guid = ?', (url, guid)
+        ).fetchone() is not None
+
+    def seen_guids(self, url: str) -> FrozenSet[str]:
+        return frozenset(
+            row[0] for row in self.conn.execute('SELECT guid FROM seen_guids WHERE url = ?', (url,))
+        )
+
+    def add_guid(self, url: str, guid: str):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO seen_guids (url, guid, seen_at) VALUES (?, ?, ?)',
+            (url, guid, time.time())
+        )
+        self._pruned_urls.add(url)
+
+    def get_schedule(self, url: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT stats FROM schedule WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_schedule(self, url: str, stats: Dict):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO schedule (url, stats) VALUES (?, ?)',
+            (url, json.dumps(stats, separators=(',', ':')))
+        )
+
+    def get_health(self, url: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT stats FROM health WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_health(self, url: str, stats: Optional[Dict]):
+        """Store breaker state; None clears it (feed is healthy)."""
+        if stats is None:
+            self.conn.execute('DELETE FROM health WHERE url = ?', (url,))
+        else:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO health (url, stats) VALUES (?, ?)',
+                (url, json.dumps(stats, separators=(',', ':')))
+            )
+
+    def all_health(self) -> Dict[str, Dict]:
+        return {url: json.loads(stats) for url, stats in self.conn.execute('SELECT url, stats FROM health')}
+
+    def get_metrics(self, url: str) -> Optional[Dict]:
+        row = self.conn.execute('SELECT stats FROM metrics WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_metrics(self, url: str, stats: Dict):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO metrics (url, stats) VALUES (?, ?)',
+            (url, json.dumps(stats, separators=(',', ':')))
+        )
+
+    def all_metrics(self) -> Dict[str, Dict]:
+        return {url: json.loads(stats) for url, stats in self.conn.execute('SELECT url, stats FROM metrics')}
+
+    def save(self):
+        """Trim GUID history for touched feeds (writes are committed as they are made)."""
+        if not self.conn or not self._pruned_urls:
+            return
+        try:
+            self.conn.execute('BEGIN IMMEDIATE')
+            for url in self._pruned_urls:
+                self.conn.execute(
+                    """
+                    DELETE FROM seen_guids WHERE url = ? AND guid NOT IN (
+                        SELECT guid FROM seen_guids WHERE url = ? ORDER BY seen_at DESC LIMIT ?
+                    )
+                    """,
+                    (url, url, GUID_HISTORY_SIZE)
+                )
+            self.conn.execute('COMMIT')
+            self._pruned_urls.clear()
+        except Exception as e:
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            logger.error(f"Failed to save feed cache: {e}")
+
+    def close(self):
+        if self.conn:
+            self.save()
+            self.conn.close()
+            self.conn = None
+
+
+def category_cache_path(category: str, data_dir: str = 'data') -> str:
+    """Feed cache database used by the news runner for a category."""
+    return os.path.join(data_dir, f'feed_cache_{category}.db')
+
+
+def open_feed_cache(path: str):
+    """Open the cache backend for a path: SQLite for .db/.sqlite files, JSON otherwise."""
+    root, ext = os.path.splitext(path)
+    if ext in ('.db', '.sqlite', '.sqlite3'):
+        return SQLiteFeedCache(path, legacy_json=f'{root}.json')
+    return JSONFeedCache(path)
@@ -0,0 +1,148 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Fetch Metrics - Per-source telemetry for OptimizedNewsFetcher.
+
+Each fetch records time-to-first-byte, total latency, response bytes, HTTP
+status (or error), parse time and items found. Samples are aggregated in
+memory into fixed-bucket histograms and merged into the feed cache on flush,
+so totals accumulate across runner invocations.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds in milliseconds (last bucket is everything above)
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+PARSE_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 1000]
+
+
+def _empty_stats() -> Dict:
+    return {
+        'requests': 0,
+        'status': {},  # "200"/"304"/"timeout"/... -> count
+        'bytes': 0,
+        'items': 0,
+        'ttfb_ms': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'latency_ms': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'parse_ms': [0] * (len(PARSE_BUCKETS_MS) + 1),
+        'total_latency_ms': 0.0,
+        'total_parse_ms': 0.0,
+        'last_fetch': None
+    }
+
+
+def _observe(histogram: List[int], bounds: List[int], value_ms: float):
+    for idx, bound in enumerate(bounds):
+        if value_ms <= bound:
+            histogram[idx] += 1
+            return
+    histogram[-1] += 1
+
+
+def _percentile(histogram: List[int], bounds: List[int], pct: float) -> Optional[float]:
+    """
+    Upper bound of the bucket containing the given percentile (None if empty).
+
+    Values past the last bound are reported as that bound, i.e. "at least".
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    target = total * pct
+    running = 0
+    for idx, count in enumerate(histogram):
+        running += count
+        if running >= target:
+            return float(bounds[min(idx, len(bounds) - 1)])
+    return float(bounds[-1])
+
+
+def merge_stats(base: Dict, delta: Dict) -> Dict:
+    """Add the counters of delta into base (both in _empty_stats format)."""
+    merged = _empty_stats()
+    merged.update(base)
+    for key in ('requests', 'bytes', 'items', 'total_latency_ms', 'total_parse_ms'):
+        merged[key] = merged[key] + delta[key]
+    status = dict(merged['status'])
+    for code, count in delta['status'].items():
+        status[code] = status.get(code, 0) + count
+    merged['status'] = status
+    for key in ('ttfb_ms', 'latency_ms', 'parse_ms'):
+        merged[key] = [a + b for a, b in zip(merged[key], delta[key])]
+    merged['last_fetch'] = delta['last_fetch'] or merged['last_fetch']
+    return merged
+
+
+def summarize(stats: Dict) -> Dict:
+    """Derived view of stored stats: percentiles, averages and the 304 ratio."""
+    requests = stats['requests']
+    status = stats['status']
+    answered = status.get('200', 0) + status.get('304', 0)
+    return {
+        'requests': requests,
+        'status': status,
+        'bytes': stats['bytes'],
+        'avg_bytes': stats['bytes'] // answered if answered else 0,
+        'items': stats['items'],
+        'not_modified_ratio': round(status.get('304', 0) / answered, 3) if answered else None,
+        'error_ratio': round(1 - answered / requests, 3) if requests else None,
+        'ttfb_p50_ms': _percentile(stats['ttfb_ms'], LATENCY_BUCKETS_MS, 0.5),
+        'latency_p50_ms': _percentile(stats['latency_ms'], LATENCY_BUCKETS_MS, 0.5),
+        'latency_p95_ms': _percentile(stats['latency_ms'], LATENCY_BUCKETS_MS, 0.95),
+        'parse_p95_ms': _percentile(stats['parse_ms'], PARSE_BUCKETS_MS, 0.95),
+        'total_latency_ms': round(stats['total_latency_ms'], 1),
+        'total_parse_ms': round(stats['total_parse_ms'], 1),
+        'last_fetch': stats['last_fetch']
+    }
+
+
+class FetchMetrics:
+    """In-memory per-URL fetch metrics, flushed into the feed cache."""
+
+    def __init__(self):
+        self._pending: Dict[str, Dict] = defaultdict(_empty_stats)
+
+    def record(
+        self,
+        url: str,
+        status: str,
+        latency: float,
+        ttfb: Optional[float] = None,
+        size: int = 0,
+        parse_time: Optional[float] = None,
+        items: int = 0
+    ):
+        """
+        Record one fetch.
+
+        Args:
+            status: HTTP status code as a string, or an error name ('timeout')
+            latency: Seconds from request start to the end of processing
+            ttfb: Seconds until response headers arrived (None if none did)
+            size: Response body bytes read
+            parse_time: Seconds spent parsing the body
+            items: New items found
+        """
+        stats = self._pending[url]
+        stats['requests'] += 1
+        stats['status'][status] = stats['status'].get(status, 0) + 1
+        stats['bytes'] += size
+        stats['items'] += items
+        stats['total_latency_ms'] += latency * 1000
+        _observe(stats['latency_ms'], LATENCY_BUCKETS_MS, latency * 1000)
+        if ttfb is not None:
+            _observe(stats['ttfb_ms'], LATENCY_BUCKETS_MS, ttfb * 1000)
+        if parse_time is not None:
+            stats['total_parse_ms'] += parse_time * 1000
+            _observe(stats['parse_ms'], PARSE_BUCKETS_MS, parse_time * 1000)
+        stats['last_fetch'] = int(time.time())
+
+    def flush(self, feed_cache):
+        """Merge pending samples into the feed cache's stored metrics."""
+        for url, delta in self._pending.items():
+            feed_cache.set_metrics(url, merge_stats(feed_cache.get_metrics(url) or _empty_stats(), delta))
+        self._pending.clear()
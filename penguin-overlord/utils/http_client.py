@@ -0,0 +1,85 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Shared HTTP Client - One pooled aiohttp session for the whole process.
+
+Every cog, runner and the news fetcher go through this so keep-alive
+connections, TLS sessions and DNS lookups are reused across all feed URLs.
+"""
+
+import logging
+import asyncio
+import aiohttp
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared timeouts - pass per request via `timeout=`
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+API_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5)
+# Short timeout for half-open circuit breaker probes of feeds that kept failing
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=3)
+
+
+class HTTPClient:
+    """Process-wide pooled HTTP client with per-host limits and DNS caching."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 4,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: aiohttp.ClientTimeout = API_TIMEOUT
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._lock = asyncio.Lock()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it (and its connector) on first use."""
+        if self._session and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if not self._session or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=self.timeout
+                )
+                logger.debug(
+                    f"Created shared HTTP session (limit={self.limit}, "
+                    f"per_host={self.limit_per_host}, dns_ttl={self.dns_cache_ttl}s)"
+                )
+
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_http_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HTTPClient()
+    return _http_client
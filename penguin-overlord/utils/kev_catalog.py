@@ -0,0 +1,408 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+KEV Catalog - Incremental ingestion of the CISA Known Exploited Vulnerabilities feed.
+
+The catalog is one JSON document of well over a megabyte, listing entries
+newest-first. Instead of downloading and decoding all of it per poll:
+
+- Requests carry the stored ETag/Last-Modified, so an unchanged catalog
+  costs a 304 with no body.
+- A changed catalog is decoded as it streams in, one entry at a time, and
+  the download stops at the first entry older than the newest dateAdded
+  already seen. Only that delta is returned.
+- The catalogVersion is compared as soon as the header has arrived; a 200
+  for a version we already have stops there too.
+
+The caller keeps the feed state (validators, version, newest dateAdded) and
+saves KEVDelta.feed_state once it has queued the delta.
+
+KEVIndex keeps a local copy of the whole catalog with in-memory indexes
+(CVE ID, vendor, product, keywords, due date) for lookups without a download.
+"""
+
+import asyncio
+import bisect
+import codecs
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from utils.http_client import API_TIMEOUT
+from utils.parse_pool import parse_json
+
+logger = logging.getLogger(__name__)
+
+KEV_URL = 'https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json'
+CHUNK_SIZE = 16 * 1024
+FIRST_RUN_LIMIT = 10  # Entries returned when there is no feed state yet
+FULL_SYNC_INTERVAL = 24 * 3600  # KEVIndex re-reads the whole catalog this often
+
+_ARRAY_START = re.compile(r'"vulnerabilities"\s*:\s*\[')
+_HEADER_FIELD = re.compile(r'"(\w+)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_SEPARATOR = re.compile(r'[\s,]*')
+
+
+class KEVStreamDecoder:
+    """
+    Incremental decoder for the KEV catalog document.
+
+    feed() takes raw bytes as they arrive and returns the vulnerability
+    entries completed so far. The header's string fields (catalogVersion,
+    dateReleased, ...) are available in .header once the array has started.
+    """
+
+    def __init__(self):
+        self.header: Optional[dict] = None
+        self.done = False
+        self.bytes_read = 0
+        self._text = ''
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[dict]:
+        self.bytes_read += len(chunk)
+        self._text += self._utf8.decode(chunk, final)
+
+        if self.header is None:
+            match = _ARRAY_START.search(self._text)
+            if not match:
+                if final:
+                    raise ValueError("KEV catalog has no vulnerabilities array")
+                return []
+            self.header = dict(_HEADER_FIELD.findall(self._text[:match.start()]))
+            self._text = self._text[match.end():]
+
+        entries = []
+        pos = 0
+        while not self.done:
+            pos = _SEPARATOR.match(self._text, pos).end()
+            if pos >= len(self._text):
+                break
+            if self._text[pos] == ']':
+                self.done = True
+                break
+            try:
+                entry, pos = self._json.raw_decode(self._text, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # Entry not complete yet
+            entries.append(entry)
+
+        self._text = self._text[pos:]
+        return entries
+
+
+@dataclass
+class KEVDelta:
+    """Result of one catalog poll."""
+    status: str  # 'not_modified', 'unchanged', 'updated' or 'error'
+    entries: List[dict] = field(default_factory=list)  # New entries, newest first
+    feed_state: dict = field(default_factory=dict)  # To store once the entries are queued
+    bytes_read: int = 0
+
+
+def kev_item(vuln: dict) -> dict:
+    """Flatten a catalog entry into the fields the KEV embeds use."""
+    return {
+        'cve_id': vuln.get('cveID', 'Unknown'),
+        'title': vuln.get('vulnerabilityName', 'Unknown Vulnerability'),
+        'description': vuln.get('shortDescription', 'No description'),
+        'severity': 'CRITICAL',  # CISA KEV are all critical by nature
+        'date_added': vuln.get('dateAdded', ''),
+        'due_date': vuln.get('dueDate', ''),
+        'required_action': vuln.get('requiredAction', ''),
+        'vendor': vuln.get('vendorProject', ''),
+        'product': vuln.get('product', ''),
+        'link': f"https://nvd.nist.gov/vuln/detail/{vuln.get('cveID', '')}"
+    }
+
+
+def _advance(feed_state: dict, entries: List[dict]) -> dict:
+    """Move the newest-dateAdded watermark past entries."""
+    state = dict(feed_state)
+    newest = max([state.get('last_date_added') or ''] + [e.get('dateAdded', '') for e in entries])
+    if newest:
+        ids = set(state.get('last_ids', [])) if newest == state.get('last_date_added') else set()
+        ids.update(e.get('cveID') for e in entries if e.get('dateAdded') == newest)
+        state['last_date_added'] = newest
+        state['last_ids'] = sorted(ids)
+    return state
+
+
+async def fetch_kev_delta(
+    session,
+    feed_state: Optional[dict] = None,
+    limit: Optional[int] = None,
+    full: bool = False,
+    url: str = KEV_URL,
+    timeout=API_TIMEOUT
+) -> KEVDelta:
+    """
+    Fetch catalog entries added since feed_state.
+
+    Args:
+        session: aiohttp session
+        feed_state: State from the previous KEVDelta.feed_state; None or {}
+            returns the newest entries (FIRST_RUN_LIMIT unless limit is given)
+        limit: Stop after this many new entries
+        full: Return every entry if the catalog changed (still a conditional
+            request), e.g. to rebuild a local copy
+
+    Returns:
+        KEVDelta; on 'error' the feed state is returned unchanged
+    """
+    feed_state = dict(feed_state or {})
+    synced = bool(feed_state.get('last_date_added'))
+    last_date = None if full else feed_state.get('last_date_added')
+    known_ids = set() if full else set(feed_state.get('last_ids', []))
+    if not last_date and not full:
+        limit = limit or FIRST_RUN_LIMIT
+
+    headers = {}
+    if feed_state.get('etag'):
+        headers['If-None-Match'] = feed_state['etag']
+    if feed_state.get('last_modified'):
+        headers['If-Modified-Since'] = feed_state['last_modified']
+
+    try:
+        async with session.get(url, headers=headers, timeout=timeout) as resp:
+            if resp.status == 304:
+                return KEVDelta('not_modified', feed_state=feed_state)
+            if resp.status != 200:
+                logger.warning(f"Failed to fetch CISA KEV: HTTP {resp.status}")
+                return KEVDelta('error', feed_state=feed_state)
+
+            state = dict(feed_state)
+            if resp.headers.get('ETag'):
+                state['etag'] = resp.headers['ETag']
+            if resp.headers.get('Last-Modified'):
+                state['last_modified'] = resp.headers['Last-Modified']
+
+            decoder = KEVStreamDecoder()
+            entries = []
+
+            def unchanged() -> bool:
+                """Record the header once it arrives; True if we already have this version."""
+                if 'catalog_version' in state or decoder.header is None:
+                    return False
+                state['catalog_version'] = decoder.header.get('catalogVersion')
+                state['date_released'] = decoder.header.get('dateReleased')
+                version = state['catalog_version']
+                return bool(synced and version and version == feed_state.get('catalog_version'))
+
+            def take(new_entries: List[dict]) -> bool:
+                """Collect new entries; True once the rest of the catalog is not needed."""
+                for entry in new_entries:
+                    if last_date and entry.get('dateAdded', '') < last_date:
+                        return True  # Everything from here on was seen before
+                    if entry.get('cveID') not in known_ids:
+                        entries.append(entry)
+                        if limit and len(entries) >= limit:
+                            return True
+                return decoder.done
+
+            state.pop('catalog_version', None)
+            finished = False
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                new_entries = decoder.feed(chunk)
+                if unchanged():
+                    return KEVDelta('unchanged', feed_state=state, bytes_read=decoder.bytes_read)
+                if take(new_entries):
+                    finished = True
+                    break
+            if not finished:
+                new_entries = decoder.feed(b'', final=True)  # Raises on a truncated document
+                if unchanged():
+                    return KEVDelta('unchanged', feed_state=state, bytes_read=decoder.bytes_read)
+                take(new_entries)
+
+            # Leaving without reading the rest closes the connection: the
+            # remaining megabyte is never downloaded
+            return KEVDelta('updated', entries, _advance(state, entries), decoder.bytes_read)
+
+    except Exception as e:
+        logger.error(f"Error fetching CISA KEV: {e}")
+        return KEVDelta('error', feed_state=feed_state)
+
+
+def _words(text: str) -> Set[str]:
+    return {word for word in re.findall(r'\w+', text.lower()) if len(word) > 1}
+
+
+def _entry_words(vuln: dict) -> Set[str]:
+    """Words an entry is found by in KEVIndex.search()."""
+    return _words(f"{vuln.get('vendorProject', '')} {vuln.get('product', '')} {vuln.get('vulnerabilityName', '')}")
+
+
+class KEVIndex:
+    """
+    Local copy of the KEV catalog with in-memory lookup indexes.
+
+    Queries never touch the network. refresh() keeps the copy current with
+    conditional delta polls, and re-reads the whole catalog (still
+    conditionally) every FULL_SYNC_INTERVAL so edits to existing entries
+    and removals are picked up.
+    """
+
+    def __init__(self, path: str = 'data/kev_catalog.json', url: str = KEV_URL):
+        self.path = path
+        self.url = url
+        self.feed_state: dict = {}
+        self.synced_at = 0.0
+        self.full_synced_at = 0.0
+        self._lock = asyncio.Lock()
+        self._build([])
+
+    def _build(self, vulnerabilities: Iterable[dict]):
+        self.entries: Dict[str, dict] = {}
+        self.by_vendor: Dict[str, Set[str]] = defaultdict(set)
+        self.by_product: Dict[str, Set[str]] = defaultdict(set)
+        self.by_word: Dict[str, Set[str]] = defaultdict(set)
+        self._by_due: List[tuple] = []  # Sorted (dueDate, cveID)
+        self._add(vulnerabilities)
+
+    def _add(self, vulnerabilities: Iterable[dict]):
+        """Index new entries, replacing any with the same CVE ID."""
+        for vuln in vulnerabilities:
+            cve_id = vuln.get('cveID')
+            if not cve_id:
+                continue
+            if cve_id in self.entries:
+                self._remove(cve_id)
+
+            self.entries[cve_id] = vuln
+            self.by_vendor[vuln.get('vendorProject', '').lower()].add(cve_id)
+            self.by_product[vuln.get('product', '').lower()].add(cve_id)
+            for word in _entry_words(vuln):
+                self.by_word[word].add(cve_id)
+            bisect.insort(self._by_due, (vuln.get('dueDate', ''), cve_id))
+
+    def _remove(self, cve_id: str):
+        vuln = self.entries.pop(cve_id)
+        self.by_vendor[vuln.get('vendorProject', '').lower()].discard(cve_id)
+        self.by_product[vuln.get('product', '').lower()].discard(cve_id)
+        for word in _entry_words(vuln):
+            self.by_word[word].discard(cve_id)
+        position = bisect.bisect_left(self._by_due, (vuln.get('dueDate', ''), cve_id))
+        if position < len(self._by_due) and self._by_due[position][1] == cve_id:
+            del self._by_due[position]
+
+    def _newest_first(self, ids: Iterable[str]) -> List[dict]:
+        return sorted(
+            (self.entries[cve_id] for cve_id in ids),
+            key=lambda vuln: (vuln.get('dateAdded', ''), vuln['cveID']),
+            reverse=True
+        )
+
+    def get(self, cve_id: str) -> Optional[dict]:
+        return self.entries.get(cve_id.strip().upper())
+
+    def latest(self, count: int = 5) -> List[dict]:
+        return self._newest_first(self.entries)[:count]
+
+    def _lookup(self, index: Dict[str, Set[str]], name: str) -> List[dict]:
+        """Exact (case-insensitive) name, else every name starting with it."""
+        key = name.strip().lower()
+        ids = index.get(key)
+        if not ids and key:
+            ids = set().union(*(ids for indexed, ids in index.items() if indexed.startswith(key)))
+        return self._newest_first(ids or ())
+
+    def vendor(self, name: str) -> List[dict]:
+        """Entries for a vendorProject, newest first."""
+        return self._lookup(self.by_vendor, name)
+
+    def product(self, name: str) -> List[dict]:
+        """Entries for a product, newest first."""
+        return self._lookup(self.by_product, name)
+
+    def search(self, query: str) -> List[dict]:
+        """A CVE ID, or entries whose vendor, product and name contain every word of query."""
+        entry = self.get(query)
+        if entry:
+            return [entry]
+        words = _words(query)
+        if not words:
+            return []
+        ids = set.intersection(*(self.by_word.get(word, set()) for word in words))
+        return self._newest_first(ids)
+
+    def due_soon(self, days: int = 14, today: Optional[date] = None) -> List[dict]:
+        """Entries whose remediation due date is within the next days, soonest first."""
+        today = today or date.today()
+        start = bisect.bisect_left(self._by_due, (today.isoformat(),))
+        end = bisect.bisect_right(self._by_due, ((today + timedelta(days=days)).isoformat(), '\uffff'))
+        return [self.entries[cve_id] for _, cve_id in self._by_due[start:end]]
+
+    async def load(self):
+        """Load the stored copy (parsed off the event loop)."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = await parse_json(f.read())
+            self.feed_state = data.get('feed_state', {})
+            self.synced_at = data.get('synced_at', 0.0)
+            self.full_synced_at = data.get('full_synced_at', 0.0)
+            self._build(data.get('vulnerabilities', []))
+            logger.info(f"Loaded {len(self.entries)} KEV entries from {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to load KEV catalog copy: {e}")
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'feed_state': self.feed_state,
+                    'synced_at': self.synced_at,
+                    'full_synced_at': self.full_synced_at,
+                    'vulnerabilities': self._newest_first(self.entries)
+                }, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save KEV catalog copy: {e}")
+
+    async def refresh(self, session, force_full: bool = False) -> List[dict]:
+        """
+        Bring the local copy up to date.
+
+        Returns:
+            Entries that were not in the copy before, newest first
+        """
+        async with self._lock:
+            now = time.time()
+            full = force_full or not self.entries or now - self.full_synced_at > FULL_SYNC_INTERVAL
+            delta = await fetch_kev_delta(session, self.feed_state if self.entries else None, full=full, url=self.url)
+            if delta.status == 'error':
+                return []
+
+            new = [vuln for vuln in delta.entries if vuln.get('cveID') not in self.entries]
+            if full and delta.status == 'updated':
+                self._build(delta.entries)
+            else:
+                self._add(delta.entries)
+
+            self.feed_state = delta.feed_state
+            self.synced_at = now
+            if full:
+                self.full_synced_at = now
+            await asyncio.to_thread(self._save)
+
+            if delta.status == 'updated':
+                logger.info(
+                    f"KEV catalog {'re-read' if full else 'updated'}: {len(new)} new, "
+                    f"{len(self.entries)} total ({delta.bytes_read / 1024:.0f} KB read)"
+                )
+            return new
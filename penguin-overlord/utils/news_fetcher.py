@@ -10,16 +10,94 @@ import logging
 import aiohttp
 import asyncio
 import re
-import json
-import os
+import time
+import statistics
+import xml.etree.ElementTree as ET
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from html import unescape
 from html.parser import HTMLParser
-from typing import Optional, Tuple, Dict, List
-from collections import defaultdict
+from typing import Optional, Tuple, Dict, List, FrozenSet
+from utils.http_client import HTTPClient, FEED_TIMEOUT, PROBE_TIMEOUT, get_http_client
+from utils.feed_cache import open_feed_cache
+from utils.fetch_metrics import FetchMetrics
+from utils.parse_pool import ParsePool, get_parse_pool
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of items inspected per feed when looking for unseen content
+MAX_ITEMS_CHECKED = 5
+
+# Default cap on new items returned per source in batch mode
+MAX_BATCH_ITEMS = 10
+
+# Chunk size used when streaming feed bodies into the pull parser
+STREAM_CHUNK_SIZE = 8192
+
+# Adaptive polling defaults (seconds)
+MIN_POLL_INTERVAL = 15 * 60
+MAX_POLL_INTERVAL = 24 * 60 * 60
+
+# Feeds due within this window are polled now rather than skipped until the next run
+POLL_GRACE_SECONDS = 5 * 60
+
+# Publish timestamps kept per feed for interval estimation
+PUBLISH_HISTORY_SIZE = 20
+
+# Weight of the latest poll in the moving 304 ratio
+NOT_MODIFIED_ALPHA = 0.2
+
+# Circuit breaker: consecutive failures before a feed is skipped, and the
+# exponential backoff (seconds) applied while it keeps failing
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 10 * 60
+BREAKER_MAX_BACKOFF = 24 * 60 * 60
+
+# Namespaces whose <item>/<entry> children carry the core feed fields.
+# Anything else (media:, dc:, content:...) is ignored by the streaming parser.
+FEED_NAMESPACES = {
+    '',
+    'http://www.w3.org/2005/Atom',
+    'http://purl.org/rss/1.0/',
+    'http://my.netscape.com/rdf/simple/0.9/',
+}
+
+
+def _split_tag(tag: str) -> Tuple[str, str]:
+    """Split an ElementTree tag into (namespace, local name)."""
+    if tag.startswith('{'):
+        namespace, _, local = tag[1:].partition('}')
+        return namespace, local
+    return '', tag
+
+
+def _parse_retry_after(raw: Optional[str], now: float) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds from now."""
+    if not raw:
+        return None
+    raw = raw.strip()
+    if raw.isdigit():
+        return float(raw)
+    try:
+        return max(parsedate_to_datetime(raw).timestamp() - now, 0.0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_published(raw: Optional[str]) -> Optional[float]:
+    """Parse an RSS (RFC 822) or Atom (ISO 8601) date into a UNIX timestamp."""
+    if not raw:
+        return None
+    raw = raw.strip()
+    try:
+        return parsedate_to_datetime(raw).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(raw.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
 
 class HTMLStripper(HTMLParser):
     """Simple HTML stripper that removes all tags and keeps only text."""
@@ -37,45 +115,184 @@ class HTMLStripper(HTMLParser):
         return ''.join(self.text)
 
 
+def _clean_title(raw: str) -> str:
+    """Unescape HTML entities and strip tags from a title."""
+    # IMPORTANT: Unescape HTML entities FIRST, then strip tags
+    title = unescape(raw.strip())
+    return re.sub(r'<[^>]+>', '', title).strip()
+
+
+def _title_from_content(raw: str) -> str:
+    """Build a fallback title from the first sentence of item content."""
+    if not raw:
+        return ""
+    content = re.sub(r'<[^>]+>', '', raw)
+    content = unescape(content.strip())
+    # Get first sentence or first 100 chars
+    first_sentence = re.split(r'[.!?]\s+', content)[0]
+    return first_sentence[:100] + ("..." if len(first_sentence) > 100 else "")
+
+
+def _clean_description(raw: str, source_name: str) -> str:
+    """Strip HTML from a description, normalize whitespace and truncate to 300 chars."""
+    desc = raw.strip()
+
+    # Log raw description for debugging
+    logger.debug(f"{source_name}: Raw desc length: {len(desc)}, first 100 chars: {desc[:100]}")
+
+    # IMPORTANT: Unescape HTML entities FIRST (converts &lt; to <, &amp; to &, etc.)
+    # This ensures the HTML parser can see actual tags, not entity-encoded text
+    desc = unescape(desc)
+    logger.debug(f"{source_name}: After unescape: {desc[:100]}")
+
+    # Use HTML parser to properly strip all tags
+    stripper = HTMLStripper()
+    try:
+        stripper.feed(desc)
+        desc = stripper.get_text()
+        logger.debug(f"{source_name}: After HTMLStripper: {desc[:100]}")
+    except Exception as e:
+        # Fallback to regex if parser fails
+        logger.warning(f"HTML parser failed for {source_name}, using regex: {e}")
+        desc = re.sub(r'<script[^>]*>.*?</script[^>]*>', '', desc, flags=re.DOTALL | re.IGNORECASE)
+        desc = re.sub(r'<style[^>]*>.*?</style[^>]*>', '', desc, flags=re.DOTALL | re.IGNORECASE)
+        desc = re.sub(r'<[^>]+>', '', desc)
+        logger.debug(f"{source_name}: After regex: {desc[:100]}")
+
+    # Clean up whitespace
+    desc = re.sub(r'\s+', ' ', desc)  # Normalize whitespace
+    desc = desc.strip()
+
+    # Truncate if too long
+    return desc[:300] + "..." if len(desc) > 300 else desc
+
+
+def _parse_feed_document(
+    content: str,
+    url: str,
+    source_name: str,
+    seen: FrozenSet[str],
+    max_new: int = 1,
+    stop_at_seen: bool = False
+) -> List[Tuple[str, str, str, str, Optional[float]]]:
+    """
+    Regex-parse RSS/Atom feed content and return up to max_new unseen items, newest first.
+
+    Items are (title, link, description, guid, published timestamp or None).
+    Pure function of its arguments (GUIDs already posted are passed in as
+    `seen`), so it can run in a parse pool worker thread or process.
+    """
+    new_items = []
+    found = set()  # GUIDs returned by this call
+    try:
+        # Detect feed type and parse accordingly - handle tags with attributes/whitespace
+        item_pattern = r'<item(?:\s+[^>]*)?>.*?</item>' if '<item' in content else r'<entry(?:\s+[^>]*)?>.*?</entry>'
+        items = re.findall(item_pattern, content, re.DOTALL)
+
+        if not items:
+            logger.debug(f"{source_name}: No items found in feed")
+            return new_items
+
+        # Check multiple items to find new ones
+        for idx, item in enumerate(items):
+            if len(new_items) >= max_new:
+                break
+            if not new_items and idx >= MAX_ITEMS_CHECKED:
+                break
+
+            # Extract GUID/ID for deduplication
+            guid_match = re.search(r'<guid(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</guid>', item, re.DOTALL)
+            if not guid_match:
+                guid_match = re.search(r'<id(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</id>', item, re.DOTALL)
+
+            guid = guid_match.group(1).strip() if guid_match else None
+
+            # Check if we've already seen this GUID
+            if guid and (guid in seen or guid in found):
+                if stop_at_seen:
+                    break  # Everything older was handled by earlier runs
+                continue  # Skip already posted items
+
+            # Extract title
+            title = None
+            title_match = re.search(r'<title(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</title>', item, re.DOTALL)
+            if title_match:
+                title = _clean_title(title_match.group(1))
+
+            # If no title or empty, try content/summary for a title
+            if not title:
+                # Try to extract from content as fallback
+                content_match = re.search(r'<content(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</content>', item, re.DOTALL)
+                if not content_match:
+                    content_match = re.search(r'<summary(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</summary>', item, re.DOTALL)
+
+                if content_match:
+                    title = _title_from_content(content_match.group(1))
+
+            # Final fallback
+            if not title:
+                title = "Latest Update"
+
+            # Extract link
+            link_match = re.search(r'<link(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</link>', item, re.DOTALL)
+            if not link_match:
+                link_match = re.search(r'<link\s+href="([^"]+)"', item)
+            link = link_match.group(1).strip() if link_match else url
+
+            # Extract description
+            desc_match = re.search(r'<description>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</description>', item, re.DOTALL)
+            if not desc_match:
+                desc_match = re.search(r'<summary>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</summary>', item, re.DOTALL)
+            if not desc_match:
+                desc_match = re.search(r'<content(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</content>', item, re.DOTALL)
+
+            description = ""
+            if desc_match:
+                description = _clean_description(desc_match.group(1), source_name)
+
+            # Use link as fallback GUID
+            if not guid:
+                guid = link
+
+            # Extract publish date (RSS pubDate, Atom published/updated)
+            date_match = re.search(r'<(pubDate|published|updated)(?:\s+[^>]*)?>(.*?)</\1>', item, re.DOTALL)
+            published = _parse_published(date_match.group(2)) if date_match else None
+
+            found.add(guid)
+            new_items.append((title, link, description, guid, published))
+
+        if not new_items:
+            logger.debug(f"{source_name}: All items already posted")
+        return new_items
+
+    except Exception as e:
+        logger.error(f"{source_name}: Error parsing feed: {e}")
+        return new_items
+
+
 class OptimizedNewsFetcher:
     """Base class for optimized news fetching with ETag caching and rate limiting."""
     
-    def __init__(self, cache_file: str = None):
+    def __init__(self, cache_file: str = None, http_client: HTTPClient = None, parse_pool: ParsePool = None):
+        self.http_client = http_client or get_http_client()
+        self.parse_pool = parse_pool or get_parse_pool()
         self.session = None
-        self.cache_file = cache_file or 'data/feed_cache.json'
-        self.feed_cache = self._load_cache()
+        self.cache_file = cache_file or 'data/feed_cache.db'
+        self.feed_cache = open_feed_cache(self.cache_file)
+        self.metrics = FetchMetrics()
         self._request_semaphore = None
         self._concurrency_limit = 5
-    
-    def _load_cache(self) -> Dict:
-        """Load ETag and Last-Modified cache from file."""
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Failed to load feed cache: {e}")
-        
-        return {
-            'etags': {},  # url -> etag
-            'last_modified': {},  # url -> last-modified header
-            'last_guids': defaultdict(list)  # url -> list of last N GUIDs
-        }
+        self._streaming_parse = True
+        self._parse_offload = True
+        self._adaptive_polling = False
+        self._min_poll_interval = MIN_POLL_INTERVAL
+        self._max_poll_interval = MAX_POLL_INTERVAL
+        self._defer_seen = False
     
     def _save_cache(self):
-        """Save ETag and Last-Modified cache to file."""
-        try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            # Convert defaultdict to regular dict for JSON serialization
-            cache_copy = {
-                'etags': self.feed_cache['etags'],
-                'last_modified': self.feed_cache['last_modified'],
-                'last_guids': dict(self.feed_cache['last_guids'])
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_copy, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save feed cache: {e}")
+        """Persist pending cache changes and fetch metrics."""
+        self.metrics.flush(self.feed_cache)
+        self.feed_cache.save()
     
     def set_concurrency_limit(self, limit: int):
         """Set maximum concurrent requests."""
@@ -85,202 +302,490 @@ class OptimizedNewsFetcher:
             self._request_semaphore = asyncio.Semaphore(limit)
     
     async def _ensure_session(self):
-        """Ensure aiohttp session exists."""
-        if not self.session:
-            timeout = aiohttp.ClientTimeout(total=10, connect=5)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+        """Ensure the shared aiohttp session is available."""
+        self.session = await self.http_client.get_session()
         
         if not self._request_semaphore:
             self._request_semaphore = asyncio.Semaphore(self._concurrency_limit)
     
+    def set_streaming_parse(self, enabled: bool):
+        """Enable/disable incremental parsing of feed bodies while they download."""
+        self._streaming_parse = enabled
+    
+    def set_parse_offload(self, enabled: bool):
+        """Enable/disable parsing large buffered feed bodies in the parse pool."""
+        self._parse_offload = enabled
+    
+    def set_defer_seen(self, enabled: bool):
+        """
+        Enable/disable leaving returned items unseen until mark_seen() is called.
+        
+        Used with the outbox: an item only counts as seen once it was delivered.
+        """
+        self._defer_seen = enabled
+    
+    def mark_seen(self, items: List[Tuple[str, str]]):
+        """Record (feed url, guid) pairs as seen and save the cache."""
+        for url, guid in items:
+            self.feed_cache.add_guid(url, guid)
+        self._save_cache()
+    
+    def set_adaptive_polling(
+        self,
+        enabled: bool,
+        min_interval_minutes: int = MIN_POLL_INTERVAL // 60,
+        max_interval_minutes: int = MAX_POLL_INTERVAL // 60
+    ):
+        """Enable/disable skipping feeds that are not yet due, with interval bounds."""
+        self._adaptive_polling = enabled
+        self._min_poll_interval = min_interval_minutes * 60
+        self._max_poll_interval = max(max_interval_minutes * 60, self._min_poll_interval)
+    
+    def is_feed_due(self, url: str, now: float = None) -> bool:
+        """Check whether a feed's adaptive next-poll time has been reached."""
+        stats = self.feed_cache.get_schedule(url)
+        if not stats:
+            return True
+        now = now or time.time()
+        return stats.get('next_poll', 0) - POLL_GRACE_SECONDS <= now
+    
+    def _record_poll(self, url: str, not_modified: bool, published: List[float] = None):
+        """
+        Record a poll outcome and derive the feed's next poll time.
+        
+        The base interval is half the median gap between recent publishes
+        (so a feed is checked about twice per expected post), stretched by the
+        moving share of 304 responses and clamped to the configured bounds.
+        """
+        now = time.time()
+        stats = self.feed_cache.get_schedule(url) or {
+            'publish_times': [],
+            'not_modified_ratio': 0.0,
+            'polls': 0
+        }
+        
+        stats['polls'] += 1
+        stats['not_modified_ratio'] = round(
+            (1 - NOT_MODIFIED_ALPHA) * stats['not_modified_ratio'] + NOT_MODIFIED_ALPHA * (1.0 if not_modified else 0.0),
+            4
+        )
+        
+        if published:
+            history = set(stats['publish_times'])
+            history.update(min(ts, now) for ts in published)
+            stats['publish_times'] = sorted(history)[-PUBLISH_HISTORY_SIZE:]
+        
+        times = stats['publish_times']
+        gaps = [b - a for a, b in zip(times, times[1:]) if b > a]
+        if gaps:
+            interval = statistics.median(gaps) / 2
+            # A feed silent for longer than its usual gap is probably slowing down
+            interval = max(interval, (now - times[-1]) / 4)
+        else:
+            interval = self._min_poll_interval
+        
+        interval *= 1 + stats['not_modified_ratio']
+        interval = min(max(interval, self._min_poll_interval), self._max_poll_interval)
+        
+        stats['interval'] = int(interval)
+        stats['next_poll'] = int(now + interval)
+        self.feed_cache.set_schedule(url, stats)
+    
+    def breaker_state(self, url: str, now: float = None) -> str:
+        """
+        Circuit breaker state for a feed.
+        
+        Returns:
+            'closed' (healthy), 'open' (skip, backing off) or 'half_open'
+            (backoff elapsed - the next request is a probe)
+        """
+        health = self.feed_cache.get_health(url)
+        if not health or not health.get('open_until'):
+            return 'closed'
+        now = now or time.time()
+        return 'open' if now < health['open_until'] else 'half_open'
+    
+    def _record_failure(self, url: str, source_name: str, error: str, retry_after: float = None):
+        """
+        Count a failed fetch and trip the breaker when needed.
+        
+        After BREAKER_FAILURE_THRESHOLD consecutive failures the feed is
+        skipped with exponential backoff; a Retry-After from the server
+        (429/503) opens the breaker immediately for the requested time.
+        """
+        now = time.time()
+        health = self.feed_cache.get_health(url) or {'failures': 0}
+        health['failures'] += 1
+        health['last_error'] = error
+        health['last_failure'] = int(now)
+        
+        backoff = None
+        if retry_after is not None:
+            backoff = min(retry_after, BREAKER_MAX_BACKOFF)
+        elif health['failures'] >= BREAKER_FAILURE_THRESHOLD:
+            exponent = health['failures'] - BREAKER_FAILURE_THRESHOLD
+            backoff = min(BREAKER_BASE_BACKOFF * 2 ** exponent, BREAKER_MAX_BACKOFF)
+        
+        if backoff is not None:
+            health['open_until'] = int(now + backoff)
+            logger.warning(
+                f"{source_name}: Circuit open for {int(backoff // 60)} min after "
+                f"{health['failures']} failure(s) ({error})"
+            )
+        self.feed_cache.set_health(url, health)
+    
+    def _record_success(self, url: str, source_name: str):
+        """Close the breaker after any successful response."""
+        if self.feed_cache.get_health(url):
+            logger.info(f"{source_name}: Feed recovered, circuit closed")
+            self.feed_cache.set_health(url, None)
+    
     async def fetch_feed_optimized(
         self,
         url: str,
         source_name: str,
-        use_cache: bool = True
-    ) -> Optional[Tuple[str, str, str, str]]:
+        use_cache: bool = True,
+        batch: bool = False,
+        max_items: int = MAX_BATCH_ITEMS,
+        max_age: float = None
+    ):
         """
         Fetch RSS feed with ETag/Last-Modified caching.
         
+        With streaming parse enabled the body is fed chunk by chunk into an
+        XML pull parser and the download stops as soon as the wanted items
+        have been found.
+        
+        In batch mode every unseen item newer than the last posted one is
+        returned (up to max_items). A feed with no GUID history only returns
+        its newest item so a fresh cache does not flood the channel.
+        
+        Feeds with an open circuit breaker are not requested at all; once the
+        backoff elapses a single probe with a short timeout decides whether
+        the breaker closes or backs off further.
+        
+        Every request is recorded in self.metrics (latency, bytes, status,
+        parse time and items found).
+        
+        With max_age (seconds), new items published longer ago than that are
+        marked as seen but not returned. Items without a date are kept.
+        
+        Returned items are marked as seen right away unless set_defer_seen()
+        is on, in which case the caller marks them with mark_seen().
+        
         Returns:
-            Tuple of (title, link, description, guid) or None if no new content
+            Tuple of (title, link, description, guid) or None if no new content.
+            In batch mode, a list of such tuples (newest first, possibly empty).
         """
+        state = self.breaker_state(url)
+        if state == 'open':
+            logger.debug(f"{source_name}: Circuit open, skipping")
+            return [] if batch else None
+        
         await self._ensure_session()
+        timeout = PROBE_TIMEOUT if state == 'half_open' else FEED_TIMEOUT
+        
+        if batch:
+            max_new = max_items if self.feed_cache.has_guids(url) else 1
+        else:
+            max_new = 1
         
         # Prepare headers with cache validation
         headers = {}
         if use_cache:
-            if url in self.feed_cache['etags']:
-                headers['If-None-Match'] = self.feed_cache['etags'][url]
-            if url in self.feed_cache['last_modified']:
-                headers['If-Modified-Since'] = self.feed_cache['last_modified'][url]
+            etag, last_modified = self.feed_cache.get_validators(url)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
         
+        items = []
+        status = 'error'
+        ttfb = None
+        size = 0
+        timing = {'parse': None}
+        started = None
         try:
             # Use semaphore to limit concurrent requests
             async with self._request_semaphore:
-                async with self.session.get(url, headers=headers) as response:
+                started = time.perf_counter()
+                async with self.session.get(url, headers=headers, timeout=timeout) as response:
+                    ttfb = time.perf_counter() - started
+                    status = str(response.status)
                     # 304 Not Modified - no new content
                     if response.status == 304:
                         logger.debug(f"{source_name}: No new content (304)")
-                        return None
+                        self._record_success(url, source_name)
+                        self._record_poll(url, not_modified=True)
                     
-                    if response.status != 200:
+                    elif response.status != 200:
                         logger.warning(f"{source_name}: HTTP {response.status}")
-                        return None
-                    
-                    # Update cache headers
-                    if use_cache:
-                        if 'ETag' in response.headers:
-                            self.feed_cache['etags'][url] = response.headers['ETag']
-                        if 'Last-Modified' in response.headers:
-                            self.feed_cache['last_modified'][url] = response.headers['Last-Modified']
+                        retry_after = None
+                        if response.status in (429, 503):
+                            retry_after = _parse_retry_after(response.headers.get('Retry-After'), time.time())
+                        self._record_failure(url, source_name, f"HTTP {response.status}", retry_after)
                     
-                    content = await response.text()
+                    else:
+                        self._record_success(url, source_name)
+                        # Update cache headers
+                        if use_cache:
+                            self.feed_cache.set_validators(
+                                url,
+                                response.headers.get('ETag'),
+                                response.headers.get('Last-Modified')
+                            )
+                        
+                        if self._streaming_parse:
+                            parsed = await self._parse_feed_stream(
+                                response, url, source_name, max_new, batch, timing=timing
+                            )
+                        else:
+                            content = await response.text()
+                            parse_started = time.perf_counter()
+                            parsed = await self._parse_feed_content_offloaded(content, url, source_name, max_new, batch)
+                            timing['parse'] = time.perf_counter() - parse_started
+                        
+                        # Items without a date count as published when first seen
+                        now = time.time()
+                        self._record_poll(url, not_modified=False, published=[item[4] or now for item in parsed])
+                        if max_age:
+                            fresh = [item for item in parsed if not item[4] or item[4] >= now - max_age]
+                            if self._defer_seen:
+                                # Stale items are never posted, so they don't wait for delivery
+                                for item in parsed:
+                                    if item not in fresh:
+                                        self.feed_cache.add_guid(url, item[3])
+                            parsed = fresh
+                        items = [item[:4] for item in parsed]
                     
-                    # Parse feed
-                    return self._parse_feed_content(content, url, source_name)
+                    size = response.content.total_bytes
         
         except asyncio.TimeoutError:
             logger.warning(f"{source_name}: Request timeout")
-            return None
+            self._record_failure(url, source_name, "timeout")
+            status = 'timeout'
+        except aiohttp.ClientError as e:
+            logger.error(f"{source_name}: Error fetching feed: {e}")
+            self._record_failure(url, source_name, type(e).__name__)
+            status = type(e).__name__
         except Exception as e:
             logger.error(f"{source_name}: Error fetching feed: {e}")
-            return None
+        
+        if started is not None:
+            self.metrics.record(
+                url, status, time.perf_counter() - started,
+                ttfb=ttfb, size=size, parse_time=timing['parse'], items=len(items)
+            )
+        
+        if batch:
+            return items
+        return items[0] if items else None
     
-    def _parse_feed_content(
+    async def _parse_feed_stream(
         self,
-        content: str,
+        response: aiohttp.ClientResponse,
         url: str,
-        source_name: str
-    ) -> Optional[Tuple[str, str, str, str]]:
-        """Parse RSS/Atom feed content and return latest item."""
+        source_name: str,
+        max_new: int = 1,
+        stop_at_seen: bool = False,
+        timing: Dict = None
+    ) -> List[Tuple[str, str, str, str, Optional[float]]]:
+        """
+        Incrementally parse an RSS/Atom response body and return new items.
+        
+        Stops reading the socket once max_new new items are found, once a
+        known GUID is reached (if stop_at_seen) or once MAX_ITEMS_CHECKED items
+        have been inspected without finding one. Falls back to the regex parser
+        on the full body if the document is not well-formed XML (e.g. HTML
+        entities in RSS).
+        
+        If a timing dict is given, timing['parse'] is set to the seconds spent
+        parsing (time waiting on the network is not counted).
+        """
+        parser = ET.XMLPullParser(events=('end',))
+        received = []  # Raw chunks, kept for the regex fallback
+        bytes_read = 0
+        items_checked = 0
+        new_items = []  # Only marked as seen once the stream parsed cleanly
+        parse_time = 0.0
+        chunk_started = None  # Set while a chunk is being parsed
+        
         try:
-            # Detect feed type and parse accordingly - handle tags with attributes/whitespace
-            item_pattern = r'<item(?:\s+[^>]*)?>.*?</item>' if '<item' in content else r'<entry(?:\s+[^>]*)?>.*?</entry>'
-            items = re.findall(item_pattern, content, re.DOTALL)
-            
-            if not items:
-                logger.debug(f"{source_name}: No items found in feed")
-                return None
-            
-            # Check multiple items to find first new one
-            for item in items[:5]:  # Check up to 5 most recent items
-                # Extract GUID/ID for deduplication
-                guid_match = re.search(r'<guid(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</guid>', item, re.DOTALL)
-                if not guid_match:
-                    guid_match = re.search(r'<id(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</id>', item, re.DOTALL)
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                chunk_started = time.perf_counter()
+                # XML declaration must be the very first thing in the document
+                parser.feed(chunk if received else chunk.lstrip())
+                received.append(chunk)
+                bytes_read += len(chunk)
                 
-                guid = guid_match.group(1).strip() if guid_match else None
-                
-                # Check if we've already seen this GUID
-                last_guids = self.feed_cache['last_guids'].get(url, [])
-                if guid and guid in last_guids:
-                    continue  # Skip already posted items
-                
-                # Extract title
-                title = None
-                title_match = re.search(r'<title(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</title>', item, re.DOTALL)
-                if title_match:
-                    title = title_match.group(1).strip()
-                    # IMPORTANT: Unescape HTML entities FIRST, then strip tags
-                    title = unescape(title)
-                    title = re.sub(r'<[^>]+>', '', title).strip()
-                
-                # If no title or empty, try content/summary for a title
-                if not title:
-                    # Try to extract from content as fallback
-                    content_match = re.search(r'<content(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</content>', item, re.DOTALL)
-                    if not content_match:
-                        content_match = re.search(r'<summary(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</summary>', item, re.DOTALL)
+                for _event, elem in parser.read_events():
+                    if _split_tag(elem.tag)[1] not in ('item', 'entry'):
+                        continue
                     
-                    if content_match:
-                        content = re.sub(r'<[^>]+>', '', content_match.group(1))
-                        content = unescape(content.strip())
-                        # Get first sentence or first 100 chars
-                        first_sentence = re.split(r'[.!?]\s+', content)[0]
-                        title = first_sentence[:100] + ("..." if len(first_sentence) > 100 else "")
-                
-                # Final fallback
-                if not title:
-                    title = "Latest Update"
-                
-                # Extract link
-                link_match = re.search(r'<link(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</link>', item, re.DOTALL)
-                if not link_match:
-                    link_match = re.search(r'<link\s+href="([^"]+)"', item)
-                link = link_match.group(1).strip() if link_match else url
-                
-                # Extract description
-                desc_match = re.search(r'<description>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</description>', item, re.DOTALL)
-                if not desc_match:
-                    desc_match = re.search(r'<summary>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</summary>', item, re.DOTALL)
-                if not desc_match:
-                    desc_match = re.search(r'<content(?:\s+[^>]*)?>(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?</content>', item, re.DOTALL)
-                
-                description = ""
-                if desc_match:
-                    desc = desc_match.group(1).strip()
-                    
-                    # Log raw description for debugging
-                    logger.debug(f"{source_name}: Raw desc length: {len(desc)}, first 100 chars: {desc[:100]}")
-                    
-                    # IMPORTANT: Unescape HTML entities FIRST (converts &lt; to <, &amp; to &, etc.)
-                    # This ensures the HTML parser can see actual tags, not entity-encoded text
-                    desc = unescape(desc)
-                    logger.debug(f"{source_name}: After unescape: {desc[:100]}")
-                    
-                    # Use HTML parser to properly strip all tags
-                    stripper = HTMLStripper()
-                    try:
-                        stripper.feed(desc)
-                        desc = stripper.get_text()
-                        logger.debug(f"{source_name}: After HTMLStripper: {desc[:100]}")
-                    except Exception as e:
-                        # Fallback to regex if parser fails
-                        logger.warning(f"HTML parser failed for {source_name}, using regex: {e}")
-                        desc = re.sub(r'<script[^>]*>.*?</script[^>]*>', '', desc, flags=re.DOTALL | re.IGNORECASE)
-                        desc = re.sub(r'<style[^>]*>.*?</style[^>]*>', '', desc, flags=re.DOTALL | re.IGNORECASE)
-                        desc = re.sub(r'<[^>]+>', '', desc)
-                        logger.debug(f"{source_name}: After regex: {desc[:100]}")
+                    item = self._extract_element_item(elem, url, source_name)
+                    elem.clear()  # Drop parsed subtree to keep memory flat
+                    items_checked += 1
                     
-                    # Clean up whitespace
-                    desc = re.sub(r'\s+', ' ', desc)  # Normalize whitespace
-                    desc = desc.strip()
+                    if item and not self._is_guid_seen(url, item[3]):
+                        new_items.append(item)
+                        if len(new_items) >= max_new:
+                            logger.debug(f"{source_name}: Stopped after {bytes_read} bytes ({items_checked} items)")
+                            return [self._accept_item(i, url, source_name) for i in new_items]
+                    elif item and stop_at_seen:
+                        logger.debug(f"{source_name}: Reached last posted item after {bytes_read} bytes")
+                        return [self._accept_item(i, url, source_name) for i in new_items]
                     
-                    # Truncate if too long
-                    description = desc[:300] + "..." if len(desc) > 300 else desc
-                    logger.info(f"{source_name}: Final description: {description[:100]}")
+                    if not new_items and items_checked >= MAX_ITEMS_CHECKED:
+                        logger.debug(f"{source_name}: All items already posted ({bytes_read} bytes read)")
+                        return new_items
                 
-                # Use link as fallback GUID
-                if not guid:
-                    guid = link
-                
-                # Update GUID cache (keep last 50 per feed)
-                if url not in self.feed_cache['last_guids']:
-                    self.feed_cache['last_guids'][url] = []
-                
-                self.feed_cache['last_guids'][url].append(guid)
-                self.feed_cache['last_guids'][url] = self.feed_cache['last_guids'][url][-50:]
-                
-                return title, link, description, guid
+                parse_time += time.perf_counter() - chunk_started
+                chunk_started = None
             
-            # All items already posted
+            parser.close()
+        
+        except ET.ParseError as e:
+            if chunk_started is not None:
+                parse_time += time.perf_counter() - chunk_started
+            logger.debug(f"{source_name}: Streaming parse failed ({e}), falling back to regex parser")
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                received.append(chunk)
+            content = b''.join(received).decode(response.charset or 'utf-8', errors='replace')
+            chunk_started = time.perf_counter()
+            return await self._parse_feed_content_offloaded(content, url, source_name, max_new, stop_at_seen)
+        
+        finally:
+            if chunk_started is not None:
+                parse_time += time.perf_counter() - chunk_started
+            if timing is not None:
+                timing['parse'] = parse_time
+        
+        if not items_checked:
+            logger.debug(f"{source_name}: No items found in feed")
+        elif not new_items:
             logger.debug(f"{source_name}: All items already posted")
-            return None
+        return [self._accept_item(i, url, source_name) for i in new_items]
+    
+    def _extract_element_item(
+        self,
+        elem: ET.Element,
+        url: str,
+        source_name: str
+    ) -> Optional[Tuple[str, str, str, str, Optional[float]]]:
+        """Extract (title, link, description, guid, published) from a parsed <item>/<entry> element."""
+        fields = {}
+        link = None
+        for child in elem:
+            namespace, name = _split_tag(child.tag)
+            if namespace not in FEED_NAMESPACES:
+                continue
+            
+            text = ''.join(child.itertext()).strip()
+            if name == 'link':
+                if link:
+                    continue
+                if text:
+                    link = text
+                elif child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href').strip()
+            elif name not in fields:
+                fields[name] = text
+        
+        try:
+            title = _clean_title(fields.get('title', ''))
+            if not title:
+                title = _title_from_content(fields.get('content') or fields.get('summary') or '')
+            if not title:
+                title = "Latest Update"
+            
+            link = link or url
+            
+            raw_desc = fields.get('description') or fields.get('summary') or fields.get('content') or ''
+            description = _clean_description(raw_desc, source_name) if raw_desc else ""
+            
+            guid = fields.get('guid') or fields.get('id') or link
+            published = _parse_published(
+                fields.get('pubDate') or fields.get('published') or fields.get('updated')
+            )
+            return title, link, description, guid, published
         
         except Exception as e:
-            logger.error(f"{source_name}: Error parsing feed: {e}")
+            logger.error(f"{source_name}: Error parsing feed item: {e}")
             return None
     
+    def _parse_feed_content(
+        self,
+        content: str,
+        url: str,
+        source_name: str,
+        max_new: int = 1,
+        stop_at_seen: bool = False
+    ) -> List[Tuple[str, str, str, str, Optional[float]]]:
+        """Regex-parse feed content on the calling thread and mark the returned items as seen."""
+        items = _parse_feed_document(
+            content, url, source_name, self.feed_cache.seen_guids(url), max_new, stop_at_seen
+        )
+        return [self._accept_item(i, url, source_name) for i in items]
+    
+    async def _parse_feed_content_offloaded(
+        self,
+        content: str,
+        url: str,
+        source_name: str,
+        max_new: int = 1,
+        stop_at_seen: bool = False
+    ) -> List[Tuple[str, str, str, str, Optional[float]]]:
+        """Like _parse_feed_content, but large documents are parsed in the parse pool."""
+        if not self._parse_offload:
+            return self._parse_feed_content(content, url, source_name, max_new, stop_at_seen)
+        
+        items = await self.parse_pool.run(
+            len(content), _parse_feed_document,
+            content, url, source_name, self.feed_cache.seen_guids(url), max_new, stop_at_seen,
+            process=True
+        )
+        # GUID bookkeeping touches the cache, so it stays on the loop thread
+        return [self._accept_item(i, url, source_name) for i in items]
+    
+    def _is_guid_seen(self, url: str, guid: str) -> bool:
+        """Check whether a GUID has already been posted for this feed."""
+        return bool(guid) and self.feed_cache.is_seen(url, guid)
+    
+    def _accept_item(
+        self,
+        item: Tuple[str, str, str, str, Optional[float]],
+        url: str,
+        source_name: str
+    ) -> Tuple[str, str, str, str, Optional[float]]:
+        """Record an item's GUID as seen (unless deferred) and return it."""
+        title, link, description, guid, _published = item
+        if description:
+            logger.info(f"{source_name}: Final description: {description[:100]}")
+        
+        # Update GUID cache (keeps the last GUID_HISTORY_SIZE per feed)
+        if not self._defer_seen:
+            self.feed_cache.add_guid(url, guid)
+        
+        return item
+    
     async def fetch_multiple_feeds(
         self,
         sources: Dict[str, Dict],
         enabled_sources: List[str],
-        use_cache: bool = True
+        use_cache: bool = True,
+        batch: bool = False,
+        max_items_per_source: int = MAX_BATCH_ITEMS,
+        max_age: float = None
     ) -> List[Tuple[str, str, str, str, Dict]]:
         """
         Fetch multiple feeds concurrently with rate limiting.
         
+        In batch mode each source contributes every unseen item (capped at
+        max_items_per_source, newest first) instead of at most one. With
+        adaptive polling enabled, sources whose next poll time has not been
+        reached are skipped without a request, as are sources whose circuit
+        breaker is open. max_age is passed on to fetch_feed_optimized.
+        
         Returns:
             List of tuples: (title, link, description, guid, source_info)
         """
@@ -288,20 +793,41 @@ class OptimizedNewsFetcher:
         
         tasks = []
         source_map = {}
+        skipped = 0
+        tripped = 0
+        now = time.time()
         
         for source_key in enabled_sources:
             if source_key not in sources:
                 continue
             
             source = sources[source_key]
+            if self.breaker_state(source['url'], now) == 'open':
+                tripped += 1
+                continue
+            
+            if self._adaptive_polling and not self.is_feed_due(source['url'], now):
+                logger.debug(f"{source['name']}: Not due until {datetime.fromtimestamp(self.feed_cache.get_schedule(source['url'])['next_poll'])}")
+                skipped += 1
+                continue
+            
             task = self.fetch_feed_optimized(
                 source['url'],
                 source['name'],
-                use_cache=use_cache
+                use_cache=use_cache,
+                batch=batch,
+                max_items=max_items_per_source,
+                max_age=max_age
             )
             tasks.append(task)
             source_map[len(tasks) - 1] = (source_key, source)
         
+        if skipped or tripped:
+            logger.info(
+                f"Skipped {skipped} feed(s) not yet due and {tripped} with an open circuit, "
+                f"polling {len(tasks)}"
+            )
+        
         # Execute all tasks concurrently with semaphore limiting concurrency
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
@@ -315,18 +841,17 @@ class OptimizedNewsFetcher:
             
             if result:  # Has new content
                 source_key, source = source_map[idx]
-                title, link, description, guid = result
-                new_items.append((title, link, description, guid, source))
+                for title, link, description, guid in (result if batch else [result]):
+                    new_items.append((title, link, description, guid, source))
         
-        # Save cache after batch fetch
-        if new_items:
+        # Save cache after batch fetch (poll schedule changes even without new items)
+        if tasks:
             self._save_cache()
         
         return new_items
     
     async def close(self):
-        """Close aiohttp session and save cache."""
-        self._save_cache()
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Save and close the cache and release the session (the shared pool is closed by its owner)."""
+        self.metrics.flush(self.feed_cache)
+        self.feed_cache.close()
+        self.session = None
@@ -0,0 +1,255 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+NVD Sync - Delta polling of the NVD CVE API 2.0.
+
+Instead of re-reading a fixed publication window, each poll asks only for
+CVEs modified since the previous one (lastModStartDate/lastModEndDate),
+pages through startIndex/totalResults so nothing is cut off, and paces the
+requests to NVD's published limits:
+
+    without an API key: 5 requests per rolling 30 seconds
+    with an API key:    50 requests per rolling 30 seconds
+
+The caller keeps the sync state (the lastModEndDate synced up to) and saves
+NVDDelta.sync_state once it has used the delta. fetch_nvd_latest() answers
+"what was published lately" with two small requests instead.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from utils.http_client import API_TIMEOUT, DOWNLOAD_TIMEOUT
+from utils.parse_pool import parse_json
+
+logger = logging.getLogger(__name__)
+
+NVD_URL = 'https://services.nvd.nist.gov/rest/json/cves/2.0'
+PAGE_SIZE = 2000  # NVD's maximum resultsPerPage
+MAX_WINDOW = timedelta(days=120)  # NVD's maximum lastMod range per request
+FIRST_SYNC_WINDOW = timedelta(days=1)  # Looked back on the first sync
+RATE_LIMITS = {False: (5, 30.0), True: (50, 30.0)}  # (requests, seconds), keyed by "has API key"
+RETRY_STATUSES = (403, 429, 503)  # NVD answers 403 when a client exceeds its limit
+MAX_RETRIES = 3
+RETRY_DELAY = 6.0
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.000'
+
+
+class NVDRateLimiter:
+    """Paces requests to at most `requests` per rolling `period` seconds."""
+
+    def __init__(self, requests: int, period: float):
+        self.requests = requests
+        self.period = period
+        self._slots = deque()  # Monotonic times requests were (or will be) sent
+
+    async def wait(self):
+        now = time.monotonic()
+        while self._slots and self._slots[0] <= now - self.period:
+            self._slots.popleft()
+
+        # Reserve a slot before sleeping, so concurrent callers queue up behind it
+        slot = now
+        if len(self._slots) >= self.requests:
+            slot = max(now, self._slots[-self.requests] + self.period)
+        self._slots.append(slot)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+_limiters: Dict[bool, NVDRateLimiter] = {}
+
+
+def get_limiter(api_key: Optional[str]) -> NVDRateLimiter:
+    """The process-wide limiter for keyed or anonymous requests."""
+    keyed = bool(api_key)
+    if keyed not in _limiters:
+        _limiters[keyed] = NVDRateLimiter(*RATE_LIMITS[keyed])
+    return _limiters[keyed]
+
+
+@dataclass
+class NVDDelta:
+    """Result of one poll. status is 'updated' or 'error'."""
+    status: str
+    vulnerabilities: List[dict] = field(default_factory=list)  # The 'cve' objects, one per ID
+    sync_state: dict = field(default_factory=dict)
+    window_start: Optional[str] = None
+    requests: int = 0
+    bytes_read: int = 0
+
+
+def nvd_item(cve: dict) -> dict:
+    """Turn an NVD 'cve' object into the item dict the CVE cog posts."""
+    cve_id = cve.get('id', 'Unknown')
+    desc = next((d['value'] for d in cve.get('descriptions', []) if d.get('lang') == 'en'), 'No description')
+    desc = desc[:300] + '...' if len(desc) > 300 else desc
+
+    # Newest CVSS version that has a score
+    severity = 'UNKNOWN'
+    metrics = cve.get('metrics', {})
+    for version in ('cvssMetricV31', 'cvssMetricV40', 'cvssMetricV30', 'cvssMetricV2'):
+        if metrics.get(version):
+            metric = metrics[version][0]
+            severity = metric.get('cvssData', {}).get('baseSeverity') or metric.get('baseSeverity', 'UNKNOWN')
+            break
+
+    return {
+        'cve_id': cve_id,
+        'title': f"CVE {cve_id}",
+        'description': desc,
+        'severity': severity,
+        'date_added': cve.get('published', ''),
+        'source': 'nvd',
+        'link': f"https://nvd.nist.gov/vuln/detail/{cve_id}"
+    }
+
+
+async def _get_page(session, url: str, params: dict, api_key: Optional[str], timeout, delta: 'NVDDelta') -> Optional[dict]:
+    """One paced request, retried when NVD signals its rate limit; None on failure."""
+    limiter = get_limiter(api_key)
+    headers = {'apiKey': api_key} if api_key else {}
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.wait()
+        delta.requests += 1
+        async with session.get(url, params=params, headers=headers, timeout=timeout) as resp:
+            if resp.status == 200:
+                body = await resp.read()
+                delta.bytes_read += len(body)
+                return await parse_json(body.decode('utf-8'))
+            if resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                logger.warning(f"Failed to fetch NVD CVEs: HTTP {resp.status}")
+                return None
+        await asyncio.sleep(RETRY_DELAY * (attempt + 1))
+
+
+def _windows(start: datetime, end: datetime) -> List[tuple]:
+    """Split [start, end] into ranges NVD accepts."""
+    windows = []
+    while start < end:
+        windows.append((start, min(start + MAX_WINDOW, end)))
+        start = windows[-1][1]
+    return windows
+
+
+async def fetch_nvd_delta(
+    session,
+    sync_state: Optional[dict] = None,
+    api_key: Optional[str] = None,
+    url: str = NVD_URL,
+    now: Optional[datetime] = None,
+    first_window: timedelta = FIRST_SYNC_WINDOW,
+    page_size: int = PAGE_SIZE,
+    on_page: Optional[Callable[[List[dict]], Awaitable]] = None,
+    timeout=DOWNLOAD_TIMEOUT
+) -> NVDDelta:
+    """
+    Fetch every CVE modified since sync_state.
+
+    Args:
+        session: aiohttp session
+        sync_state: State from the previous NVDDelta.sync_state; None or {}
+            starts first_window back
+        api_key: NVD API key (raises the rate limit tenfold)
+        now: End of the window (UTC); defaults to the current time
+        first_window: How far back a sync without state starts
+        on_page: Coroutine function awaited with each page's CVEs as it
+            arrives; they are then not collected in NVDDelta.vulnerabilities
+            (for large backfills)
+
+    Returns:
+        NVDDelta. On 'error' the CVEs of the windows completed before the
+        failure are returned and sync_state covers just those windows.
+    """
+    sync_state = dict(sync_state or {})
+    now = now or datetime.utcnow()
+    if sync_state.get('last_mod_end'):
+        start = datetime.strptime(sync_state['last_mod_end'], DATE_FORMAT)
+    else:
+        start = now - first_window
+
+    found: Dict[str, dict] = {}
+    delta = NVDDelta('updated', sync_state=sync_state, window_start=start.strftime(DATE_FORMAT))
+
+    try:
+        for window_start, window_end in _windows(start, now):
+            params = {
+                'lastModStartDate': window_start.strftime(DATE_FORMAT),
+                'lastModEndDate': window_end.strftime(DATE_FORMAT),
+                'resultsPerPage': page_size,
+                'startIndex': 0
+            }
+            window = {}
+            while True:
+                data = await _get_page(session, url, params, api_key, timeout, delta)
+                if data is None:
+                    delta.status = 'error'
+                    break
+
+                page = data.get('vulnerabilities', [])
+                cves = [wrapper['cve'] for wrapper in page if wrapper.get('cve', {}).get('id')]
+                if on_page:
+                    await on_page(cves)
+                else:
+                    window.update((cve['id'], cve) for cve in cves)
+
+                params['startIndex'] += len(page)
+                if not page or params['startIndex'] >= data.get('totalResults', 0):
+                    break
+
+            if delta.status == 'error':
+                break
+            found.update(window)  # A later window has the newer copy
+            delta.sync_state = dict(delta.sync_state, last_mod_end=params['lastModEndDate'])
+
+    except Exception as e:
+        logger.error(f"Error fetching NVD CVEs: {e}")
+        delta.status = 'error'
+
+    delta.vulnerabilities = list(found.values())
+    return delta
+
+
+async def fetch_nvd_latest(
+    session,
+    count: int = 5,
+    api_key: Optional[str] = None,
+    days: int = 7,
+    url: str = NVD_URL,
+    now: Optional[datetime] = None,
+    timeout=API_TIMEOUT
+) -> List[dict]:
+    """
+    The newest CVEs published in the last days, newest first.
+
+    NVD lists results oldest first, so this reads the total with a one-result
+    request and then fetches just the tail.
+    """
+    now = now or datetime.utcnow()
+    params = {
+        'pubStartDate': (now - timedelta(days=days)).strftime(DATE_FORMAT),
+        'pubEndDate': now.strftime(DATE_FORMAT),
+        'resultsPerPage': 1,
+        'startIndex': 0
+    }
+    delta = NVDDelta('updated')
+    try:
+        data = await _get_page(session, url, params, api_key, timeout, delta)
+        total = data.get('totalResults', 0) if data else 0
+        if total > 1:
+            params.update(startIndex=max(total - count, 0), resultsPerPage=count)
+            data = await _get_page(session, url, params, api_key, timeout, delta)
+        if not data:
+            return []
+        return [wrapper['cve'] for wrapper in reversed(data.get('vulnerabilities', [])) if 'cve' in wrapper]
+
+    except Exception as e:
+        logger.error(f"Error fetching NVD CVEs: {e}")
+        return []
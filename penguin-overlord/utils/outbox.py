@@ -0,0 +1,319 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Outbox - Durable queue for outgoing news and alert posts.
+
+Posters enqueue embeds instead of sending them inline; drain() delivers
+them. Rows live in a SQLite spool shared by the bot and the runners, so a
+failed send or a restart mid-run leaves the item queued rather than lost,
+and items are only marked seen by their feed once delivery succeeded.
+
+- Every row has a unique key (feed URL + GUID, CVE ID...). Enqueueing a key
+  that is already queued or was delivered recently is a no-op, so an item
+  fetched again before it is marked seen is never posted twice.
+- Lanes: rows are delivered by priority (KEV/CVE alerts first, gaming last),
+  then in enqueue order. Different channels are drained concurrently, each
+  channel in order, through the sender's own rate limit bucket handling
+  (discord.py in the bot, DiscordREST in the runners).
+- Rows are claimed in a transaction before sending, so two processes never
+  deliver the same row. A claim left behind by a crashed process is
+  retried after SENDING_TIMEOUT.
+- Failed sends are retried with exponential backoff, up to MAX_ATTEMPTS.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import discord
+
+from utils.story_index import StoryIndex, post_stories
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+CATEGORY_PRIORITY = {
+    'kev': PRIORITY_HIGH,
+    'cve': PRIORITY_HIGH,
+    'gaming': PRIORITY_LOW
+}
+
+CLAIM_BATCH = 100
+SENDING_TIMEOUT = 10 * 60
+RETRY_BASE = 30  # seconds, doubled per attempt
+RETRY_MAX = 3600
+MAX_ATTEMPTS = 8
+UNROUTED_DELAY = 60  # No channel available to this process right now
+RETENTION = 7 * 24 * 3600  # Delivered keys are remembered this long
+
+
+def category_priority(category: str) -> int:
+    return CATEGORY_PRIORITY.get(category, PRIORITY_NORMAL)
+
+
+def outbox_key(category: str, *parts) -> str:
+    """Key identifying one item, e.g. outbox_key('tech', feed_url, guid)."""
+    return ':'.join(str(part) for part in (category, *parts))
+
+
+class Outbox:
+    """SQLite spool of queued messages."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL UNIQUE,
+            category TEXT NOT NULL,
+            channel_id INTEGER,
+            priority INTEGER NOT NULL,
+            embed TEXT NOT NULL,
+            story TEXT,
+            options TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            message_id INTEGER,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, priority, id);
+        CREATE INDEX IF NOT EXISTS idx_outbox_updated ON outbox (updated_at);
+    """
+
+    def __init__(self, path: str = 'data/outbox.db'):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        # Autocommit; claims use explicit BEGIN IMMEDIATE across processes
+        self.conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self._lock = asyncio.Lock()
+        self.prune()
+
+    def prune(self, now: Optional[float] = None):
+        """Forget delivered and dead rows past the retention window."""
+        cutoff = (now or time.time()) - RETENTION
+        self.conn.execute("DELETE FROM outbox WHERE status IN ('sent', 'dead') AND updated_at < ?", (cutoff,))
+
+    def enqueue(
+        self,
+        key: str,
+        category: str,
+        embed: discord.Embed,
+        channel_id: Optional[int] = None,
+        story: Optional[tuple] = None,
+        dedup_mode: str = 'off',
+        batch: bool = True,
+        priority: Optional[int] = None
+    ) -> bool:
+        """
+        Queue an embed for a category's channel.
+
+        Args:
+            key: Unique item key (see outbox_key)
+            channel_id: Target channel; None for runners posting through a webhook
+            story: (title, description, link, source_name) for duplicate detection
+            dedup_mode: post_story() mode, used when story is given
+            batch: Allow packing with other embeds into one message
+            priority: Lane (defaults to the category's, see CATEGORY_PRIORITY)
+
+        Returns:
+            True if queued, False if the key is already queued or was delivered
+        """
+        now = time.time()
+        cursor = self.conn.execute(
+            """
+            INSERT OR IGNORE INTO outbox
+                (key, category, channel_id, priority, embed, story, options, next_attempt, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key, category, channel_id,
+                category_priority(category) if priority is None else priority,
+                json.dumps(embed.to_dict()),
+                json.dumps(list(story)) if story else None,
+                json.dumps({'dedup_mode': dedup_mode if story else 'off', 'batch': batch}),
+                now, now, now
+            )
+        )
+        return cursor.rowcount == 1
+
+    def delivered(self, keys: Iterable[str]) -> Set[str]:
+        """Keys whose message has been delivered (or suppressed as a duplicate)."""
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            found.update(
+                row[0] for row in self.conn.execute(
+                    f"SELECT key FROM outbox WHERE status = 'sent' AND key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+            )
+        return found
+
+    def counts(self, categories: Optional[List[str]] = None) -> Dict[str, int]:
+        """Rows per status, optionally only for some categories."""
+        query = 'SELECT status, COUNT(*) FROM outbox'
+        if categories:
+            query += f" WHERE category IN ({','.join('?' * len(categories))})"
+        return dict(self.conn.execute(query + ' GROUP BY status', categories or []).fetchall())
+
+    def _claim(self, categories: Optional[List[str]], now: float, channels_only: bool = False) -> List[sqlite3.Row]:
+        """Atomically take due rows, highest priority first."""
+        query = """
+            SELECT * FROM outbox
+            WHERE ((status = 'pending' AND next_attempt <= ?) OR (status = 'sending' AND updated_at < ?))
+        """
+        params = [now, now - SENDING_TIMEOUT]
+        if categories:
+            query += f" AND category IN ({','.join('?' * len(categories))})"
+            params += categories
+        if channels_only:
+            query += ' AND channel_id IS NOT NULL'
+        query += ' ORDER BY priority, id LIMIT ?'
+        params.append(CLAIM_BATCH)
+
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute(query, params).fetchall()
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'sending', updated_at = ? WHERE id = ?",
+                [(now, row['id']) for row in rows]
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return rows
+
+    def _ack(self, rows: List[sqlite3.Row], results: List):
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE outbox SET status = 'sent', updated_at = ?, message_id = ?, last_error = NULL WHERE id = ?",
+            [(now, result.id if result else None, row['id']) for row, result in zip(rows, results)]
+        )
+
+    def _fail(self, rows: List[sqlite3.Row], error: str):
+        now = time.time()
+        updates = []
+        for row in rows:
+            attempts = row['attempts'] + 1
+            status = 'dead' if attempts >= MAX_ATTEMPTS else 'pending'
+            delay = min(RETRY_BASE * 2 ** (attempts - 1), RETRY_MAX)
+            updates.append((status, attempts, now + delay, now, error[:500], row['id']))
+            if status == 'dead':
+                logger.error(f"Outbox: giving up on {row['key']} after {attempts} attempts: {error}")
+        self.conn.executemany(
+            """
+            UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, updated_at = ?, last_error = ?
+            WHERE id = ?
+            """,
+            updates
+        )
+
+    def _release(self, rows: List[sqlite3.Row]):
+        """Put rows back without counting an attempt."""
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE outbox SET status = 'pending', next_attempt = ?, updated_at = ? WHERE id = ?",
+            [(now + UNROUTED_DELAY, now, row['id']) for row in rows]
+        )
+
+    async def _deliver_channel(self, channel, rows: List[sqlite3.Row], story_index: Optional[StoryIndex]) -> int:
+        """Send one channel's rows in order. Returns how many were delivered."""
+        if channel is None:
+            self._release(rows)
+            return 0
+
+        delivered = 0
+        # Consecutive rows of a category share its dedup and batching options
+        for category, group in itertools.groupby(rows, key=lambda row: row['category']):
+            group = list(group)
+            options = json.loads(group[0]['options'])
+            stories = []
+            for row in group:
+                embed = discord.Embed.from_dict(json.loads(row['embed']))
+                if row['story']:
+                    title, description, link, source_name = json.loads(row['story'])
+                else:
+                    title, description, link, source_name = embed.title or '', embed.description or '', embed.url, category
+                stories.append((embed, title, description, link, source_name))
+
+            mode = options.get('dedup_mode', 'off')
+            try:
+                results = await post_stories(
+                    channel, stories, story_index if mode != 'off' else None,
+                    category, mode, batch=options.get('batch', True)
+                )
+                error = 'send failed'
+            except Exception as e:
+                logger.error(f"Outbox: delivery to {getattr(channel, 'id', channel)} failed: {e}")
+                results = [False] * len(group)
+                error = str(e)
+
+            sent = [(row, result) for row, result in zip(group, results) if result is not False]
+            self._ack([row for row, _ in sent], [result for _, result in sent])
+            self._fail([row for row, result in zip(group, results) if result is False], error)
+            delivered += len(sent)
+        return delivered
+
+    async def drain(
+        self,
+        resolve_channel: Callable[[Optional[int]], object],
+        story_index: Optional[StoryIndex] = None,
+        categories: Optional[List[str]] = None,
+        channels_only: bool = False
+    ) -> int:
+        """
+        Deliver everything that is due.
+
+        Args:
+            resolve_channel: Maps a row's channel_id to something with send(),
+                or None if this process can't post there (the row stays queued)
+            story_index: Used for rows queued with a dedup mode
+            categories: Only deliver these categories (runners drain their own)
+            channels_only: Leave rows without a channel_id (webhook rows only
+                a runner can send) unclaimed, so they stay due for the runner
+
+        Returns:
+            Number of rows delivered
+        """
+        async with self._lock:
+            total = 0
+            while True:
+                rows = self._claim(categories, time.time(), channels_only)
+                if not rows:
+                    break
+
+                by_channel: Dict[Optional[int], List[sqlite3.Row]] = {}
+                for row in rows:
+                    by_channel.setdefault(row['channel_id'], []).append(row)
+
+                delivered = await asyncio.gather(*(
+                    self._deliver_channel(resolve_channel(channel_id), channel_rows, story_index)
+                    for channel_id, channel_rows in by_channel.items()
+                ))
+                total += sum(delivered)
+
+            if total:
+                logger.info(f"Outbox: delivered {total} message(s)")
+            return total
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
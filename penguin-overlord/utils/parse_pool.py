@@ -0,0 +1,137 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Parse Pool - Run CPU-heavy feed parsing off the event loop.
+
+Small documents are parsed inline (a pool round-trip costs more than the
+parse). Documents above PARSE_OFFLOAD_THRESHOLD go to a worker pool so the
+bot's gateway heartbeats and slash-command responses are not held up while
+a large feed, the KEV catalog or an NVD response is parsed.
+
+Two kinds of workers are used:
+- Processes for pure-Python parsing that returns small results (the regex
+  feed parser). Regex and HTML stripping hold the GIL, so a thread would
+  still stall the loop for most of the parse.
+- Threads for ElementTree/json, whose result trees would cost more to
+  pickle back from a process than to build inline.
+
+Functions sent to processes must be module-level so they can be pickled.
+"""
+
+import json
+import asyncio
+import logging
+import multiprocessing
+import xml.etree.ElementTree as ET
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Documents smaller than this (bytes/characters) are parsed on the event loop
+PARSE_OFFLOAD_THRESHOLD = 64 * 1024
+
+
+class ParsePool:
+    """Bounded worker pools for parsing large documents."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 8,
+        threshold: int = PARSE_OFFLOAD_THRESHOLD,
+        use_processes: bool = True
+    ):
+        """
+        Args:
+            max_workers: Worker threads and worker processes (each)
+            max_queue: Jobs allowed to wait for a worker; further callers
+                wait on the event loop instead of piling up in the executor
+            threshold: Minimum document size that is offloaded
+            use_processes: If False, process jobs run on threads instead
+        """
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self.use_processes = use_processes
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+        self._threads: Optional[Executor] = None
+        self._processes: Optional[Executor] = None
+
+    def _get_executor(self, process: bool) -> Executor:
+        if process and self.use_processes:
+            if self._processes is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                logger.debug(f"Started {self.max_workers} parse worker processes")
+            return self._processes
+
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='parse')
+            logger.debug(f"Started {self.max_workers} parse worker threads")
+        return self._threads
+
+    async def run(self, size: int, func: Callable, *args, process: bool = False) -> Any:
+        """
+        Call func(*args), in a worker if size is above the threshold.
+
+        Args:
+            size: Document size used to decide whether to offload
+            process: Run in a worker process (func and args must be picklable)
+
+        Exceptions raised by func propagate to the caller either way.
+        """
+        if size < self.threshold:
+            return func(*args)
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(process), func, *args)
+
+    def close(self):
+        """Shut the workers down (pending jobs are cancelled)."""
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get the process-wide parse pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+
+def configure_parse_pool(**kwargs) -> ParsePool:
+    """
+    Replace the process-wide parse pool with one built from ParsePool's arguments.
+
+    Oneshot runners call configure_parse_pool(use_processes=False): they have no
+    gateway heartbeat to protect, and spawned workers would each re-import the
+    runner and cost a full interpreter's memory and startup time.
+    """
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.close()
+    _parse_pool = ParsePool(**kwargs)
+    return _parse_pool
+
+
+async def parse_xml(content: str) -> ET.Element:
+    """ET.fromstring, on a worker thread for large documents."""
+    return await get_parse_pool().run(len(content), ET.fromstring, content)
+
+
+async def parse_json(content: str) -> Any:
+    """json.loads, on a worker thread for large documents."""
+    return await get_parse_pool().run(len(content), json.loads, content)
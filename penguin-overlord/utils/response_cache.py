@@ -0,0 +1,67 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Response Cache - Short-lived results for manual fetch commands.
+
+Several users running /cve within a few minutes get the same answer,
+so the fetched items are kept for a short TTL. Concurrent callers for a key
+that is not cached await the one fetch already in flight instead of starting
+their own. Auto-posters don't use this: they track what is new themselves.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+
+
+class ResponseCache:
+    """TTL cache of fetch results with request coalescing."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        The cached result for key, or the result of fetch() (shared by concurrent callers).
+
+        Empty results and exceptions are not cached, so a source that was
+        down is asked again by the next caller.
+        """
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, fetch))
+            self._in_flight[key] = task
+        # A caller that gives up (e.g. a cancelled command) leaves the fetch running for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await fetch()
+            now = time.monotonic()
+            for stale in [k for k, (stored, _) in self._entries.items() if now - stored >= self.ttl]:
+                del self._entries[stale]
+            if value:
+                self._entries[key] = (now, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self, key: Hashable = None):
+        """Forget one key, or everything."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
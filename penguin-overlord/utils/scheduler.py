@@ -0,0 +1,308 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Scheduler - One timer for every periodic job in the bot.
+
+Cogs register async jobs instead of running their own tasks.loop timers.
+Runs are aligned to a wall-clock grid (interval + offset from midnight UTC,
+the same slots the systemd timers use), spread by a random per-run jitter and
+limited by a global cap on concurrently running jobs, so the categories no
+longer all fire on the hour or right after a reconnect.
+
+Last run times are persisted. A job that missed its slot while the bot was
+down either runs once on startup ('once') or waits for its next slot
+('skip'); missing several slots never causes more than one catch-up run.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT = 3
+DEFAULT_JITTER = 120  # seconds, capped at a quarter of the interval
+MAX_SLEEP = 60  # Re-check the wall clock at least this often (suspend, clock changes)
+CATCH_UP_POLICIES = ('once', 'skip')
+
+
+def slot_before(now: float, interval: float, offset: float = 0) -> float:
+    """Latest slot of the interval + offset grid (from midnight UTC) at or before now."""
+    return now - ((now - offset) % interval)
+
+
+class ScheduledJob:
+    """A registered job and its run history."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        offset: float,
+        jitter: float,
+        catch_up: str
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.offset = offset % interval
+        self.max_jitter = jitter
+        self.catch_up = catch_up
+        self.state = 'scheduled'  # scheduled / queued (waiting for a slot) / running
+        self.paused = False
+        self.next_run: Optional[float] = None
+        self.last_run: Optional[float] = None
+        self.last_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.runs = 0
+        self.failures = 0
+
+    @property
+    def jitter(self) -> float:
+        return min(self.max_jitter, self.interval / 4)
+
+    def slot_before(self, now: float) -> float:
+        """Latest grid slot at or before now."""
+        return slot_before(now, self.interval, self.offset)
+
+    def next_slot(self, now: float) -> float:
+        """Next grid slot after now, plus this run's jitter."""
+        return self.slot_before(now) + self.interval + random.uniform(0, self.jitter)
+
+
+class Scheduler:
+    """Runs registered jobs on aligned, jittered slots with a global concurrency cap."""
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        state_file: str = 'data/scheduler_state.json'
+    ):
+        self.max_concurrent = max_concurrent
+        self.state_file = state_file
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._last_runs = self._load_state()
+        self._timing: Dict[str, tuple] = {}  # Timing set before the job registered
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._runs: set = set()
+
+    def _load_state(self) -> Dict[str, float]:
+        """Load last run times from file."""
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load scheduler state: {e}")
+        return {}
+
+    def _save_state(self):
+        """Save last run times to file."""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            with open(self.state_file, 'w') as f:
+                json.dump(self._last_runs, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save scheduler state: {e}")
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Awaitable],
+        interval: float,
+        offset: float = 0,
+        jitter: float = DEFAULT_JITTER,
+        catch_up: str = 'once',
+        paused: bool = False
+    ) -> ScheduledJob:
+        """
+        Register (or replace) a periodic job.
+
+        Args:
+            name: Unique job name (news jobs use their NewsManager category)
+            func: Coroutine function called with no arguments
+            interval: Seconds between runs
+            offset: Seconds after each interval boundary (from midnight UTC) to run at
+            jitter: Maximum random delay added to each run
+            catch_up: 'once' to run at startup if a slot was missed, 'skip' to wait
+            paused: Register without scheduling (see resume())
+        """
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {CATCH_UP_POLICIES}, got {catch_up!r}")
+
+        pending_interval, pending_offset = self._timing.pop(name, (None, None))
+        interval = pending_interval or interval
+        offset = offset if pending_offset is None else pending_offset
+        job = ScheduledJob(name, func, interval, offset, jitter, catch_up)
+        job.last_run = self._last_runs.get(name)
+        self.jobs[name] = job
+
+        if paused:
+            job.paused = True
+        else:
+            now = time.time()
+            missed = job.last_run is None or job.last_run < job.slot_before(now)
+            if missed and catch_up == 'once':
+                job.next_run = now + random.uniform(0, job.jitter)
+            else:
+                job.next_run = job.next_slot(now)
+
+        self._wakeup.set()
+        return job
+
+    def unregister(self, name: str):
+        """Forget a job (a run in progress finishes normally)."""
+        self.jobs.pop(name, None)
+
+    def reschedule(self, name: str, interval: float = None, offset: float = None):
+        """
+        Change a job's interval and/or offset.
+
+        If the job is not registered yet the timing is kept and applied when
+        it registers, so configuration can load before the cogs that own the jobs.
+        """
+        job = self.jobs.get(name)
+        if not job:
+            pending_interval, pending_offset = self._timing.get(name, (None, None))
+            self._timing[name] = (interval or pending_interval, pending_offset if offset is None else offset)
+            return
+
+        interval = interval or job.interval
+        offset = job.offset if offset is None else offset % interval
+        if (interval, offset) == (job.interval, job.offset):
+            return
+
+        job.interval = interval
+        job.offset = offset
+        if job.state == 'scheduled' and not job.paused:
+            job.next_run = job.next_slot(time.time())
+            self._wakeup.set()
+        logger.info(f"Rescheduled {name}: every {interval / 3600:g}h at +{offset / 60:g}m")
+
+    def pause(self, name: str):
+        """Stop scheduling a job until resume() (a run in progress finishes)."""
+        job = self.jobs.get(name)
+        if job:
+            job.paused = True
+            if job.state == 'scheduled':
+                job.next_run = None
+
+    def resume(self, name: str, run_now: bool = False):
+        """Schedule a paused job again, optionally running it right away."""
+        job = self.jobs.get(name)
+        if job and job.paused:
+            job.paused = False
+            if job.state == 'scheduled':
+                job.next_run = time.time() if run_now else job.next_slot(time.time())
+                self._wakeup.set()
+
+    def trigger(self, name: str):
+        """Run a scheduled job as soon as a slot is free."""
+        job = self.jobs.get(name)
+        if job and job.state == 'scheduled' and not job.paused:
+            job.next_run = time.time()
+            self._wakeup.set()
+
+    def start(self, wait_until: Callable[[], Awaitable] = None):
+        """
+        Start dispatching jobs.
+
+        Args:
+            wait_until: Awaited before the first dispatch (e.g. bot.wait_until_ready)
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._dispatch_loop(wait_until))
+
+    async def close(self):
+        """Stop dispatching and cancel running jobs."""
+        tasks = [t for t in (self._task, *self._runs) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._runs.clear()
+
+    async def _dispatch_loop(self, wait_until: Optional[Callable[[], Awaitable]]):
+        if wait_until:
+            await wait_until()
+        logger.info(f"Scheduler started with {len(self.jobs)} jobs (max {self.max_concurrent} concurrent)")
+
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+
+            for job in list(self.jobs.values()):
+                if job.paused or job.state != 'scheduled' or job.next_run > now:
+                    continue
+
+                # Slept through a whole slot (suspend, blocked loop): never run more than once
+                if job.catch_up == 'skip' and now - job.next_run > job.interval:
+                    logger.info(f"Skipping missed run of {job.name}")
+                    job.next_run = job.next_slot(now)
+                    continue
+
+                job.state = 'queued'
+                run = asyncio.create_task(self._run_job(job))
+                self._runs.add(run)
+                run.add_done_callback(self._runs.discard)
+
+            upcoming = [job.next_run for job in self.jobs.values() if job.state == 'scheduled' and not job.paused]
+            delay = min(min(upcoming, default=now + MAX_SLEEP) - time.time(), MAX_SLEEP)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: ScheduledJob):
+        try:
+            async with self._slots:
+                job.state = 'running'
+                started = time.time()
+                try:
+                    await job.func()
+                    job.last_error = None
+                except Exception as e:
+                    job.failures += 1
+                    job.last_error = f"{type(e).__name__}: {e}"
+                    logger.error(f"Scheduled job {job.name} failed: {e}")
+
+                job.runs += 1
+                job.last_run = started
+                job.last_duration = time.time() - started
+                self._last_runs[job.name] = int(started)
+                self._save_state()
+        finally:
+            # Next slot counts from completion, so a slow run never overlaps itself
+            job.state = 'scheduled'
+            job.next_run = None if job.paused else job.next_slot(time.time())
+            self._wakeup.set()
+
+    def status(self) -> List[Dict]:
+        """Snapshot of all jobs, soonest first."""
+        return sorted(
+            (
+                {
+                    'name': job.name,
+                    'state': 'paused' if job.paused and job.state == 'scheduled' else job.state,
+                    'interval': job.interval,
+                    'offset': job.offset,
+                    'next_run': job.next_run,
+                    'last_run': job.last_run,
+                    'last_duration': job.last_duration,
+                    'runs': job.runs,
+                    'failures': job.failures,
+                    'last_error': job.last_error
+                }
+                for job in self.jobs.values()
+            ),
+            key=lambda s: s['next_run'] or float('inf')
+        )
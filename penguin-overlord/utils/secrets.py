@@ -2,17 +2,332 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-"""Secrets management for AWS, Vault, and Doppler."""
+"""
+Secrets management for AWS, Vault, and Doppler.
+
+Backend SDKs are imported only when that backend is configured
+(SECRETS_MANAGER=aws/vault, DOPPLER_TOKEN set), so plain .env setups don't
+pay for importing boto3, hvac and dopplersdk on every start.
+
+Lookups go through one SecretsResolver per process: each backend's secret set
+(a Doppler project/config, an AWS secret, a Vault path) is fetched once and
+kept for SECRETS_CACHE_TTL seconds, and backend clients are reused, so a bot
+start does one round trip per backend instead of one per key.
+refresh_secrets() drops the snapshots to pick up rotated secrets.
+
+With SECRETS_SNAPSHOT_KEY set, fetched secret sets are also kept in an
+encrypted file (SECRETS_SNAPSHOT_FILE) for up to SECRETS_SNAPSHOT_MAX_AGE
+seconds. A new process - typically a timer-driven runner - reads that file
+first and refreshes it from the backend in the background, so it starts
+without a secrets round trip and keeps working while the backend is down.
+"""
 
 import os
 import json
+import base64
+import hashlib
 import logging
-import hvac
-import boto3
-from dopplersdk import DopplerSDK
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_TTL = 300  # seconds
+FAILURE_TTL = 30  # Failed fetches are retried after this, not on every lookup
+DEFAULT_SNAPSHOT_FILE = 'data/secrets.snapshot'
+DEFAULT_SNAPSHOT_MAX_AGE = 24 * 3600  # Older snapshots are never used
+
+
+class SecretsSnapshot:
+    """
+    Encrypted on-disk copy of the resolver's secret sets.
+    
+    The file holds a random salt and a Fernet token (AES-CBC + HMAC) whose key
+    is derived from the master secret with scrypt, so it is useless without
+    SECRETS_SNAPSHOT_KEY and tampering is detected. Entries are stored under a
+    hash of their lookup key, so backend tokens are not written out.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: str, master_key: str, max_age: float = DEFAULT_SNAPSHOT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.enabled = True
+        self._master_key = master_key.encode()
+        self._salt: Optional[bytes] = None
+        self._fernet = None
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _name(key: Tuple) -> str:
+        digest = hashlib.sha256(json.dumps(list(key)).encode()).hexdigest()
+        return f"{key[0]}:{digest}"
+    
+    def _cipher(self, salt: bytes):
+        """Fernet for salt; the scrypt derivation is only redone when the salt changes."""
+        if self._salt != salt:
+            from cryptography.fernet import Fernet
+            
+            derived = hashlib.scrypt(self._master_key, salt=salt, n=2 ** 14, r=8, p=1, dklen=32)
+            self._fernet = Fernet(base64.urlsafe_b64encode(derived))
+            self._salt = salt
+        return self._fernet
+    
+    def _disable(self, error: Exception):
+        self.enabled = False
+        logger.warning(f"Secrets snapshot disabled: {type(error).__name__}: {error}")
+    
+    def _read(self) -> Dict[str, List]:
+        """Decrypt the file into {name: [saved_at, secrets]}; {} if missing or unreadable."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            payload = self._cipher(base64.b64decode(data['salt'])).decrypt(data['token'].encode())
+            return json.loads(payload)
+        except FileNotFoundError:
+            return {}
+        except ImportError as e:
+            self._disable(e)
+            return {}
+        except Exception as e:
+            # Wrong master key, tampering or a torn write: the next save replaces it
+            logger.warning(f"Ignoring unreadable secrets snapshot: {type(e).__name__}")
+            return {}
+    
+    def _write(self, entries: Dict[str, List]):
+        salt = self._salt or os.urandom(16)
+        token = self._cipher(salt).encrypt(json.dumps(entries).encode())
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        
+        # Owner-only file, replaced atomically so readers never see a partial write
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': self.VERSION, 'salt': base64.b64encode(salt).decode(), 'token': token.decode()}, f)
+        os.replace(tmp_path, self.path)
+    
+    def get(self, key: Tuple) -> Optional[Tuple[float, dict]]:
+        """(saved_at, secrets) for key if stored within max_age, else None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._read().get(self._name(key))
+        if entry and time.time() - entry[0] <= self.max_age:
+            return entry[0], entry[1]
+        return None
+    
+    def update(self, put: Optional[Dict[Tuple, dict]] = None, drop: Optional[Callable[[str], bool]] = None):
+        """
+        Store fresh secret sets and/or drop entries, merging with what other processes wrote.
+        
+        Args:
+            put: {lookup key: secrets} to store as of now
+            drop: Predicate on entry names ('backend:hash') to remove
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                now = time.time()
+                entries = {
+                    name: entry for name, entry in self._read().items()
+                    if now - entry[0] <= self.max_age and not (drop and drop(name))
+                }
+                for key, secrets in (put or {}).items():
+                    entries[self._name(key)] = [now, secrets]
+                if self.enabled:
+                    self._write(entries)
+            except ImportError as e:
+                self._disable(e)
+            except Exception as e:
+                logger.error(f"Failed to write secrets snapshot: {type(e).__name__}")
+
+
+class SecretsResolver:
+    """Per-process cache of backend secret sets and pooled backend clients."""
+    
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, store: Optional[SecretsSnapshot] = None):
+        self.ttl = ttl
+        self.store = store
+        self._snapshots: Dict[Tuple, Tuple[float, dict]] = {}  # key -> (expires at, secrets)
+        self._clients: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        self._clients_lock = threading.Lock()
+        self._refreshing: Dict[Tuple, threading.Thread] = {}
+        self.fetches = 0
+    
+    def _client(self, key: Tuple, factory: Callable[[], object]):
+        """Reuse one backend client per key (backend + credentials)."""
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = factory()
+            return client
+    
+    def _fetch(self, key: Tuple, fetch: Callable[[], dict]) -> Optional[dict]:
+        """Fetch from the backend and store the result; None on failure."""
+        self.fetches += 1
+        try:
+            secrets = fetch()
+        except Exception as e:
+            logger.error(f"Failed to load {key[0]} secrets: {type(e).__name__}")
+            return None
+        if self.store:
+            self.store.update(put={key: secrets})
+        return secrets
+    
+    def _refresh_in_background(self, key: Tuple, fetch: Callable[[], dict]):
+        """Re-fetch a secret set served from the snapshot without blocking the caller."""
+        if key in self._refreshing:
+            return
+        
+        def run():
+            secrets = self._fetch(key, fetch)
+            with self._lock:
+                if secrets is not None:
+                    self._snapshots[key] = (time.monotonic() + self.ttl, secrets)
+                self._refreshing.pop(key, None)
+        
+        # Not a daemon: a short-lived runner finishes the refresh before exiting,
+        # so the next run starts from an up-to-date snapshot
+        thread = threading.Thread(target=run, name=f"secrets-refresh-{key[0]}")
+        self._refreshing[key] = thread
+        thread.start()
+    
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for background refreshes to finish."""
+        for thread in list(self._refreshing.values()):
+            thread.join(timeout)
+    
+    def snapshot(self, key: Tuple, fetch: Callable[[], dict]) -> dict:
+        """
+        Return the cached secret set for key, fetching it if missing or expired.
+        
+        With an on-disk store, a stored copy within its max age is served
+        first; if it is older than the TTL it is refreshed in the background.
+        A failed fetch is logged and cached as empty for FAILURE_TTL seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            cached = self._snapshots.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+            
+            stored = self.store.get(key) if self.store else None
+            if stored:
+                saved_at, secrets = stored
+                self._snapshots[key] = (now + self.ttl, secrets)
+                if time.time() - saved_at > self.ttl:
+                    self._refresh_in_background(key, fetch)
+                return secrets
+            
+            secrets = self._fetch(key, fetch)
+            if secrets is None:
+                self._snapshots[key] = (now + min(FAILURE_TTL, self.ttl), {})
+                return {}
+            self._snapshots[key] = (now + self.ttl, secrets)
+            return secrets
+    
+    def refresh(self, backend: Optional[str] = None) -> int:
+        """Drop cached secret sets (of one backend, or all). Returns how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._snapshots if backend is None or key[0] == backend]
+            for key in keys:
+                del self._snapshots[key]
+        if self.store:
+            self.store.update(drop=lambda name: backend is None or name.startswith(f"{backend}:"))
+        return len(keys)
+    
+    def doppler(self, token: str, project: Optional[str], config: Optional[str]) -> Dict[str, str]:
+        """All secrets of a Doppler project/config as {NAME: value}."""
+        def fetch():
+            from dopplersdk import DopplerSDK
+            
+            def make_sdk():
+                sdk = DopplerSDK()
+                sdk.set_access_token(token)
+                return sdk
+            
+            sdk = self._client(('doppler', token), make_sdk)
+            response = sdk.secrets.list(project=project, config=config)
+            secrets = getattr(response, 'secrets', None) or {}
+            logger.info(f"Doppler connection successful. Found {len(secrets)} total secrets")
+            return {
+                name: value.get('computed', value.get('raw', ''))
+                for name, value in secrets.items()
+            }
+        
+        return self.snapshot(('doppler', token, project, config), fetch)
+    
+    def aws(self, secret_name: str) -> dict:
+        """The JSON key/value pairs of an AWS Secrets Manager secret."""
+        def fetch():
+            import boto3
+            
+            client = self._client(('aws',), lambda: boto3.client('secretsmanager'))
+            response = client.get_secret_value(SecretId=secret_name)
+            logger.debug(f"Successfully loaded AWS secret")
+            return json.loads(response['SecretString'])
+        
+        return self.snapshot(('aws', secret_name), fetch)
+    
+    def vault(self, url: str, token: str, path: str) -> dict:
+        """The key/value pairs of a Vault KV v2 secret."""
+        def fetch():
+            import hvac
+            
+            client = self._client(('vault', url, token), lambda: hvac.Client(url=url, token=token))
+            if not client.is_authenticated():
+                raise PermissionError("Vault authentication failed")
+            response = client.secrets.kv.v2.read_secret_version(path=path)
+            logger.debug(f"Successfully loaded Vault secret")
+            return response['data']['data']
+        
+        return self.snapshot(('vault', url, path), fetch)
+
+
+_resolver: Optional[SecretsResolver] = None
+
+
+def get_resolver() -> SecretsResolver:
+    """
+    Get the process-wide secrets resolver.
+    
+    TTL from SECRETS_CACHE_TTL; the encrypted snapshot is used when
+    SECRETS_SNAPSHOT_KEY is set.
+    """
+    global _resolver
+    if _resolver is None:
+        store = None
+        master_key = os.getenv('SECRETS_SNAPSHOT_KEY')
+        if master_key:
+            store = SecretsSnapshot(
+                os.getenv('SECRETS_SNAPSHOT_FILE', DEFAULT_SNAPSHOT_FILE),
+                master_key,
+                max_age=float(os.getenv('SECRETS_SNAPSHOT_MAX_AGE', DEFAULT_SNAPSHOT_MAX_AGE))
+            )
+        _resolver = SecretsResolver(ttl=float(os.getenv('SECRETS_CACHE_TTL', DEFAULT_CACHE_TTL)), store=store)
+    return _resolver
+
+
+def refresh_secrets(backend: Optional[str] = None) -> int:
+    """Force the next lookups to re-fetch from the backends ('doppler', 'aws', 'vault' or all)."""
+    return get_resolver().refresh(backend)
+
+
+def _doppler_secrets() -> Dict[str, str]:
+    """The configured Doppler project/config's secrets, or {} without DOPPLER_TOKEN."""
+    doppler_token = os.getenv('DOPPLER_TOKEN')
+    if not doppler_token:
+        return {}
+    return get_resolver().doppler(
+        doppler_token,
+        os.getenv('DOPPLER_PROJECT', 'stream-daemon'),
+        os.getenv('DOPPLER_CONFIG', 'prd')
+    )
+
 
 def load_secrets_from_aws(secret_name):
     """
@@ -20,19 +335,11 @@ def load_secrets_from_aws(secret_name):
     
     Args:
         secret_name: Name of the secret in AWS Secrets Manager
-        
+    
     Returns:
         Dict of secrets or empty dict on error
     """
-    try:
-        client = boto3.client('secretsmanager')
-        response = client.get_secret_value(SecretId=secret_name)
-        secrets = json.loads(response['SecretString'])
-        logger.debug(f"Successfully loaded AWS secret")
-        return secrets
-    except Exception as e:
-        logger.error(f"Failed to load AWS secret: {type(e).__name__}")
-        return {}
+    return get_resolver().aws(secret_name)
 
 
 def load_secrets_from_vault(secret_path):
@@ -41,30 +348,18 @@ def load_secrets_from_vault(secret_path):
     
     Args:
         secret_path: Path to the secret in Vault
-        
+    
     Returns:
         Dict of secrets or empty dict on error
     """
-    try:
-        vault_url = os.getenv('SECRETS_VAULT_URL')
-        vault_token = os.getenv('SECRETS_VAULT_TOKEN')
-        
-        if not vault_url or not vault_token:
-            logger.error("Vault URL or token not configured")
-            return {}
-        
-        client = hvac.Client(url=vault_url, token=vault_token)
-        if not client.is_authenticated():
-            logger.error("Vault authentication failed")
-            return {}
-        
-        response = client.secrets.kv.v2.read_secret_version(path=secret_path)
-        secrets = response['data']['data']
-        logger.debug(f"Successfully loaded Vault secret")
-        return secrets
-    except Exception as e:
-        logger.error(f"Failed to load Vault secret: {type(e).__name__}")
+    vault_url = os.getenv('SECRETS_VAULT_URL')
+    vault_token = os.getenv('SECRETS_VAULT_TOKEN')
+    
+    if not vault_url or not vault_token:
+        logger.error("Vault URL or token not configured")
         return {}
+    
+    return get_resolver().vault(vault_url, vault_token, secret_path)
 
 
 def load_secrets_from_doppler(secret_name):
@@ -73,57 +368,28 @@ def load_secrets_from_doppler(secret_name):
     
     Args:
         secret_name: Name prefix for secrets in Doppler (e.g., 'twitch', 'youtube')
-        
+    
     Returns:
         Dict of secrets or empty dict on error
     """
-    try:
-        doppler_token = os.getenv('DOPPLER_TOKEN')
-        if not doppler_token:
-            logger.error("DOPPLER_TOKEN not set")
-            return {}
-        
-        # Get Doppler project and config from environment
-        doppler_project = os.getenv('DOPPLER_PROJECT', 'stream-daemon')
-        doppler_config = os.getenv('DOPPLER_CONFIG', 'prd')
-        
-        sdk = DopplerSDK()
-        sdk.set_access_token(doppler_token)
-        
-        # Fetch the specific secret from Doppler
-        # Doppler stores secrets as key-value pairs in a project/config
-        try:
-            # Get all secrets from the specified project and config
-            secrets_response = sdk.secrets.list(
-                project=doppler_project,
-                config=doppler_config
-            )
-            
-            # Filter secrets that match our pattern
-            # e.g., if secret_name is "twitch", look for TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
-            secrets_dict = {}
-            if hasattr(secrets_response, 'secrets'):
-                all_keys = list(secrets_response.secrets.keys())
-                logger.info(f"Doppler connection successful. Found {len(all_keys)} total secrets")
-                
-                for secret_key, secret_value in secrets_response.secrets.items():
-                    # Match secrets with the platform prefix
-                    if secret_key.upper().startswith(secret_name.upper()):
-                        # Extract the actual key name (e.g., CLIENT_ID from TWITCH_CLIENT_ID)
-                        key_suffix = secret_key[len(secret_name)+1:].lower()  # +1 for underscore
-                        secrets_dict[key_suffix] = secret_value.get('computed', secret_value.get('raw', ''))
-                
-                if not secrets_dict:
-                    logger.debug(f"No secrets found with specified prefix")
-            
-            return secrets_dict
-        except Exception as e:
-            logger.error(f"Failed to fetch Doppler secret: {type(e).__name__}")
-            return {}
-            
-    except Exception as e:
-        logger.error(f"Failed to configure Doppler: {type(e).__name__}")
+    if not os.getenv('DOPPLER_TOKEN'):
+        logger.error("DOPPLER_TOKEN not set")
         return {}
+    
+    # Filter secrets that match our pattern
+    # e.g., if secret_name is "twitch", look for TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
+    secrets_dict = {}
+    for secret_key, secret_value in _doppler_secrets().items():
+        # Match secrets with the platform prefix
+        if secret_key.upper().startswith(secret_name.upper()):
+            # Extract the actual key name (e.g., CLIENT_ID from TWITCH_CLIENT_ID)
+            key_suffix = secret_key[len(secret_name)+1:].lower()  # +1 for underscore
+            secrets_dict[key_suffix] = secret_value
+    
+    if not secrets_dict:
+        logger.debug(f"No secrets found with specified prefix")
+    
+    return secrets_dict
 
 
 def get_secret(platform, key, secret_name_env=None, secret_path_env=None, doppler_secret_env=None):
@@ -134,6 +400,7 @@ def get_secret(platform, key, secret_name_env=None, secret_path_env=None, dopple
     3. None if not found
     
     This ensures production secrets in secrets managers override .env defaults.
+    Backend lookups are served from the resolver's cached snapshot.
     
     Args:
         platform: Platform name (e.g., 'Twitch', 'YouTube')
@@ -141,42 +408,21 @@ def get_secret(platform, key, secret_name_env=None, secret_path_env=None, dopple
         secret_name_env: AWS Secrets Manager env var name
         secret_path_env: HashiCorp Vault env var name
         doppler_secret_env: Doppler secret name env var
-        
+    
     Returns:
         Secret value or None if not found
     """
     try:
         # Priority 1: Try Doppler first if DOPPLER_TOKEN exists (auto-detect)
-        doppler_token = os.getenv('DOPPLER_TOKEN')
-        if doppler_token:
-            try:
-                doppler_project = os.getenv('DOPPLER_PROJECT', 'stream-daemon')
-                doppler_config = os.getenv('DOPPLER_CONFIG', 'prd')
-                
-                sdk = DopplerSDK()
-                sdk.set_access_token(doppler_token)
-                secrets_response = sdk.secrets.list(project=doppler_project, config=doppler_config)
-                
-                if hasattr(secrets_response, 'secrets'):
-                    # Try platform-specific key first (e.g., DISCORD_ROLE_YOUTUBE)
-                    env_key = f"{platform.upper()}_{key.upper()}"
-                    if env_key in secrets_response.secrets:
-                        value = secrets_response.secrets[env_key].get('computed', 
-                                secrets_response.secrets[env_key].get('raw', ''))
-                        if value:  # Only return if not empty
-                            logger.debug(f"Found secret in Doppler: {env_key}")
-                            return value
-                    
-                    # Try simple key format (e.g., CHECK_INTERVAL)
-                    simple_key = key.upper()
-                    if simple_key in secrets_response.secrets:
-                        value = secrets_response.secrets[simple_key].get('computed',
-                                secrets_response.secrets[simple_key].get('raw', ''))
-                        if value:  # Only return if not empty
-                            logger.debug(f"Found secret in Doppler: {simple_key}")
-                            return value
-            except Exception as e:
-                logger.debug(f"Doppler lookup failed for {platform}.{key}: {e}")
+        secrets = _doppler_secrets()
+        if secrets:
+            # Try platform-specific key first (e.g., DISCORD_ROLE_YOUTUBE),
+            # then simple key format (e.g., CHECK_INTERVAL)
+            for doppler_key in (f"{platform.upper()}_{key.upper()}", key.upper()):
+                value = secrets.get(doppler_key)
+                if value:  # Only return if not empty
+                    logger.debug(f"Found secret in Doppler: {doppler_key}")
+                    return value
         
         # Check which secrets manager is enabled (for AWS/Vault)
         secret_manager = os.getenv('SECRETS_MANAGER', 'none').lower()
@@ -206,7 +452,7 @@ def get_secret(platform, key, secret_name_env=None, secret_path_env=None, dopple
             return env_value
         
         return None
-        
+    
     except Exception as e:
         logger.error(f"Error getting secret for {platform}.{key}: {type(e).__name__}")
         return None
@@ -0,0 +1,397 @@
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at https://mozilla.org/MPL/2.0/.
+
+"""
+Story Index - Cross-source near-duplicate detection for posted news.
+
+The same story is often published by several outlets (and categories) within
+an hour. Each posted story gets a MinHash signature of its title/description
+shingles; LSH band buckets are stored in SQLite so a lookup is a single
+indexed query regardless of how many stories are in the rolling window.
+The database is shared by the bot and every news runner process.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import struct
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import discord
+
+from utils.embed_batch import send_embeds
+
+logger = logging.getLogger(__name__)
+
+# MinHash / LSH parameters: 16 bands x 4 rows matches at ~50% similarity
+# (_band_buckets packs a band into 64 bits, so keep LSH_BANDS <= 16 and LSH_ROWS == 4)
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_WINDOW_HOURS = 48
+
+_SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+_SIGNATURE_BYTES = NUM_PERM * 4
+_EMPTY_SIGNATURE = [0xFFFFFFFF] * NUM_PERM
+
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have how in into is it its new of on
+    or over says than that the their this to up was were what when who why will
+    with after about more just you your
+""".split())
+
+
+def shingles(title: str, description: str = '') -> Set[str]:
+    """Normalized word unigrams and bigrams (stop words removed)."""
+    words = [
+        w for w in re.findall(r'[a-z0-9]+', f'{title} {description}'.lower())
+        if w not in STOP_WORDS and len(w) > 1
+    ]
+    result = set(words)
+    result.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+    return result
+
+
+def minhash(tokens: Set[str]) -> List[int]:
+    """
+    MinHash signature of a shingle set.
+
+    Each token is hashed once with SHAKE-128 into NUM_PERM independent 32-bit
+    values; the signature is the element-wise minimum, which keeps the work in
+    C instead of NUM_PERM Python-level permutations per token.
+    """
+    if not tokens:
+        return list(_EMPTY_SIGNATURE)
+    per_token = [
+        struct.unpack(_SIGNATURE_FORMAT, hashlib.shake_128(t.encode()).digest(_SIGNATURE_BYTES))
+        for t in tokens
+    ]
+    return list(map(min, zip(*per_token)))
+
+
+def _band_buckets(signature: List[int]) -> List[int]:
+    """
+    One signed 64-bit bucket id per LSH band.
+
+    The band index takes the top 4 bits and each row contributes its low
+    15 bits, so ids are stable across processes and Python versions.
+    """
+    buckets = []
+    for band in range(LSH_BANDS):
+        bucket = band
+        for row in signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]:
+            bucket = (bucket << 15) | (row & 0x7FFF)
+        buckets.append(bucket - (1 << 64) if bucket >= 1 << 63 else bucket)
+    return buckets
+
+
+def _similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class StoryIndex:
+    """Rolling window of posted stories with MinHash/LSH near-duplicate lookup."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS stories (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            link TEXT,
+            category TEXT,
+            source TEXT,
+            jump_url TEXT,
+            channel_id INTEGER,
+            message_id INTEGER,
+            posted_at REAL NOT NULL,
+            signature BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_stories_posted_at ON stories (posted_at);
+        CREATE INDEX IF NOT EXISTS idx_stories_link ON stories (link);
+        CREATE TABLE IF NOT EXISTS story_buckets (
+            bucket INTEGER NOT NULL,
+            story_id INTEGER NOT NULL REFERENCES stories (id) ON DELETE CASCADE,
+            PRIMARY KEY (bucket, story_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_story_buckets_story ON story_buckets (story_id);
+    """
+
+    def __init__(
+        self,
+        path: str,
+        window_hours: float = DEFAULT_WINDOW_HOURS,
+        threshold: float = DEFAULT_THRESHOLD
+    ):
+        self.path = path
+        self.window = window_hours * 3600
+        self.threshold = threshold
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        # Several runner processes may share the file - wait for locks rather than fail
+        self.conn = sqlite3.connect(path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(self.SCHEMA)
+        self.prune()
+
+    def prune(self, now: Optional[float] = None):
+        """Forget stories older than the rolling window."""
+        cutoff = (now or time.time()) - self.window
+        self.conn.execute('DELETE FROM stories WHERE posted_at < ?', (cutoff,))
+        self.conn.commit()
+
+    def find_duplicate(
+        self,
+        title: str,
+        description: str = '',
+        link: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> Optional[Dict]:
+        """
+        Find an earlier story in the window that matches this one.
+
+        Returns:
+            The best matching story row as a dict (with a 'similarity' key), or None
+        """
+        cutoff = (now or time.time()) - self.window
+        if link:
+            row = self.conn.execute(
+                'SELECT * FROM stories WHERE link = ? AND posted_at >= ? LIMIT 1', (link, cutoff)
+            ).fetchone()
+            if row:
+                return dict(row, similarity=1.0)
+
+        signature = minhash(shingles(title, description))
+        buckets = _band_buckets(signature)
+        rows = self.conn.execute(
+            f"""
+            SELECT DISTINCT s.* FROM story_buckets b JOIN stories s ON s.id = b.story_id
+            WHERE b.bucket IN ({','.join('?' * len(buckets))}) AND s.posted_at >= ?
+            """,
+            (*buckets, cutoff)
+        ).fetchall()
+
+        best, best_score = None, 0.0
+        for row in rows:
+            score = _similarity(signature, struct.unpack(_SIGNATURE_FORMAT, row['signature']))
+            if score >= self.threshold and score > best_score:
+                best, best_score = row, score
+        return dict(best, similarity=best_score) if best else None
+
+    def add(
+        self,
+        title: str,
+        description: str = '',
+        link: Optional[str] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        message: Optional[discord.Message] = None,
+        now: Optional[float] = None
+    ) -> int:
+        """Record a posted story. Returns its id."""
+        signature = minhash(shingles(title, description))
+        cursor = self.conn.execute(
+            """
+            INSERT INTO stories
+                (title, link, category, source, jump_url, channel_id, message_id, posted_at, signature)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                title, link, category, source,
+                message.jump_url if message else None,
+                message.channel.id if message else None,
+                message.id if message else None,
+                now or time.time(),
+                struct.pack(_SIGNATURE_FORMAT, *signature)
+            )
+        )
+        story_id = cursor.lastrowid
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO story_buckets (bucket, story_id) VALUES (?, ?)',
+            [(bucket, story_id) for bucket in _band_buckets(signature)]
+        )
+        self.conn.commit()
+        return story_id
+
+    def set_message(self, story_id: int, message: discord.Message):
+        """Attach the message a story was posted in (recorded before sending)."""
+        self.conn.execute(
+            'UPDATE stories SET jump_url = ?, channel_id = ?, message_id = ? WHERE id = ?',
+            (message.jump_url, message.channel.id, message.id, story_id)
+        )
+        self.conn.commit()
+
+    def remove(self, story_id: int):
+        """Forget a story that was recorded but never posted."""
+        self.conn.execute('DELETE FROM stories WHERE id = ?', (story_id,))
+        self.conn.commit()
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM stories').fetchone()[0]
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
+def _check_duplicate(
+    channel,
+    embed: discord.Embed,
+    index: Optional[StoryIndex],
+    title: str,
+    description: str,
+    link: str,
+    source_name: str,
+    mode: str
+) -> Tuple[Optional[Dict], Optional[discord.MessageReference], bool]:
+    """
+    Look a story up in the index and apply the dedup mode.
+
+    Returns:
+        (duplicate, reply reference, suppress) - in thread mode a duplicate in
+        another channel gets a "Related Coverage" link added to the embed
+    """
+    duplicate = None
+    if index and mode != 'off':
+        try:
+            duplicate = index.find_duplicate(title, description, link)
+        except Exception as e:
+            logger.error(f"Story index lookup failed: {e}")
+
+    reference = None
+    if duplicate:
+        if mode == 'suppress':
+            logger.info(
+                f"Suppressed duplicate from {source_name}: '{title[:60]}' matches "
+                f"{duplicate['source']} ({duplicate['category']}, {duplicate['similarity']:.0%})"
+            )
+            return duplicate, None, True
+        if duplicate['channel_id'] == channel.id and duplicate['message_id']:
+            reference = discord.MessageReference(
+                message_id=duplicate['message_id'],
+                channel_id=duplicate['channel_id'],
+                fail_if_not_exists=False
+            )
+        elif duplicate['jump_url']:
+            embed.add_field(
+                name="Related Coverage",
+                value=f"[{duplicate['source']}]({duplicate['jump_url']})",
+                inline=False
+            )
+    return duplicate, reference, False
+
+
+async def post_story(
+    channel,
+    embed: discord.Embed,
+    index: Optional[StoryIndex],
+    title: str,
+    description: str,
+    link: str,
+    category: str,
+    source_name: str,
+    mode: str = 'suppress'
+) -> Optional[discord.Message]:
+    """
+    Send a news embed unless it duplicates a story already posted in any category.
+
+    Modes:
+        suppress - skip near-duplicates entirely
+        thread   - reply to the original post (same channel) or link to it
+        off      - always post
+
+    Returns:
+        The sent message, or None if the story was suppressed
+    """
+    duplicate, reference, suppress = _check_duplicate(
+        channel, embed, index, title, description, link, source_name, mode
+    )
+    if suppress:
+        return None
+
+    if reference:
+        message = await channel.send(embed=embed, reference=reference, mention_author=False)
+    else:
+        message = await channel.send(embed=embed)
+
+    # Replies point at the original, so only first posts go into the index
+    if index and not duplicate:
+        try:
+            index.add(title, description, link, category, source_name, message)
+        except Exception as e:
+            logger.error(f"Failed to record story in index: {e}")
+    return message
+
+
+async def post_stories(
+    channel,
+    stories: List[Tuple[discord.Embed, str, str, str, str]],
+    index: Optional[StoryIndex],
+    category: str,
+    mode: str = 'suppress',
+    batch: bool = True
+) -> List[Union[discord.Message, None, bool]]:
+    """
+    post_story() for several stories at once, packed into multi-embed messages.
+
+    Args:
+        stories: (embed, title, description, link, source_name) in posting order
+        batch: False sends one message per story
+
+    Returns:
+        Per story: the message it was posted in, None if it was suppressed as
+        a duplicate, or False if sending failed (logged; not recorded in the index)
+    """
+    results: List[Union[discord.Message, None, bool]] = [None] * len(stories)
+    pending: List[Tuple[int, discord.Embed, Optional[int]]] = []  # (position, embed, story id)
+
+    async def flush():
+        messages = await send_embeds(channel, [embed for _, embed, _ in pending], batch)
+        for (position, _, story_id), message in zip(pending, messages):
+            results[position] = message or False
+            try:
+                if story_id and message:
+                    index.set_message(story_id, message)
+                elif story_id:
+                    index.remove(story_id)
+            except Exception as e:
+                logger.error(f"Failed to update story index: {e}")
+        pending.clear()
+
+    for position, (embed, title, description, link, source_name) in enumerate(stories):
+        duplicate, reference, suppress = _check_duplicate(
+            channel, embed, index, title, description, link, source_name, mode
+        )
+        if suppress:
+            continue
+
+        if reference:
+            # A reply applies to the whole message, so it goes out on its own (in order)
+            await flush()
+            try:
+                results[position] = await channel.send(embed=embed, reference=reference, mention_author=False)
+            except Exception as e:
+                logger.error(f"Failed to post reply from {source_name}: {e}")
+                results[position] = False
+            continue
+
+        # Recorded before sending so later stories in the same batch see it
+        story_id = None
+        if index and not duplicate:
+            try:
+                story_id = index.add(title, description, link, category, source_name)
+            except Exception as e:
+                logger.error(f"Failed to record story in index: {e}")
+        pending.append((position, embed, story_id))
+
+    if pending:
+        await flush()
+    return results
@@ -7,7 +7,8 @@
 XKCD Runner - Standalone execution for systemd timers
 
 Checks for new XKCD comics and posts to configured Discord channel.
-Runs independently of the main bot process for reliability.
+Runs independently of the main bot process for reliability, posting over
+the REST API (no gateway connection).
 
 Usage:
     python xkcd_runner.py
@@ -15,6 +16,7 @@ Usage:
 Environment Variables:
     DISCORD_BOT_TOKEN - Required (supports Doppler via get_secret)
     XKCD_POST_CHANNEL_ID - Required (channel ID for posting)
+    XKCD_WEBHOOK_URL - Optional (post through a channel webhook instead)
 """
 
 import os
@@ -25,7 +27,6 @@ import logging
 from pathlib import Path
 
 import discord
-import aiohttp
 from dotenv import load_dotenv
 
 # Add parent directory to path for imports
@@ -36,6 +37,8 @@ load_dotenv()
 
 # Import secrets utility
 from utils.secrets import get_secret
+from utils.http_client import get_http_client
+from utils.discord_rest import delivery_channel
 
 # Configure logging
 logging.basicConfig(
@@ -78,10 +81,10 @@ def save_state(state: dict):
 async def fetch_latest_xkcd() -> dict | None:
     """Fetch latest XKCD comic."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get('https://xkcd.com/info.0.json', timeout=10) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+        session = await get_http_client().get_session()
+        async with session.get('https://xkcd.com/info.0.json', timeout=10) as resp:
+            if resp.status == 200:
+                return await resp.json()
     except Exception as e:
         logger.error(f"Error fetching XKCD: {e}")
     return None
@@ -93,12 +96,9 @@ async def post_xkcd_update():
     # Prefer persisted channel in state if present (set via runtime command)
     state = load_state()
     channel_id = state.get('channel_id') or get_secret('XKCD', 'POST_CHANNEL_ID')
+    webhook_url = get_secret('XKCD', 'WEBHOOK_URL')
     
-    if not token:
-        logger.error("DISCORD_BOT_TOKEN not set")
-        return False
-    
-    if not channel_id:
+    if not channel_id and not webhook_url:
         logger.error("XKCD_POST_CHANNEL_ID not set")
         return False
     
@@ -134,69 +134,59 @@ async def post_xkcd_update():
         logger.info(f"No new XKCD (latest: {latest_num}, last posted: {last_posted})")
         return True
     
-    # Create Discord client
-    intents = discord.Intents.default()
-    client = discord.Client(intents=intents)
+    channel = delivery_channel(token, channel_id, webhook_url)
+    if not channel:
+        logger.error("DISCORD_BOT_TOKEN not set")
+        return False
     
-    @client.event
-    async def on_ready():
-        logger.info(f"Connected as {client.user}")
+    try:
+        await channel.resolve()
+        
+        # Create embed
+        embed = discord.Embed(
+            title=f"#{comic['num']}: {comic['title']}",
+            url=f"https://xkcd.com/{comic['num']}",
+            color=discord.Color.blue()
+        )
+        embed.set_image(url=comic['img'])
+        
+        if comic.get('alt'):
+            embed.description = f"_{comic['alt']}_"
         
         try:
-            channel = client.get_channel(channel_id)
-            if not channel:
-                channel = await client.fetch_channel(channel_id)
-            
-            if not channel:
-                logger.error(f"Channel {channel_id} not found")
-                await client.close()
-                return
-            
-            # Create embed
-            embed = discord.Embed(
-                title=f"#{comic['num']}: {comic['title']}",
-                url=f"https://xkcd.com/{comic['num']}",
-                color=discord.Color.blue()
-            )
-            embed.set_image(url=comic['img'])
-            
-            if comic.get('alt'):
-                embed.description = f"_{comic['alt']}_"
-            
-            try:
-                year = int(comic.get('year', 0))
-                month = int(comic.get('month', 0))
-                day = int(comic.get('day', 0))
-                embed.set_footer(text=f"Published: {year}-{month:02d}-{day:02d}")
-            except Exception:
-                pass
-            
-            # Send message
-            await channel.send(embed=embed)
-            logger.info(f"Posted XKCD #{latest_num} to channel {channel_id}")
-            
-            # Update state
-            state['last_posted'] = latest_num
-            save_state(state)
-            
-        except Exception as e:
-            logger.error(f"Error posting XKCD: {e}", exc_info=True)
+            year = int(comic.get('year', 0))
+            month = int(comic.get('month', 0))
+            day = int(comic.get('day', 0))
+            embed.set_footer(text=f"Published: {year}-{month:02d}-{day:02d}")
+        except Exception:
+            pass
         
-        finally:
-            await client.close()
-    
-    try:
-        await client.start(token)
+        # Send message
+        await channel.send(embed=embed)
+        logger.info(f"Posted XKCD #{latest_num} to channel {channel.id}")
+        
+        # Update state
+        state['last_posted'] = latest_num
+        save_state(state)
         return True
+    
     except Exception as e:
-        logger.error(f"Error running client: {e}", exc_info=True)
+        logger.error(f"Error posting XKCD: {e}", exc_info=True)
         return False
 
 
+async def main():
+    """Run one update and release the shared HTTP pool."""
+    try:
+        return await post_xkcd_update()
+    finally:
+        await get_http_client().close()
+
+
 if __name__ == '__main__':
     logger.info("XKCD runner starting...")
     try:
-        asyncio.run(post_xkcd_update())
+        asyncio.run(main())
         logger.info("XKCD runner completed")
         sys.exit(0)
     except Exception as e:
@@ -6,7 +6,12 @@
 #
 # Deploy News Timers - Setup systemd timers for optimized news fetching
 #
-# Usage: sudo ./deploy-news-timers.sh
+# Usage: sudo ./deploy-news-timers.sh              # One timer per category
+#        sudo ./deploy-news-timers.sh --combined   # One timer for all categories
+#
+# --combined runs news_runner.py --category all every 15 minutes in a single
+# process; each category is still only fetched when its configured
+# interval_hours/minute_offset slot comes up.
 #
 
 set -e
@@ -17,6 +22,11 @@ SYSTEMD_DIR="/etc/systemd/system"
 USER="penguin"
 GROUP="penguin"
 
+COMBINED=false
+if [ "$1" = "--combined" ]; then
+    COMBINED=true
+fi
+
 echo "📰 Deploying Optimized News System Timers"
 echo "=========================================="
 echo
@@ -48,6 +58,10 @@ echo
 create_service() {
     local category=$1
     local service_file="$SYSTEMD_DIR/penguin-news-${category}.service"
+    local timeout=120
+    if [ "$category" = "all" ]; then
+        timeout=600  # Several categories in one run
+    fi
     
     cat > "$service_file" << EOF
 [Unit]
@@ -68,7 +82,7 @@ SyslogIdentifier=penguin-news-${category}
 MemoryMax=256M
 CPUQuota=50%
 TasksMax=50
-TimeoutStartSec=120
+TimeoutStartSec=$timeout
 
 [Install]
 WantedBy=multi-user.target
@@ -104,25 +118,33 @@ EOF
 echo "🔧 Creating systemd units..."
 echo
 
-# CVE - Every 6 hours at :00
-create_service "cve"
-create_timer "cve" "*-*-* 00,06,12,18:00:00"
-
-# Cybersecurity - Every 3 hours at :01
-create_service "cybersecurity"
-create_timer "cybersecurity" "*-*-* 00,03,06,09,12,15,18,21:01:00"
-
-# Tech - Every 4 hours at :30
-create_service "tech"
-create_timer "tech" "*-*-* 00,04,08,12,16,20:30:00"
-
-# Gaming - Every 2 hours at :15
-create_service "gaming"
-create_timer "gaming" "*-*-* */2:15:00"
-
-# Apple/Google - Every 3 hours at :45
-create_service "apple_google"
-create_timer "apple_google" "*-*-* 00,03,06,09,12,15,18,21:45:00"
+if [ "$COMBINED" = true ]; then
+    # All categories in one process; the runner skips categories that aren't due
+    create_service "all"
+    create_timer "all" "*:0/15"
+    CATEGORIES="all"
+else
+    # CVE - Every 6 hours at :00
+    create_service "cve"
+    create_timer "cve" "*-*-* 00,06,12,18:00:00"
+
+    # Cybersecurity - Every 3 hours at :01
+    create_service "cybersecurity"
+    create_timer "cybersecurity" "*-*-* 00,03,06,09,12,15,18,21:01:00"
+
+    # Tech - Every 4 hours at :30
+    create_service "tech"
+    create_timer "tech" "*-*-* 00,04,08,12,16,20:30:00"
+
+    # Gaming - Every 2 hours at :15
+    create_service "gaming"
+    create_timer "gaming" "*-*-* */2:15:00"
+
+    # Apple/Google - Every 3 hours at :45
+    create_service "apple_google"
+    create_timer "apple_google" "*-*-* 00,03,06,09,12,15,18,21:45:00"
+    CATEGORIES="cve cybersecurity tech gaming apple_google"
+fi
 
 echo
 echo "🔄 Reloading systemd daemon..."
@@ -162,7 +184,7 @@ echo
 if [[ $REPLY =~ ^[Yy]$ ]]; then
     echo "🚀 Enabling and starting timers..."
     
-    for category in cve cybersecurity tech gaming apple_google; do
+    for category in $CATEGORIES; do
         systemctl enable "penguin-news-${category}.timer"
         systemctl start "penguin-news-${category}.timer"
         echo "✅ Started penguin-news-${category}.timer"
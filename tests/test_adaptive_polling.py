@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Test adaptive per-feed polling intervals in OptimizedNewsFetcher (no network needed)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from utils.news_fetcher import OptimizedNewsFetcher, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL
+
+URL = 'https://example.com/feed'
+
+
+def _fetcher(tmp: str) -> OptimizedNewsFetcher:
+    fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db')
+    fetcher.set_adaptive_polling(True)
+    return fetcher
+
+
+def test_busy_feed_polled_more_often_than_daily_feed():
+    """Interval should follow the publish rate within the min/max bounds."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = _fetcher(tmp)
+        fetcher._record_poll('busy', False, [now - n * 1800 for n in range(10)])
+        fetcher._record_poll('daily', False, [now - n * 86400 for n in range(5)])
+
+        busy = fetcher.feed_cache.get_schedule('busy')['interval']
+        daily = fetcher.feed_cache.get_schedule('daily')['interval']
+        assert busy == MIN_POLL_INTERVAL, busy
+        assert 12 * 3600 <= daily <= MAX_POLL_INTERVAL, daily
+    print("✅ Poll interval follows publish rate")
+
+
+def test_not_modified_responses_stretch_interval():
+    """A feed that keeps answering 304 should be polled less often."""
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = _fetcher(tmp)
+        published = [now - n * 7200 for n in range(5)]
+        fetcher._record_poll(URL, False, published)
+        base = fetcher.feed_cache.get_schedule(URL)['interval']
+        for _ in range(5):
+            fetcher._record_poll(URL, True)
+        stretched = fetcher.feed_cache.get_schedule(URL)
+        assert stretched['interval'] > base, (base, stretched)
+        assert 0 < stretched['not_modified_ratio'] < 1
+    print("✅ 304 responses stretch the interval")
+
+
+def test_fetch_multiple_feeds_skips_feeds_not_due():
+    """Feeds whose next poll is in the future should not be requested."""
+    with tempfile.TemporaryDirectory() as tmp:
+        fetcher = _fetcher(tmp)
+        fetcher.feed_cache.set_schedule(URL, {'next_poll': time.time() + 3600})
+        requested = []
+
+        async def fake_fetch(url, *args, **kwargs):
+            requested.append(url)
+            return None
+
+        fetcher.fetch_feed_optimized = fake_fetch
+        sources = {
+            'later': {'name': 'Later', 'url': URL},
+            'fresh': {'name': 'Fresh', 'url': 'https://example.com/other'},
+        }
+        asyncio.run(fetcher.fetch_multiple_feeds(sources, ['later', 'fresh']))
+        assert requested == ['https://example.com/other'], requested
+
+        fetcher.set_adaptive_polling(False)
+        requested.clear()
+        asyncio.run(fetcher.fetch_multiple_feeds(sources, ['later', 'fresh']))
+        assert len(requested) == 2
+        asyncio.run(fetcher.http_client.close())
+    print("✅ Feeds not yet due are skipped")
+
+
+if __name__ == "__main__":
+    test_busy_feed_polled_more_often_than_daily_feed()
+    test_not_modified_responses_stretch_interval()
+    test_fetch_multiple_feeds_skips_feeds_not_due()
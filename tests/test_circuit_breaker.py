@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test the per-feed circuit breaker in OptimizedNewsFetcher (no network needed)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from aiohttp import web
+from utils.news_fetcher import OptimizedNewsFetcher, BREAKER_FAILURE_THRESHOLD, BREAKER_BASE_BACKOFF
+from utils.http_client import HTTPClient
+
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>Story</title><link>https://example.com/1</link><guid>story-1</guid></item>
+</channel></rss>"""
+
+
+async def _with_server(responses, scenario):
+    """Serve the given (status, headers) responses in order and run scenario(fetcher, url, served)."""
+    served = []
+
+    async def handler(request):
+        status, headers = responses[min(len(served), len(responses) - 1)]
+        served.append(request)
+        return web.Response(status=status, headers=headers, text=FEED if status == 200 else '')
+
+    app = web.Application()
+    app.router.add_get('/feed', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client = HTTPClient()
+        fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db', http_client=http_client)
+        try:
+            await scenario(fetcher, f'http://127.0.0.1:{port}/feed', served)
+        finally:
+            await fetcher.close()
+            await http_client.close()
+            await runner.cleanup()
+
+
+def test_breaker_trips_after_repeated_failures():
+    async def scenario(fetcher, url, served):
+        sources = {'dead': {'name': 'Dead', 'url': url}}
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            await fetcher.fetch_multiple_feeds(sources, ['dead'])
+        assert fetcher.breaker_state(url) == 'open'
+        health = fetcher.feed_cache.get_health(url)
+        assert health['open_until'] - time.time() > BREAKER_BASE_BACKOFF - 5, health
+
+        await fetcher.fetch_multiple_feeds(sources, ['dead'])
+        assert len(served) == BREAKER_FAILURE_THRESHOLD, "Open circuit must not send requests"
+
+    asyncio.run(_with_server([(500, {})], scenario))
+    print("✅ Breaker opens after repeated failures and skips the feed")
+
+
+def test_half_open_probe_closes_or_backs_off():
+    async def scenario(fetcher, url, served):
+        fetcher.feed_cache.set_health(url, {'failures': BREAKER_FAILURE_THRESHOLD, 'open_until': int(time.time()) - 1})
+        assert fetcher.breaker_state(url) == 'half_open'
+
+        # Probe fails -> longer backoff
+        await fetcher.fetch_feed_optimized(url, 'Flaky')
+        health = fetcher.feed_cache.get_health(url)
+        assert health['open_until'] - time.time() > 2 * BREAKER_BASE_BACKOFF - 5, health
+
+        # Backoff elapses, probe succeeds -> closed
+        health['open_until'] = int(time.time()) - 1
+        fetcher.feed_cache.set_health(url, health)
+        result = await fetcher.fetch_feed_optimized(url, 'Flaky')
+        assert result and result[3] == 'story-1', result
+        assert fetcher.breaker_state(url) == 'closed'
+        assert fetcher.feed_cache.get_health(url) is None
+
+    asyncio.run(_with_server([(500, {}), (200, {})], scenario))
+    print("✅ Half-open probe backs off further or closes the breaker")
+
+
+def test_retry_after_opens_immediately():
+    async def scenario(fetcher, url, served):
+        await fetcher.fetch_feed_optimized(url, 'Limited')
+        health = fetcher.feed_cache.get_health(url)
+        assert health['failures'] == 1
+        assert 110 <= health['open_until'] - time.time() <= 120, health
+        assert fetcher.breaker_state(url) == 'open'
+
+    asyncio.run(_with_server([(429, {'Retry-After': '120'})], scenario))
+    print("✅ 429 Retry-After honoured")
+
+
+if __name__ == "__main__":
+    test_breaker_trips_after_repeated_failures()
+    test_half_open_probe_closes_or_backs_off()
+    test_retry_after_opens_immediately()
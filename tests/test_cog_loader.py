@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test the cog manifest and concurrent extension loading (no Discord connection needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import time
+from cogs import COG_MANIFEST
+from utils.cog_loader import cog_manifest, load_cogs, LOAD_MODES
+
+COGS_DIR = project_root / "penguin-overlord" / "cogs"
+
+
+def test_manifest_covers_every_cog():
+    files = {path.stem for path in COGS_DIR.glob('*.py') if not path.name.startswith('_')}
+    assert files == set(COG_MANIFEST), f"Unlisted: {files - set(COG_MANIFEST)}, missing files: {set(COG_MANIFEST) - files}"
+    assert set(COG_MANIFEST.values()) <= set(LOAD_MODES)
+
+    eager, deferred = cog_manifest(COGS_DIR, COG_MANIFEST)
+    assert 'admin' in eager and 'techquote' in deferred
+    assert sorted(eager + deferred) == sorted(files)
+
+    # A new cog nobody added to the manifest still loads, eagerly
+    eager, deferred = cog_manifest(COGS_DIR, {'admin': 'eager'})
+    assert eager == sorted(files) and deferred == []
+    print(f"✅ Manifest lists all {len(files)} cogs ({len(cog_manifest(COGS_DIR, COG_MANIFEST)[0])} eager)")
+
+
+class _Bot:
+    """Extensions whose setup awaits I/O for 0.1s; 'cogs.broken' fails."""
+
+    def __init__(self):
+        self.loaded = []
+
+    async def load_extension(self, name):
+        await asyncio.sleep(0.1)
+        if name == 'cogs.broken':
+            raise RuntimeError("bad setup")
+        self.loaded.append(name)
+
+
+def test_load_cogs_concurrently():
+    bot = _Bot()
+    start = time.perf_counter()
+    timings = asyncio.run(load_cogs(bot, ['a', 'broken', 'b', 'c']))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(bot.loaded) == ['cogs.a', 'cogs.b', 'cogs.c']
+    assert timings['broken'] is None and all(timings[name] >= 100 for name in 'abc'), timings
+    assert elapsed < 0.3, f"Setups should overlap, took {elapsed:.2f}s"
+    print(f"✅ 4 extensions loaded concurrently in {elapsed * 1000:.0f}ms, one failure isolated")
+
+
+if __name__ == "__main__":
+    test_manifest_covers_every_cog()
+    test_load_cogs_concurrently()
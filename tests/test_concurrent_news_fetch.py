@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Test that the in-bot news cogs fetch their sources concurrently through the shared fetcher (no network needed)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from aiohttp import web
+from cogs.news_manager import NewsManager
+from utils.news_fetcher import OptimizedNewsFetcher
+from utils.http_client import HTTPClient
+
+FEED_DELAY = 0.5
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>Story {n}</title><link>https://example.com/{n}</link><guid>story-{n}</guid>
+<pubDate>{date}</pubDate></item>
+</channel></rss>"""
+RECENT = time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime())
+STALE = 'Mon, 01 Jan 2018 00:00:00 GMT'
+
+
+async def _run(config, max_age=None):
+    """Serve four slow feeds and fetch them through NewsManager.fetch_new_items."""
+    served = []
+
+    async def handler(request):
+        n = int(request.match_info['n'])
+        served.append(n)
+        await asyncio.sleep(FEED_DELAY)
+        if request.headers.get('If-None-Match') == f'"{n}"':
+            return web.Response(status=304)
+        date = STALE if n == 3 else RECENT
+        return web.Response(text=FEED.format(n=n, date=date), headers={'ETag': f'"{n}"'})
+
+    app = web.Application()
+    app.router.add_get('/feed/{n}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    sources = {
+        f'source_{n}': {'name': f'Source {n}', 'url': f'http://127.0.0.1:{port}/feed/{n}'}
+        for n in range(4)
+    }
+
+    manager = NewsManager(bot=None)
+    manager.config = {'tech': config}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client = HTTPClient()
+        fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db', http_client=http_client)
+        try:
+            started = time.perf_counter()
+            first = await manager.fetch_new_items('tech', fetcher, sources, max_age=max_age)
+            elapsed = time.perf_counter() - started
+            second = await manager.fetch_new_items('tech', fetcher, sources, max_age=max_age)
+        finally:
+            await fetcher.close()
+            await http_client.close()
+            await runner.cleanup()
+    return first, second, elapsed, served
+
+
+def test_cycle_bounded_by_slowest_feed():
+    config = {'concurrency_limit': 5, 'use_etag_cache': True, 'sources': {'source_1': False}}
+    first, second, elapsed, served = asyncio.run(_run(config))
+
+    assert sorted(item[0] for item in first) == ['source_0', 'source_2', 'source_3']
+    assert 1 not in served, "Disabled sources must not be requested"
+    assert elapsed < 2 * FEED_DELAY, f"Feeds were fetched serially ({elapsed:.2f}s)"
+    assert second == [], "Second cycle should be answered with 304s"
+    print(f"✅ Three slow feeds fetched in {elapsed:.2f}s, already posted items not returned")
+
+
+def test_concurrency_limit_and_max_age():
+    config = {'concurrency_limit': 1, 'use_etag_cache': False, 'sources': {}}
+    first, _, elapsed, _ = asyncio.run(_run(config, max_age=7 * 24 * 3600))
+
+    assert elapsed >= 4 * FEED_DELAY, f"concurrency_limit=1 was not honored ({elapsed:.2f}s)"
+    assert sorted(item[0] for item in first) == ['source_0', 'source_1', 'source_2'], first
+    print("✅ concurrency_limit honored, stale items filtered by max_age")
+
+
+if __name__ == "__main__":
+    test_cycle_bounded_by_slowest_feed()
+    test_concurrency_limit_and_max_age()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Test the local CVE mirror: record extraction, FTS5 and product lookups, updates, and syncing from an NVD stand-in (no network needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import tempfile
+import time
+from datetime import datetime, timedelta
+from aiohttp import web
+from utils.http_client import HTTPClient
+from utils.cve_mirror import CVEMirror, record_item
+from utils.nvd_sync import DATE_FORMAT
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+PRODUCTS = [('apache', 'http_server'), ('openbsd', 'openssh'), ('tukaani', 'xz'), ('microsoft', 'exchange_server')]
+
+
+def _cve(n: int, modified: datetime = NOW, status: str = 'Analyzed', description: str = None) -> dict:
+    vendor, product = PRODUCTS[n % len(PRODUCTS)]
+    return {
+        'id': f'CVE-{2020 + n % 6}-{n:05d}',
+        'published': (modified - timedelta(days=1)).strftime(DATE_FORMAT),
+        'lastModified': modified.strftime(DATE_FORMAT),
+        'vulnStatus': status,
+        'descriptions': [
+            {'lang': 'es', 'value': 'Descripción'},
+            {'lang': 'en', 'value': description or f'Race condition in {product.replace("_", " ")} allows remote attackers issue {n}'}
+        ],
+        'metrics': {
+            'cvssMetricV31': [
+                {'type': 'Secondary', 'cvssData': {'vectorString': 'CVSS:3.1/AV:L', 'baseScore': 5.0, 'baseSeverity': 'MEDIUM'}},
+                {'type': 'Primary', 'cvssData': {'vectorString': 'CVSS:3.1/AV:N/AC:L', 'baseScore': 9.8, 'baseSeverity': 'CRITICAL'}}
+            ],
+            'cvssMetricV40': [{'type': 'Primary', 'cvssData': {'vectorString': 'CVSS:4.0/AV:N', 'baseScore': 9.3, 'baseSeverity': 'CRITICAL'}}]
+        },
+        'configurations': [{'nodes': [{'cpeMatch': [
+            {'vulnerable': True, 'criteria': f'cpe:2.3:a:{vendor}:{product}:*:*:*:*:*:*:*:*'},
+            {'vulnerable': False, 'criteria': 'cpe:2.3:o:linux:linux_kernel:-:*:*:*:*:*:*:*'}
+        ]}]}],
+        'references': [{'url': f'https://example.com/{n}'}, {'url': f'https://example.com/{n}'}]
+    }
+
+
+def test_lookups_by_id_text_and_product():
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = CVEMirror(f'{tmp}/cve_mirror.db')
+        assert mirror.upsert(_cve(n) for n in range(2000)) == 2000
+
+        record = mirror.get('cve-2021-00001')
+        assert record['cvss3_score'] == 9.8 and record['cvss3_vector'] == 'CVSS:3.1/AV:N/AC:L'
+        assert record['cvss4_severity'] == 'CRITICAL'
+        assert record['cpes'] == ['cpe:2.3:a:openbsd:openssh:*:*:*:*:*:*:*:*']
+        assert record['refs'] == ['https://example.com/1'] and record['description'].startswith('Race condition in openssh')
+        assert record_item(record)['severity'] == 'CRITICAL'
+
+        # Full text (stemmed, newest CVE first) and products by CPE name or vendor
+        found = mirror.search('openssh race conditions', limit=3)
+        assert [r['id'] for r in found] == ['CVE-2025-01997', 'CVE-2025-01985', 'CVE-2025-01973']
+        # Input is never parsed as FTS5 query syntax
+        assert mirror.search('exchange "OR" NEAR(') == [] and mirror.search('*') == []
+        assert [r['id'] for r in mirror.search('exchange server', limit=1)] == ['CVE-2025-01991']
+        assert len(mirror.product('HTTP Server', limit=1000)) == 500
+        assert mirror.product('tukaani', limit=1)[0]['id'] == 'CVE-2024-01990'
+        assert mirror.product('linux_kernel') == []
+
+        start = time.perf_counter()
+        for _ in range(100):
+            mirror.search('remote attackers xz')
+            mirror.product('openssh')
+        lookup_ms = (time.perf_counter() - start) * 1000 / 200
+
+        # Updates re-index; rejected CVEs are dropped
+        mirror.upsert([_cve(1, description='Heap overflow in openssh agent forwarding')])
+        assert [r['id'] for r in mirror.search('agent forwarding')] == ['CVE-2021-00001']
+        assert 'CVE-2021-00001' not in [r['id'] for r in mirror.search('race condition', limit=2000)]
+        mirror.upsert([_cve(1, status='Rejected')])
+        assert mirror.get('CVE-2021-00001') is None and mirror.search('agent forwarding') == []
+        assert mirror.count() == 1999 and len(mirror.product('openssh', limit=1000)) == 499
+        mirror.close()
+    print(f"✅ Mirror lookups by ID, text and product take ~{lookup_ms:.2f} ms")
+
+
+def test_pages_are_stored_off_the_event_loop():
+    async def run(mirror):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        await mirror._store_page([_cve(n) for n in range(2000)])
+        elapsed = time.perf_counter() - start
+        ticker.cancel()
+        return ticks, elapsed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = CVEMirror(f'{tmp}/cve_mirror.db')
+        ticks, elapsed = asyncio.run(run(mirror))
+        assert mirror.count() == 2000
+        assert ticks >= 5, "The event loop kept running while the page was stored"
+        mirror.close()
+    print(f"✅ A 2000-CVE page is stored on a worker thread ({elapsed * 1000:.0f} ms, loop ticked {ticks} times)")
+
+
+def test_sync_and_backfill_from_nvd():
+    async def run():
+        # Two CVEs modified a day for 30 days
+        cves = [_cve(n, NOW - timedelta(hours=12 * (60 - n))) for n in range(60)]
+        requests = []
+
+        async def handle(request):
+            query = request.query
+            requests.append(query['lastModStartDate'])
+            matching = [c for c in cves if query['lastModStartDate'] <= c['lastModified'] <= query['lastModEndDate']]
+            index, size = int(query['startIndex']), int(query['resultsPerPage'])
+            return web.json_response({
+                'startIndex': index, 'totalResults': len(matching),
+                'vulnerabilities': [{'cve': c} for c in matching[index:index + size]]
+            })
+
+        app = web.Application()
+        app.router.add_get('/cves', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/cves"
+        http_client = HTTPClient()
+        session = await http_client.get_session()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                mirror = CVEMirror(f'{tmp}/cve_mirror.db')
+                await mirror.sync(session, api_key='key', url=url, now=NOW, page_size=1)
+                assert mirror.count() == 2 and len(requests) == 2  # The last day, one CVE per page
+                since = time.time()
+
+                later = NOW + timedelta(hours=6)
+                cves.append(_cve(100, later))
+                await mirror.sync(session, api_key='key', url=url, now=later)
+                assert requests[-1] == NOW.strftime(DATE_FORMAT) and mirror.count() == 3
+
+                # Only CVEs first seen since the poster's last run count as new
+                new = mirror.first_seen_between(since, time.time(), '2026-01-01T00:00:00.000')
+                assert [r['id'] for r in new] == ['CVE-2024-00100']
+
+                # Backfill the month before the first sync; the state survives a restart
+                mirror.close()
+                mirror = CVEMirror(f'{tmp}/cve_mirror.db')
+                delta = await mirror.backfill(session, 30, api_key='key', url=url)
+                assert delta.status == 'updated' and mirror.count() == 61
+                assert mirror.sync_state == {'last_mod_end': later.strftime(DATE_FORMAT)}
+                mirror.close()
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+    print("✅ Mirror syncs NVD deltas and backfills the time before its first sync")
+
+
+if __name__ == "__main__":
+    test_lookups_by_id_text_and_product()
+    test_pages_are_stored_off_the_event_loop()
+    test_sync_and_backfill_from_nvd()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test the bounded SeenCache used to skip already posted items (no network needed)"""
+import sys
+import json
+import time
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+from utils.dedup import SeenCache
+
+
+def test_size_eviction_drops_oldest():
+    """Eviction must follow insertion order, not set order."""
+    seen = SeenCache(max_size=3)
+    for n in range(5):
+        seen.add(f'CVE-2025-{n}')
+    assert list(seen) == ['CVE-2025-2', 'CVE-2025-3', 'CVE-2025-4'], list(seen)
+    assert 'CVE-2025-0' not in seen
+    print("✅ Oldest keys evicted first")
+
+
+def test_touch_refreshes_position_and_age():
+    now = time.time()
+    seen = SeenCache(max_size=2, max_age=100)
+    seen.add('a', now - 90)
+    seen.add('b', now - 50)
+    assert seen.touch('a', now)
+    assert not seen.touch('missing', now)
+    seen.add('c', now)
+    assert list(seen) == ['a', 'c'], "Touched key should survive size eviction"
+    print("✅ touch() keeps items that are still listed")
+
+
+def test_age_expiry():
+    now = time.time()
+    seen = SeenCache(max_size=10, max_age=3600)
+    seen.add('old', now - 7200)
+    seen.add('new', now)
+    assert 'old' not in seen and 'new' in seen
+    assert list(seen.to_dict()) == ['new']
+    print("✅ Expired keys dropped")
+
+
+def test_serialization_round_trip_and_legacy_list():
+    seen = SeenCache(max_size=10)
+    for key in ('x', 'y', 'z'):
+        seen.add(key)
+    restored = SeenCache.from_state(json.loads(json.dumps(seen.to_dict())), max_size=10)
+    assert list(restored) == ['x', 'y', 'z']
+
+    legacy = SeenCache.from_state(['l1', 'l2', 'l3'], max_size=2)
+    assert list(legacy) == ['l2', 'l3'], "Legacy lists keep their order"
+    assert len(SeenCache.from_state(None, max_size=5)) == 0
+    print("✅ Dict and legacy list state load")
+
+
+if __name__ == "__main__":
+    test_size_eviction_drops_oldest()
+    test_touch_refreshes_position_and_age()
+    test_age_expiry()
+    test_serialization_round_trip_and_legacy_list()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Test REST-only Discord delivery used by the standalone runners (local fake API, no network needed)"""
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import discord
+from aiohttp import web
+from utils.discord_rest import DiscordREST
+from utils.http_client import HTTPClient
+from utils.story_index import StoryIndex, post_story
+
+RETRY_AFTER = 0.3
+RESET_AFTER = 0.3
+
+
+async def _fake_discord():
+    """Serve the few endpoints the runners use, with a 429 and an exhausted bucket."""
+    received = []
+    posts = {'count': 0, 'created': 0}
+
+    async def get_channel(request):
+        if request.match_info['channel_id'] == '403':
+            return web.json_response({'message': 'Missing Access', 'code': 50001}, status=403)
+        return web.json_response({'id': request.match_info['channel_id'], 'guild_id': '42'})
+
+    async def create_message(request):
+        posts['count'] += 1
+        headers = {'X-RateLimit-Bucket': 'messages-bucket'}
+        if posts['count'] == 1:
+            return web.json_response(
+                {'message': 'You are being rate limited.', 'retry_after': RETRY_AFTER, 'global': False},
+                status=429, headers=headers
+            )
+        posts['created'] += 1
+        received.append((time.perf_counter(), request.headers.get('Authorization'), await request.json()))
+        # Second created message empties the bucket
+        remaining = '0' if posts['created'] == 2 else '5'
+        headers.update({'X-RateLimit-Remaining': remaining, 'X-RateLimit-Reset-After': str(RESET_AFTER)})
+        return web.json_response({'id': str(1000 + posts['created'])}, headers=headers)
+
+    async def get_webhook(request):
+        return web.json_response({'id': '5', 'channel_id': '7', 'guild_id': '42'})
+
+    async def execute_webhook(request):
+        received.append((time.perf_counter(), request.headers.get('Authorization'), await request.json()))
+        assert request.query.get('wait') == 'true'
+        return web.json_response({'id': '2000', 'channel_id': '7'})
+
+    app = web.Application()
+    app.router.add_get('/channels/{channel_id}', get_channel)
+    app.router.add_post('/channels/{channel_id}/messages', create_message)
+    app.router.add_get('/webhooks/5/token', get_webhook)
+    app.router.add_post('/webhooks/5/token', execute_webhook)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}', received
+
+
+def test_channel_post_with_rate_limits():
+    async def run():
+        runner, base, received = await _fake_discord()
+        http_client = HTTPClient()
+        rest = DiscordREST('secret-token', http_client=http_client, api_base=base)
+        try:
+            channel = rest.channel(123)
+            started = time.perf_counter()
+            for n in range(3):
+                message = await channel.send(embed=discord.Embed(title=f"Story {n}"))
+            try:
+                await rest.channel(403).send(embed=discord.Embed(title="Nope"))
+                forbidden = False
+            except discord.Forbidden:
+                forbidden = True
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+        return started, received, message, forbidden
+
+    started, received, message, forbidden = asyncio.run(run())
+
+    assert [body['embeds'][0]['title'] for _, _, body in received] == ['Story 0', 'Story 1', 'Story 2']
+    assert all(auth == 'Bot secret-token' for _, auth, _ in received)
+    assert received[0][0] - started >= RETRY_AFTER, "429 retry_after was not honored"
+    assert received[2][0] - received[1][0] >= RESET_AFTER * 0.9, "Exhausted bucket was not waited out"
+    assert message.jump_url == 'https://discord.com/channels/42/123/1003'
+    assert forbidden, "403 should raise discord.Forbidden"
+    print("✅ Channel posts retry 429s, wait out exhausted buckets and raise discord errors")
+
+
+def test_webhook_and_post_story():
+    async def run(tmp):
+        runner, base, received = await _fake_discord()
+        http_client = HTTPClient()
+        index = StoryIndex(f'{tmp}/story_index.db')
+        try:
+            webhook = DiscordREST(http_client=http_client).webhook(f'{base}/webhooks/5/token')
+            message = await webhook.send(embed=discord.Embed(title="Hooked"))
+
+            # Bot-token channel: a near-duplicate becomes a reply to the first post
+            channel = DiscordREST('t', http_client=http_client, api_base=base).channel(7)
+            first = discord.Embed(title="Big vendor patches zero-day")
+            await post_story(channel, first, index, "Big vendor patches zero-day", '', 'https://a/1', 'tech', 'A', 'thread')
+            dup = discord.Embed(title="Big vendor patches zero-day!")
+            await post_story(channel, dup, index, "Big vendor patches zero-day!", '', 'https://b/1', 'tech', 'B', 'thread')
+        finally:
+            index.close()
+            await http_client.close()
+            await runner.cleanup()
+        return received, message
+
+    with tempfile.TemporaryDirectory() as tmp:
+        received, message = asyncio.run(run(tmp))
+
+    webhook_auth, webhook_body = received[0][1], received[0][2]
+    assert webhook_auth is None, "Webhooks must not send the bot token"
+    assert webhook_body['embeds'][0]['title'] == 'Hooked'
+    assert message.channel.id == 7 and message.id == 2000
+
+    original, reply = received[1][2], received[2][2]
+    assert 'message_reference' not in original
+    assert reply['message_reference']['message_id'] == 1001
+    assert reply['allowed_mentions']['replied_user'] is False
+    print("✅ Webhook delivery and post_story replies over REST")
+
+
+if __name__ == "__main__":
+    test_channel_post_with_rate_limits()
+    test_webhook_and_post_story()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test multi-embed batching of news posts (no network or Discord connection needed)"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import discord
+from utils.embed_batch import pack_embeds, send_embeds, MAX_EMBEDS_PER_MESSAGE, MAX_EMBED_CHARS
+from utils.story_index import StoryIndex, post_stories
+
+
+class _Message:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+        self.jump_url = f"https://discord.com/channels/1/{channel.id}/{message_id}"
+
+
+class _Channel:
+    """Records every send; optionally fails the nth call."""
+
+    def __init__(self, fail_on=None):
+        self.id = 99
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def send(self, embed=None, embeds=None, reference=None, mention_author=False):
+        self.calls.append({'embeds': embeds or [embed], 'reference': reference})
+        if len(self.calls) == self.fail_on:
+            raise RuntimeError("HTTP 500")
+        return _Message(self, 1000 + len(self.calls))
+
+
+def test_pack_limits():
+    small = [discord.Embed(title=f"Story {n}", description="x" * 100) for n in range(23)]
+    batches = pack_embeds(small)
+    assert [len(b) for b in batches] == [10, 10, 3]
+
+    big = [discord.Embed(title="Long", description="y" * 2500) for _ in range(5)]
+    batches = pack_embeds(big)
+    assert all(sum(len(e) for e in b) <= MAX_EMBED_CHARS for b in batches)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+    huge = discord.Embed(title="Huge", description="z" * 4000)
+    for field in range(3):
+        huge.add_field(name="f", value="v" * 1000)
+    assert [len(b) for b in pack_embeds([huge, small[0]])] == [1, 1], "Oversized embed goes alone"
+    print(f"✅ Batches respect {MAX_EMBEDS_PER_MESSAGE} embeds and {MAX_EMBED_CHARS} characters")
+
+
+def test_send_embeds_partial_failure():
+    channel = _Channel(fail_on=2)
+    embeds = [discord.Embed(title=f"Story {n}") for n in range(25)]
+    messages = asyncio.run(send_embeds(channel, embeds))
+
+    assert len(channel.calls) == 3, "25 small embeds should take 3 messages"
+    assert messages[:10] == [messages[0]] * 10 and messages[0].id == 1001
+    assert messages[10:20] == [None] * 10, "Failed message is reported per embed"
+    assert messages[20].id == 1003
+
+    unbatched = _Channel()
+    asyncio.run(send_embeds(unbatched, embeds[:3], batch=False))
+    assert len(unbatched.calls) == 3
+    print("✅ send_embeds batches, reports failed embeds and honors batch=False")
+
+
+def test_post_stories_with_index():
+    def story(title, link):
+        return (discord.Embed(title=title), title, '', link, 'Source')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StoryIndex(f'{tmp}/story_index.db')
+        channel = _Channel()
+        stories = [
+            story("Vendor patches critical zero-day in VPN appliance", 'https://a/1'),
+            story("Rust 2.0 released with new borrow checker", 'https://a/2'),
+            story("Vendor patches critical zero-day in VPN appliance!", 'https://b/1'),  # same batch dup
+        ]
+        results = asyncio.run(post_stories(channel, stories, index, 'tech', 'suppress'))
+        assert len(channel.calls) == 1 and len(channel.calls[0]['embeds']) == 2
+        assert results[0].id == results[1].id == 1001 and results[2] is None
+        assert index.find_duplicate("Rust 2.0 released with new borrow checker")['message_id'] == 1001
+
+        # Thread mode: a duplicate of an earlier post is sent alone as a reply, in order
+        threaded = [
+            story("Kernel 7.1 brings faster scheduler", 'https://c/1'),
+            story("Vendor patches critical zero-day in VPN appliance today", 'https://c/2'),
+            story("Browser ships new sandbox", 'https://c/3'),
+        ]
+        results = asyncio.run(post_stories(channel, threaded, index, 'tech', 'thread'))
+        assert [len(c['embeds']) for c in channel.calls[1:]] == [1, 1, 1]
+        assert channel.calls[2]['reference'].message_id == 1001
+
+        # A failed send leaves nothing behind in the index, so the story can be posted later
+        failing = _Channel(fail_on=1)
+        results = asyncio.run(post_stories(failing, [story("Unique failed story here", 'https://d/1')], index, 'tech'))
+        assert results == [False]
+        assert index.find_duplicate("Unique failed story here") is None
+        index.close()
+    print("✅ post_stories batches, dedups within a batch, threads replies and rolls back failures")
+
+
+if __name__ == "__main__":
+    test_pack_limits()
+    test_send_embeds_partial_failure()
+    test_post_stories_with_index()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test the JSON and SQLite feed cache backends (no network needed)"""
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+from utils.feed_cache import (
+    JSONFeedCache, SQLiteFeedCache, GUID_HISTORY_SIZE, open_feed_cache
+)
+
+URL = 'https://example.com/feed'
+
+
+def _exercise(cache):
+    """Run the same operations against a backend and check the results."""
+    assert cache.get_validators(URL) == (None, None)
+    cache.set_validators(URL, '"abc"', None)
+    cache.set_validators(URL, None, 'Sun, 9 Nov 2025 15:35:29 GMT')
+    assert tuple(cache.get_validators(URL)) == ('"abc"', 'Sun, 9 Nov 2025 15:35:29 GMT')
+
+    assert not cache.has_guids(URL)
+    for n in range(GUID_HISTORY_SIZE + 5):
+        cache.add_guid(URL, f'guid-{n}')
+    cache.save()
+    assert cache.has_guids(URL)
+    assert cache.is_seen(URL, f'guid-{GUID_HISTORY_SIZE + 4}')
+    assert not cache.is_seen(URL, 'guid-0'), "Oldest GUIDs should be trimmed"
+
+    cache.set_schedule(URL, {'next_poll': 123})
+    assert cache.get_schedule(URL) == {'next_poll': 123}
+
+    cache.set_health(URL, {'failures': 3, 'open_until': 456})
+    assert cache.all_health() == {URL: {'failures': 3, 'open_until': 456}}
+    cache.set_health(URL, None)
+    assert cache.get_health(URL) is None
+
+    cache.set_metrics(URL, {'requests': 2})
+    assert cache.get_metrics(URL) == {'requests': 2}
+    assert cache.all_metrics() == {URL: {'requests': 2}}
+    cache.close()
+
+
+def test_json_backend():
+    with tempfile.TemporaryDirectory() as tmp:
+        _exercise(JSONFeedCache(f'{tmp}/cache.json'))
+        reopened = JSONFeedCache(f'{tmp}/cache.json')
+        assert reopened.get_schedule(URL) == {'next_poll': 123}
+    print("✅ JSON feed cache backend")
+
+
+def test_sqlite_backend():
+    with tempfile.TemporaryDirectory() as tmp:
+        _exercise(SQLiteFeedCache(f'{tmp}/cache.db'))
+        conn = sqlite3.connect(f'{tmp}/cache.db')
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        count = conn.execute('SELECT COUNT(*) FROM seen_guids WHERE url = ?', (URL,)).fetchone()[0]
+        assert count == GUID_HISTORY_SIZE, count
+        conn.close()
+    print("✅ SQLite feed cache backend")
+
+
+def test_sqlite_shared_between_processes():
+    """The bot and the news runner write the same category cache without waiting on each other."""
+    with tempfile.TemporaryDirectory() as tmp:
+        bot = SQLiteFeedCache(f'{tmp}/feed_cache_tech.db')
+        runner = SQLiteFeedCache(f'{tmp}/feed_cache_tech.db')
+        runner.conn.execute('PRAGMA busy_timeout = 0')
+
+        # Writes mid-cycle (before save) hold no lock
+        bot.add_guid(URL, 'from-bot')
+        bot.set_schedule(URL, {'next_poll': 1})
+        runner.add_guid(URL, 'from-runner')
+        runner.set_health(URL, {'failures': 1})
+        assert runner.is_seen(URL, 'from-bot') and bot.is_seen(URL, 'from-runner')
+
+        bot.save()
+        runner.save()
+        assert not bot.conn.in_transaction and not runner.conn.in_transaction
+        bot.close()
+        runner.close()
+    print("✅ SQLite feed cache shared by two processes without lock waits")
+
+
+def test_sqlite_imports_legacy_json():
+    """A new .db cache should import an existing JSON cache with the same name."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(f'{tmp}/feed_cache_tech.json', 'w') as f:
+            json.dump({
+                'etags': {URL: '"e1"'},
+                'last_modified': {},
+                'last_guids': {URL: ['old-1', 'old-2']}
+            }, f)
+
+        cache = open_feed_cache(f'{tmp}/feed_cache_tech.db')
+        assert isinstance(cache, SQLiteFeedCache)
+        assert tuple(cache.get_validators(URL)) == ('"e1"', None)
+        assert cache.is_seen(URL, 'old-2')
+        cache.close()
+    print("✅ Legacy JSON cache imported into SQLite")
+
+
+if __name__ == "__main__":
+    test_json_backend()
+    test_sqlite_backend()
+    test_sqlite_shared_between_processes()
+    test_sqlite_imports_legacy_json()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test the streaming and batch feed parsing in OptimizedNewsFetcher against the regex parser"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from aiohttp import web
+from utils.news_fetcher import OptimizedNewsFetcher
+from utils.http_client import HTTPClient
+
+RSS_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+<channel>
+<title>Test Feed</title>
+<link>https://example.com/</link>
+{items}
+</channel>
+</rss>
+"""
+
+RSS_ITEM = """<item>
+<title><![CDATA[Story {n} &amp; more]]></title>
+<link>https://example.com/story-{n}</link>
+<guid isPermaLink="false">story-{n}</guid>
+<media:content url="https://example.com/{n}.jpg" />
+<description><![CDATA[<p>Body of <b>story {n}</b>.</p>]]></description>
+</item>"""
+
+ATOM_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Atom Test</title>
+<entry>
+<title>Atom entry</title>
+<link rel="alternate" href="https://example.com/atom-1"/>
+<id>tag:example.com,2025:1</id>
+<summary>Summary &lt;i&gt;text&lt;/i&gt;</summary>
+</entry>
+</feed>
+"""
+
+# Undefined entity makes this invalid XML - must fall back to the regex parser
+BROKEN_FEED = RSS_FEED.format(items=RSS_ITEM.format(n=1).replace('Body of', 'Body&nbsp;of'))
+
+
+async def _run_fetch(body, streaming: bool, runs: int = 1, batch: bool = False):
+    """Serve a feed body (or one body per run) locally and fetch it with the optimized fetcher."""
+    bodies = body if isinstance(body, list) else [body] * runs
+    served = []
+
+    async def handler(request):
+        served.append(request)
+        return web.Response(text=bodies[len(served) - 1], content_type='application/rss+xml')
+
+    app = web.Application()
+    app.router.add_get('/feed', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        http_client = HTTPClient()
+        fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db', http_client=http_client)
+        fetcher.set_streaming_parse(streaming)
+        results = []
+        try:
+            for _ in range(len(bodies)):
+                results.append(await fetcher.fetch_feed_optimized(
+                    f'http://127.0.0.1:{port}/feed', 'Test', use_cache=False, batch=batch
+                ))
+        finally:
+            await fetcher.close()
+            await http_client.close()
+            await runner.cleanup()
+    return results
+
+
+def test_streaming_matches_regex():
+    """Streaming and regex parsers should return the same items."""
+    body = RSS_FEED.format(items='\n'.join(RSS_ITEM.format(n=n) for n in range(3)))
+    streamed = asyncio.run(_run_fetch(body, streaming=True, runs=2))
+    regex = asyncio.run(_run_fetch(body, streaming=False, runs=2))
+
+    assert streamed == regex, f"{streamed} != {regex}"
+    title, link, description, guid = streamed[0]
+    assert title == 'Story 0 & more'
+    assert link == 'https://example.com/story-0'
+    assert description == 'Body of story 0.'
+    assert guid == 'story-0'
+    assert streamed[1][3] == 'story-1', "Second run should return the next unseen item"
+    print("✅ Streaming parser matches regex parser")
+
+
+def test_streaming_atom():
+    """Atom entries should use href links and <id> GUIDs."""
+    result = asyncio.run(_run_fetch(ATOM_FEED, streaming=True))[0]
+    assert result == ('Atom entry', 'https://example.com/atom-1', 'Summary text', 'tag:example.com,2025:1'), result
+    print("✅ Atom feed parsed")
+
+
+def test_streaming_fallback_on_invalid_xml():
+    """Invalid XML should fall back to the regex parser."""
+    result = asyncio.run(_run_fetch(BROKEN_FEED, streaming=True))[0]
+    assert result is not None and result[3] == 'story-1', result
+    print("✅ Regex fallback used for invalid XML")
+
+
+def test_batch_returns_all_unseen_items():
+    """Batch mode should return every item newer than the last posted one."""
+    first = RSS_FEED.format(items=RSS_ITEM.format(n=0))
+    second = RSS_FEED.format(items='\n'.join(RSS_ITEM.format(n=n) for n in (3, 2, 1, 0)))
+    for streaming in (True, False):
+        results = asyncio.run(_run_fetch([first, second, second], streaming=streaming, batch=True))
+        assert [i[3] for i in results[0]] == ['story-0']
+        assert [i[3] for i in results[1]] == ['story-3', 'story-2', 'story-1'], results[1]
+        assert results[2] == []
+    print("✅ Batch mode drains all unseen items in one fetch")
+
+
+def test_batch_first_poll_returns_newest_only():
+    """A feed with no GUID history should not flood the channel."""
+    body = RSS_FEED.format(items='\n'.join(RSS_ITEM.format(n=n) for n in range(4)))
+    results = asyncio.run(_run_fetch(body, streaming=True, batch=True))
+    assert [i[3] for i in results[0]] == ['story-0'], results[0]
+    print("✅ First poll in batch mode returns only the newest item")
+
+
+if __name__ == "__main__":
+    test_streaming_matches_regex()
+    test_streaming_atom()
+    test_streaming_fallback_on_invalid_xml()
+    test_batch_returns_all_unseen_items()
+    test_batch_first_poll_returns_newest_only()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test per-source fetch telemetry in OptimizedNewsFetcher (no network needed)"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from aiohttp import web
+from utils.news_fetcher import OptimizedNewsFetcher
+from utils.http_client import HTTPClient
+from utils.feed_cache import open_feed_cache
+from utils.fetch_metrics import FetchMetrics, summarize, LATENCY_BUCKETS_MS
+
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>Story</title><link>https://example.com/1</link><guid>story-1</guid></item>
+</channel></rss>"""
+
+
+class _MemoryCache:
+    """Just the metrics part of the feed cache interface."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def get_metrics(self, url):
+        return self.metrics.get(url)
+
+    def set_metrics(self, url, stats):
+        self.metrics[url] = stats
+
+
+def test_histograms_and_summary():
+    metrics = FetchMetrics()
+    for latency in (0.02, 0.04, 0.2, 0.3, 20.0):
+        metrics.record('u', '200', latency, ttfb=latency / 2, size=1000, parse_time=0.002, items=1)
+    metrics.record('u', '304', 0.03, ttfb=0.03)
+    metrics.record('u', 'timeout', 10.0)
+
+    cache = _MemoryCache()
+    metrics.flush(cache)
+    stats = summarize(cache.get_metrics('u'))
+    assert stats['requests'] == 7
+    assert stats['status'] == {'200': 5, '304': 1, 'timeout': 1}
+    assert stats['not_modified_ratio'] == round(1 / 6, 3)
+    assert stats['error_ratio'] == round(1 / 7, 3)
+    assert stats['latency_p50_ms'] == 250
+    assert stats['latency_p95_ms'] == LATENCY_BUCKETS_MS[-1], "Overflow reports the last bound"
+    assert stats['parse_p95_ms'] == 5
+    assert stats['items'] == 5 and stats['avg_bytes'] == 833
+
+    # A second flush accumulates rather than replaces
+    metrics.record('u', '200', 0.1)
+    metrics.flush(cache)
+    assert cache.get_metrics('u')['requests'] == 8
+    assert sum(cache.get_metrics('u')['latency_ms']) == 8
+    print("✅ Histograms, percentiles and flush accumulation")
+
+
+def test_fetcher_records_and_persists_metrics():
+    async def run(tmp):
+        async def handler(request):
+            if request.headers.get('If-None-Match') == '"v1"':
+                return web.Response(status=304)
+            return web.Response(text=FEED, headers={'ETag': '"v1"'})
+
+        app = web.Application()
+        app.router.add_get('/feed', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        url = f'http://127.0.0.1:{port}/feed'
+
+        http_client = HTTPClient()
+        fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db', http_client=http_client)
+        try:
+            sources = {'local': {'name': 'Local', 'url': url}}
+            await fetcher.fetch_multiple_feeds(sources, ['local'])
+            await fetcher.fetch_multiple_feeds(sources, ['local'])
+        finally:
+            await fetcher.close()
+            await http_client.close()
+            await runner.cleanup()
+        return url
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = asyncio.run(run(tmp))
+        cache = open_feed_cache(f'{tmp}/cache.db')
+        stats = summarize(cache.all_metrics()[url])
+        cache.close()
+
+    assert stats['requests'] == 2
+    assert stats['status'] == {'200': 1, '304': 1}
+    assert stats['not_modified_ratio'] == 0.5
+    assert stats['items'] == 1
+    assert stats['bytes'] == len(FEED)
+    assert stats['ttfb_p50_ms'] is not None and stats['parse_p95_ms'] is not None
+    print("✅ Fetcher records metrics and persists them in the feed cache")
+
+
+if __name__ == "__main__":
+    test_histograms_and_summary()
+    test_fetcher_records_and_persists_metrics()
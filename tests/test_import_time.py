@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark for the bot and the standalone runners.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`
+(best of a few runs). Running this file prints the total and the slowest
+top-level imports per entry point; under pytest it fails if an entry point
+exceeds its budget in tests/import_budget.json, or imports a secrets backend
+SDK while no secrets manager is configured.
+
+Budgets are wall-clock milliseconds for a typical dev machine. On slower CI
+hosts scale them with IMPORT_BUDGET_SCALE (e.g. 2.0).
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+package_dir = project_root / "penguin-overlord"
+BUDGET_FILE = Path(__file__).parent / "import_budget.json"
+REPEAT = 3
+
+
+def _load_budget() -> dict:
+    with open(BUDGET_FILE) as f:
+        return json.load(f)
+
+
+def measure(module: str, repeat: int = REPEAT) -> dict:
+    """
+    Import module in fresh interpreters and return the fastest run.
+
+    Returns:
+        {'total_ms': float, 'imports': {top-level import: cumulative ms}, 'loaded': set of module names}
+    """
+    env = dict(os.environ)
+    # Measure the plain .env setup: no secrets manager configured
+    env.pop('DOPPLER_TOKEN', None)
+    env['SECRETS_MANAGER'] = 'none'
+    env['PYTHONPATH'] = os.pathsep.join([str(package_dir), str(project_root)])
+
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=package_dir, env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+        imports = {}
+        loaded = set()
+        total = None
+        children = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            name = name.strip()
+            loaded.add(name)
+            if depth == 1:
+                children.append((name, int(cumulative) / 1000))
+            elif depth == 0:
+                if name == module:
+                    total = int(cumulative) / 1000
+                    imports = dict(children)
+                children = []
+
+        run = {'total_ms': total, 'imports': imports, 'loaded': loaded}
+        if best is None or run['total_ms'] < best['total_ms']:
+            best = run
+    return best
+
+
+def test_import_budgets():
+    budget = _load_budget()
+    scale = float(os.getenv('IMPORT_BUDGET_SCALE', '1.0'))
+    failures = []
+
+    for module, limit in budget['entry_points'].items():
+        result = measure(module)
+        forbidden = sorted(set(budget['forbidden']) & result['loaded'])
+        if forbidden:
+            failures.append(f"{module} imports {', '.join(forbidden)} with no secrets manager configured")
+        if result['total_ms'] > limit * scale:
+            slowest = sorted(result['imports'].items(), key=lambda item: -item[1])[:3]
+            failures.append(
+                f"{module} took {result['total_ms']:.0f}ms to import (budget {limit * scale:.0f}ms); "
+                f"slowest: {', '.join(f'{name} {ms:.0f}ms' for name, ms in slowest)}"
+            )
+
+    assert not failures, "\n".join(failures)
+    print(f"✅ {len(budget['entry_points'])} entry points within their import budgets")
+
+
+def report(top: int = 8):
+    """Print import times per entry point."""
+    budget = _load_budget()
+    for module, limit in budget['entry_points'].items():
+        result = measure(module)
+        print(f"\n{module}: {result['total_ms']:.0f}ms (budget {limit}ms)")
+        for name, ms in sorted(result['imports'].items(), key=lambda item: -item[1])[:top]:
+            print(f"  {ms:8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    report()
+    test_import_budgets()
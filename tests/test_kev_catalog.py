@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Test incremental KEV catalog ingestion and the local catalog index: conditional GET, streaming decode, deltas and lookups (no network needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from aiohttp import web
+from utils.http_client import HTTPClient
+from utils.kev_catalog import KEVIndex, KEVStreamDecoder, fetch_kev_delta, FIRST_RUN_LIMIT
+
+
+def _entry(n: int, day: date) -> dict:
+    return {
+        'cveID': f'CVE-2026-{n:05d}',
+        'vendorProject': 'Vendor' if n % 100 else 'Acme Corp', 'product': f'Product {n}',
+        'vulnerabilityName': f'Vulnerability {n} "quoted" ünïcode',
+        'dateAdded': day.isoformat(), 'dueDate': (day + timedelta(days=21)).isoformat(),
+        'shortDescription': 'x' * 400, 'requiredAction': 'Apply updates.', 'notes': ''
+    }
+
+
+class _Catalog:
+    """Newest-first catalog of 1500 entries, two per day, served with an ETag."""
+
+    def __init__(self):
+        self.entries = [_entry(n, date(2024, 1, 1) + timedelta(days=n // 2)) for n in range(1500)][::-1]
+        self.version = '2026.01.01'
+        self.requests = []
+
+    def add(self, *numbers):
+        day = date.fromisoformat(self.entries[0]['dateAdded'])
+        self.entries = [_entry(n, day) for n in numbers] + self.entries
+        self.version += '.1'
+
+    def body(self) -> bytes:
+        return json.dumps({
+            'title': 'CISA Catalog of Known Exploited Vulnerabilities',
+            'catalogVersion': self.version,
+            'dateReleased': '2026-01-01T12:00:00.000Z',
+            'count': len(self.entries),
+            'vulnerabilities': self.entries
+        }, indent=2).encode()
+
+    async def handle(self, request):
+        etag = f'"{self.version}"'
+        self.requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == etag:
+            return web.Response(status=304)
+        return web.Response(body=self.body(), content_type='application/json', headers={'ETag': etag})
+
+
+async def _serve(catalog):
+    app = web.Application()
+    app.router.add_get('/kev.json', catalog.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/kev.json"
+
+
+def test_stream_decoder_handles_any_chunking():
+    catalog = _Catalog()
+    body = catalog.body()
+    for size in (1, 7, 4096):
+        decoder = KEVStreamDecoder()
+        entries = []
+        for start in range(0, len(body), size):
+            entries.extend(decoder.feed(body[start:start + size]))
+        entries.extend(decoder.feed(b'', final=True))
+        assert decoder.done and entries == catalog.entries, size
+        assert decoder.header['catalogVersion'] == catalog.version
+    print("✅ Stream decoder yields every entry whatever the chunk boundaries")
+
+
+def test_polls_fetch_only_the_delta():
+    async def run():
+        catalog = _Catalog()
+        runner, url = await _serve(catalog)
+        http_client = HTTPClient()
+        session = await http_client.get_session()
+        total = len(catalog.body())
+        try:
+            first = await fetch_kev_delta(session, None, url=url)
+            assert first.status == 'updated' and len(first.entries) == FIRST_RUN_LIMIT
+            assert first.entries == catalog.entries[:FIRST_RUN_LIMIT]
+            assert first.bytes_read < total / 10, (first.bytes_read, total)
+
+            again = await fetch_kev_delta(session, first.feed_state, url=url)
+            assert again.status == 'not_modified' and again.entries == [] and again.bytes_read == 0
+            assert catalog.requests[-1] == f'"{catalog.version}"'
+
+            # Three entries added on the newest day: only they are returned,
+            # and reading stops right after them
+            catalog.add(9001, 9002, 9003)
+            delta = await fetch_kev_delta(session, again.feed_state, url=url)
+            assert delta.status == 'updated'
+            assert [e['cveID'] for e in delta.entries] == ['CVE-2026-09001', 'CVE-2026-09002', 'CVE-2026-09003']
+            assert delta.bytes_read < total / 10
+            assert delta.feed_state['catalog_version'] == catalog.version
+
+            # Same version served again without validators (e.g. a cache ignoring them)
+            state = dict(delta.feed_state, etag=None)
+            unchanged = await fetch_kev_delta(session, state, url=url)
+            assert unchanged.status == 'unchanged' and unchanged.entries == []
+
+            # Nothing new is found twice
+            catalog.version += '.2'  # e.g. notes of an old entry edited
+            edited = await fetch_kev_delta(session, delta.feed_state, url=url)
+            assert edited.status == 'updated' and edited.entries == []
+            return first.bytes_read, delta.bytes_read, total
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+    first_read, delta_read, total = asyncio.run(run())
+    print(f"✅ First poll read {first_read / 1024:.0f} KB, delta poll {delta_read / 1024:.0f} KB of {total / 1024:.0f} KB; unchanged polls are 304s")
+
+
+def test_index_answers_locally_and_stays_current():
+    async def run():
+        catalog = _Catalog()
+        runner, url = await _serve(catalog)
+        http_client = HTTPClient()
+        session = await http_client.get_session()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                index = KEVIndex(f'{tmp}/kev_catalog.json', url=url)
+                new = await index.refresh(session)
+                assert len(new) == len(index.entries) == 1500
+
+                # Lookups by CVE ID, vendor, product, keywords and due date
+                assert index.search('cve-2026-00042')[0]['product'] == 'Product 42'
+                acme = index.vendor('acme')
+                assert [v['cveID'] for v in acme[:2]] == ['CVE-2026-01400', 'CVE-2026-01300'] and len(acme) == 15
+                assert [v['cveID'] for v in index.product('product 7')] == ['CVE-2026-00007']
+                assert index.product('produ')[0]['cveID'] == 'CVE-2026-01499'
+                assert [v['cveID'] for v in index.search('Acme product 1200')] == ['CVE-2026-01200']
+                assert index.search('no such product') == []
+                due = index.due_soon(3, today=date(2024, 1, 22))
+                assert [v['cveID'] for v in due] == [f'CVE-2026-{n:05d}' for n in range(8)]
+
+                start = time.perf_counter()
+                for _ in range(1000):
+                    index.search('vendor product 1234')
+                lookup_us = (time.perf_counter() - start) * 1000
+
+                # Delta refresh: only the new entries come back; a stored copy reloads
+                catalog.add(9001)
+                requests = len(catalog.requests)
+                assert [v['cveID'] for v in await index.refresh(session)] == ['CVE-2026-09001']
+                assert await index.refresh(session) == [] and len(catalog.requests) == requests + 2
+                assert [v['cveID'] for v in index.latest(2)] == ['CVE-2026-09001', 'CVE-2026-01499']
+                reloaded = KEVIndex(index.path, url=url)
+                await reloaded.load()
+                assert len(reloaded.entries) == 1501 and reloaded.get('CVE-2026-09001')
+
+                # The daily full re-read picks up edits and removals
+                catalog.entries = [dict(v, dueDate='2030-01-01') if v['cveID'] == 'CVE-2026-00000' else v
+                                   for v in catalog.entries if v['cveID'] != 'CVE-2026-00001']
+                catalog.version += '.2'
+                assert await reloaded.refresh(session, force_full=True) == []
+                assert reloaded.get('CVE-2026-00001') is None and len(reloaded.entries) == 1500
+                assert [v['cveID'] for v in reloaded.due_soon(1, today=date(2030, 1, 1))] == ['CVE-2026-00000']
+                return lookup_us
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+    lookup_us = asyncio.run(run())
+    print(f"✅ Local KEV index answers searches in ~{lookup_us:.0f} µs and refreshes incrementally")
+
+
+if __name__ == "__main__":
+    test_stream_decoder_handles_any_chunking()
+    test_polls_fetch_only_the_delta()
+    test_index_answers_locally_and_stays_current()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Test multi-category options of the standalone news runner (no network needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import argparse
+from datetime import datetime, timezone
+from news_runner import StandaloneNewsRunner, CATEGORIES, parse_categories
+
+
+def _at(hour, minute):
+    return datetime(2026, 3, 2, hour, minute, tzinfo=timezone.utc).timestamp()
+
+
+def test_parse_categories():
+    assert parse_categories('all') == CATEGORIES
+    assert parse_categories('tech') == ['tech']
+    assert parse_categories('tech, gaming,tech') == ['tech', 'gaming']
+    for bad in ('tech,bogus', ',', 'everything'):
+        try:
+            parse_categories(bad)
+        except argparse.ArgumentTypeError:
+            continue
+        raise AssertionError(f"{bad!r} should be rejected")
+    print("✅ --category accepts one category, a list or 'all'")
+
+
+def test_is_due_follows_configured_slots():
+    # Built without __init__ so no cache or config files are touched
+    runner = StandaloneNewsRunner.__new__(StandaloneNewsRunner)
+    runner.category_config = {'interval_hours': 3, 'minute_offset': 15}
+
+    assert runner.is_due(None, now=_at(10, 0)), "Never run before"
+    # Slots at 00:15, 03:15, 06:15, 09:15, ...
+    assert not runner.is_due(_at(9, 20), now=_at(10, 0))
+    assert not runner.is_due(_at(9, 20), now=_at(12, 14))
+    assert runner.is_due(_at(9, 20), now=_at(12, 15))
+    assert runner.is_due(_at(3, 0), now=_at(10, 0)), "Missed slots run once"
+    print("✅ Categories are due once their interval_hours/minute_offset slot passes")
+
+
+if __name__ == "__main__":
+    test_parse_categories()
+    test_is_due_follows_configured_slots()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Test NVD delta polling: lastModified windows, pagination, rate pacing and the newest-published tail read (no network needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from aiohttp import web
+from utils.http_client import HTTPClient
+from utils import nvd_sync
+from utils.nvd_sync import NVDRateLimiter, DATE_FORMAT, fetch_nvd_delta, fetch_nvd_latest, nvd_item
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def _cve(n: int, published: datetime, modified: datetime) -> dict:
+    return {'cve': {
+        'id': f'CVE-2026-{n:05d}',
+        'published': published.strftime(DATE_FORMAT),
+        'lastModified': modified.strftime(DATE_FORMAT),
+        'vulnStatus': 'Received',
+        'descriptions': [{'lang': 'en', 'value': f'Issue {n}'}],
+        'metrics': {'cvssMetricV40': [{'cvssData': {'baseSeverity': 'HIGH'}}]}
+    }}
+
+
+class _NVD:
+    """CVE API 2.0 stand-in: filters on the date ranges, pages oldest first."""
+
+    def __init__(self):
+        # One CVE a minute over the last 3 days
+        self.cves = [_cve(n, NOW - timedelta(minutes=4320 - n), NOW - timedelta(minutes=4320 - n)) for n in range(4320)]
+        self.requests = []
+        self.throttle = 0
+
+    async def handle(self, request):
+        query = request.query
+        self.requests.append(dict(query, apiKey=request.headers.get('apiKey')))
+        if self.throttle:
+            self.throttle -= 1
+            return web.Response(status=403)
+
+        field, start, end = 'lastModified', query.get('lastModStartDate'), query.get('lastModEndDate')
+        if 'pubStartDate' in query:
+            field, start, end = 'published', query['pubStartDate'], query['pubEndDate']
+        assert datetime.strptime(end, DATE_FORMAT) - datetime.strptime(start, DATE_FORMAT) <= timedelta(days=120)
+        matching = [c for c in self.cves if start <= c['cve'][field] <= end]
+        index, size = int(query['startIndex']), int(query['resultsPerPage'])
+        return web.json_response({
+            'resultsPerPage': size, 'startIndex': index, 'totalResults': len(matching),
+            'vulnerabilities': matching[index:index + size]
+        })
+
+
+async def _serve(nvd):
+    app = web.Application()
+    app.router.add_get('/cves', nvd.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/cves"
+
+
+def test_delta_pages_through_the_changed_window():
+    async def run():
+        nvd = _NVD()
+        runner, url = await _serve(nvd)
+        http_client = HTTPClient()
+        session = await http_client.get_session()
+        try:
+            # First sync: the last day, in pages of 500
+            first = await fetch_nvd_delta(session, url=url, now=NOW, page_size=500, api_key='key')
+            assert first.status == 'updated' and len(first.vulnerabilities) == 1440
+            assert first.requests == 3 and all(r['apiKey'] == 'key' for r in nvd.requests)
+            assert first.sync_state == {'last_mod_end': NOW.strftime(DATE_FORMAT)}
+
+            # Next poll: only what changed since, including an old CVE edited
+            later = NOW + timedelta(minutes=30)
+            nvd.cves.append(_cve(9001, later, later))
+            nvd.cves[0] = _cve(0, NOW - timedelta(days=3), later)
+            requests = len(nvd.requests)
+            delta = await fetch_nvd_delta(session, first.sync_state, url=url, now=later, page_size=500, api_key='key')
+            assert len(nvd.requests) == requests + 1
+            assert nvd.requests[-1]['lastModStartDate'] == NOW.strftime(DATE_FORMAT)
+            assert {c['id'] for c in delta.vulnerabilities} == {'CVE-2026-09001', 'CVE-2026-00000'}
+            assert delta.bytes_read < first.bytes_read / 100
+
+            # A long outage is split into windows NVD accepts
+            outage = await fetch_nvd_delta(session, {'last_mod_end': '2025-06-01T00:00:00.000'}, url=url, now=NOW, api_key='key')
+            assert outage.status == 'updated' and len(outage.vulnerabilities) == 4319 and outage.requests == 5
+
+            # Rate-limited answers are retried; a failure keeps the completed windows only
+            nvd_sync.RETRY_DELAY = 0
+            nvd.throttle = 2
+            retried = await fetch_nvd_delta(session, first.sync_state, url=url, now=later, api_key='key')
+            assert retried.status == 'updated' and retried.requests == 3
+            nvd.throttle = 100
+            failed = await fetch_nvd_delta(session, first.sync_state, url=url, now=later, api_key='key')
+            assert failed.status == 'error' and failed.vulnerabilities == [] and failed.sync_state == first.sync_state
+            nvd.throttle = 0
+
+            # Newest published, read from the tail of the oldest-first listing
+            latest = await fetch_nvd_latest(session, count=5, url=url, now=later, api_key='key')
+            assert [c['id'] for c in latest] == ['CVE-2026-09001', 'CVE-2026-04319', 'CVE-2026-04318', 'CVE-2026-04317', 'CVE-2026-04316']
+            assert nvd_item(latest[0])['severity'] == 'HIGH'
+            return first.bytes_read, delta.bytes_read
+        finally:
+            nvd_sync.RETRY_DELAY = 6.0
+            await http_client.close()
+            await runner.cleanup()
+
+    first_read, delta_read = asyncio.run(run())
+    print(f"✅ First sync paged through {first_read / 1024:.0f} KB; the next poll read {delta_read / 1024:.1f} KB")
+
+
+def test_rate_limiter_paces_rolling_window():
+    async def run():
+        limiter = NVDRateLimiter(5, 0.5)
+        start = time.monotonic()
+        sent = []
+
+        async def request():
+            await limiter.wait()
+            sent.append(time.monotonic() - start)
+
+        await asyncio.gather(*(request() for _ in range(12)))
+        return sorted(sent)
+
+    sent = asyncio.run(run())
+    # No more than 5 requests in any 0.5 s window
+    for i in range(len(sent) - 5):
+        assert sent[i + 5] - sent[i] >= 0.49, sent
+    assert sent[4] < 0.1 and sent[-1] < 1.2, sent
+    print("✅ Requests are paced to the rolling-window limit")
+
+
+if __name__ == "__main__":
+    test_delta_pages_through_the_changed_window()
+    test_rate_limiter_paces_rolling_window()
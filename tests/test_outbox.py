@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Test the persistent outbox: priority lanes, retries, claims and deferred seen-marking (no network needed)"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+import discord
+from aiohttp import web
+from cogs.news_manager import NewsManager
+from utils.news_fetcher import OptimizedNewsFetcher
+from utils.http_client import HTTPClient
+from utils.outbox import Outbox, outbox_key, MAX_ATTEMPTS
+
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>Patch Tuesday fixes {n} bugs</title><link>https://example.com/{n}</link><guid>story-{n}</guid></item>
+</channel></rss>"""
+
+
+class _Message:
+    def __init__(self, channel, message_id):
+        self.channel = channel
+        self.id = message_id
+        self.jump_url = f"https://discord.com/channels/1/{channel.id}/{message_id}"
+
+
+class _Channel:
+    """Records every send; fails while self.down is set."""
+
+    def __init__(self, channel_id=99, down=False, delay=0):
+        self.id = channel_id
+        self.down = down
+        self.delay = delay
+        self.titles = []
+
+    async def send(self, embed=None, embeds=None, reference=None, mention_author=False):
+        await asyncio.sleep(self.delay)
+        if self.down:
+            raise RuntimeError("HTTP 503")
+        self.titles.extend(e.title for e in (embeds or [embed]))
+        return _Message(self, 1000 + len(self.titles))
+
+
+def test_priority_lanes_and_idempotent_enqueue():
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Outbox(f'{tmp}/outbox.db')
+        channel = _Channel()
+        for category, title in [('gaming', 'Console sale'), ('tech', 'Kernel release'), ('kev', 'CVE-2026-0001')]:
+            assert outbox.enqueue(outbox_key(category, title), category, discord.Embed(title=title), channel_id=99)
+        assert not outbox.enqueue(outbox_key('kev', 'CVE-2026-0001'), 'kev', discord.Embed(title='again'), channel_id=99)
+
+        delivered = asyncio.run(outbox.drain(lambda channel_id: channel))
+        assert delivered == 3
+        assert channel.titles == ['CVE-2026-0001', 'Kernel release', 'Console sale'], channel.titles
+
+        # Delivered keys are remembered, so a re-fetched item is not queued again
+        assert not outbox.enqueue(outbox_key('tech', 'Kernel release'), 'tech', discord.Embed(title='x'), channel_id=99)
+        assert outbox.delivered([outbox_key('tech', 'Kernel release'), 'tech:unknown']) == {'tech:Kernel release'}
+        outbox.close()
+    print("✅ KEV lane delivered before news and gaming, duplicates not queued")
+
+
+def test_retry_backoff_and_unrouted_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        outbox = Outbox(f'{tmp}/outbox.db')
+        outbox.enqueue('tech:a', 'tech', discord.Embed(title='A'), channel_id=99)
+        outbox.enqueue('tech:webhook', 'tech', discord.Embed(title='W'))  # Only a runner can deliver this
+        channel = _Channel(down=True)
+        resolve = lambda channel_id: channel if channel_id == 99 else None
+
+        assert asyncio.run(outbox.drain(resolve)) == 0
+        row = outbox.conn.execute("SELECT status, attempts FROM outbox WHERE key = 'tech:a'").fetchone()
+        assert tuple(row) == ('pending', 1), tuple(row)
+        row = outbox.conn.execute("SELECT status, attempts FROM outbox WHERE key = 'tech:webhook'").fetchone()
+        assert tuple(row) == ('pending', 0), "Unrouted rows wait without using up attempts"
+
+        # Backed off: nothing is due until next_attempt passes
+        channel.down = False
+        assert asyncio.run(outbox.drain(resolve)) == 0
+        outbox.conn.execute("UPDATE outbox SET next_attempt = 0")
+        assert asyncio.run(outbox.drain(resolve)) == 1 and channel.titles == ['A']
+
+        # A row that keeps failing is eventually given up on
+        outbox.enqueue('tech:b', 'tech', discord.Embed(title='B'), channel_id=99)
+        channel.down = True
+        for _ in range(MAX_ATTEMPTS):
+            outbox.conn.execute("UPDATE outbox SET next_attempt = 0 WHERE key = 'tech:b'")
+            asyncio.run(outbox.drain(resolve))
+        assert outbox.counts(['tech']) == {'sent': 1, 'pending': 1, 'dead': 1}, outbox.counts(['tech'])
+
+        # The bot leaves webhook rows alone, so they are still due when the runner drains
+        outbox.enqueue('tech:webhook-2', 'tech', discord.Embed(title='W2'))
+        outbox.conn.execute("UPDATE outbox SET next_attempt = 0 WHERE key LIKE 'tech:webhook%'")
+        assert asyncio.run(outbox.drain(resolve, channels_only=True)) == 0
+        webhook = _Channel()
+        assert asyncio.run(outbox.drain(lambda channel_id: webhook, categories=['tech'])) == 2
+        assert webhook.titles == ['W', 'W2'], webhook.titles
+        outbox.close()
+    print("✅ Failed sends back off and retry, unrouted rows stay queued, hopeless rows go dead")
+
+
+def test_two_processes_never_double_post():
+    async def run(path):
+        first, second = Outbox(path), Outbox(path)
+        for n in range(250):
+            first.enqueue(f'tech:{n}', 'tech', discord.Embed(title=f'Story {n}'), channel_id=99)
+        channel = _Channel(delay=0.001)
+        counts = await asyncio.gather(
+            first.drain(lambda channel_id: channel),
+            second.drain(lambda channel_id: channel)
+        )
+        first.close()
+        second.close()
+        return counts, channel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counts, channel = asyncio.run(run(f'{tmp}/outbox.db'))
+    assert sum(counts) == 250 and sorted(channel.titles) == sorted(f"Story {n}" for n in range(250))
+    print(f"✅ Two drainers on one spool split the work ({counts}) without duplicates")
+
+
+def test_items_marked_seen_only_after_delivery():
+    async def run(tmp):
+        app = web.Application()
+        app.router.add_get('/feed', lambda request: web.Response(text=FEED.format(n=1)))
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        sources = {'source': {'name': 'Source', 'url': f'http://127.0.0.1:{port}/feed'}}
+
+        channel = _Channel(down=True)
+
+        class _Bot:
+            outbox = Outbox(f'{tmp}/outbox.db')
+            story_index = None
+
+            async def drain_outbox(self):
+                return await self.outbox.drain(lambda channel_id: channel)
+
+        bot = _Bot()
+        manager = NewsManager(bot=None)
+        manager.bot = bot
+        manager.config = {'tech': {'channel_id': 99, 'use_etag_cache': False, 'sources': {}}}
+
+        http_client = HTTPClient()
+        fetcher = OptimizedNewsFetcher(cache_file=f'{tmp}/cache.db', http_client=http_client)
+        cycles = []
+        try:
+            for down in (True, False, False):
+                channel.down = down
+                bot.outbox.conn.execute("UPDATE outbox SET next_attempt = 0")
+                items = await manager.fetch_new_items('tech', fetcher, sources)
+                delivered = await manager.deliver('tech', fetcher, items, [discord.Embed(title=i[1]) for i in items])
+                cycles.append((len(items), len(delivered)))
+        finally:
+            bot.outbox.close()
+            await fetcher.close()
+            await http_client.close()
+            await runner.cleanup()
+        return cycles, channel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cycles, channel = asyncio.run(run(tmp))
+
+    # Failed delivery: the item stays unseen, is fetched again, and posted exactly once
+    assert cycles == [(1, 0), (1, 1), (0, 0)], cycles
+    assert channel.titles == ['Patch Tuesday fixes 1 bugs']
+    print("✅ Undelivered items stay unseen and are posted once when delivery succeeds")
+
+
+if __name__ == "__main__":
+    test_priority_lanes_and_idempotent_enqueue()
+    test_retry_backoff_and_unrouted_rows()
+    test_two_processes_never_double_post()
+    test_items_marked_seen_only_after_delivery()
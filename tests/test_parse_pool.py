@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test that large feed documents are parsed off the event loop (no network needed)"""
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from utils import parse_pool
+from utils.parse_pool import ParsePool, configure_parse_pool, get_parse_pool
+from utils.news_fetcher import _parse_feed_document
+
+ITEM = """<item>
+<title><![CDATA[Story {n}]]></title>
+<link>https://example.com/story-{n}</link>
+<guid>story-{n}</guid>
+<description><![CDATA[<p>{body}</p>]]></description>
+</item>"""
+
+N_ITEMS = 600
+BIG_FEED = "<rss><channel>{}</channel></rss>".format(
+    '\n'.join(ITEM.format(n=n, body='<b>word</b> ' * 200) for n in range(N_ITEMS))
+)
+
+
+async def _max_loop_lag(pool: ParsePool) -> float:
+    """Parse the big feed via the pool while measuring the worst event-loop stall (ms)."""
+    lag = 0.0
+    done = False
+
+    async def ticker():
+        nonlocal lag
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, (time.perf_counter() - start - 0.001) * 1000)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    items = await pool.run(len(BIG_FEED), _parse_feed_document,
+                           BIG_FEED, 'https://example.com', 'Big', frozenset(), 10000, False, process=True)
+    done = True
+    await tick
+    assert len(items) == N_ITEMS, len(items)
+    return lag
+
+
+def test_offload_keeps_event_loop_responsive():
+    inline = asyncio.run(_max_loop_lag(ParsePool(threshold=float('inf'))))
+    pool = ParsePool(max_workers=1)
+    try:
+        offloaded = asyncio.run(_max_loop_lag(pool))
+    finally:
+        pool.close()
+    assert offloaded < inline, (offloaded, inline)
+    print(f"✅ Max loop lag: {inline:.1f} ms inline -> {offloaded:.1f} ms offloaded")
+
+
+def test_small_documents_stay_inline():
+    pool = ParsePool(threshold=1024)
+
+    async def run():
+        return await pool.run(10, lambda: threading.current_thread() is threading.main_thread())
+
+    assert asyncio.run(run()), "Small documents should not pay for a pool round-trip"
+    pool.close()
+    print("✅ Small documents parsed inline")
+
+
+def test_pool_propagates_errors():
+    pool = ParsePool(threshold=0)
+
+    async def run():
+        import xml.etree.ElementTree as ET
+        try:
+            await pool.run(1, ET.fromstring, '<broken')
+        except ET.ParseError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    pool.close()
+    print("✅ Parse errors reach the caller")
+
+
+def test_runner_pool_uses_threads_only():
+    saved = parse_pool._parse_pool
+    try:
+        pool = configure_parse_pool(use_processes=False, threshold=0)
+        assert get_parse_pool() is pool
+
+        async def run():
+            return await pool.run(1, _parse_feed_document, BIG_FEED, 'https://example.com', 'Big',
+                                  frozenset(), 10000, False, process=True)
+
+        assert len(asyncio.run(run())) == N_ITEMS
+        assert pool._processes is None, "No worker processes are spawned"
+        pool.close()
+    finally:
+        parse_pool._parse_pool = saved
+    print("✅ Runner parse pool parses on threads without spawning processes")
+
+
+if __name__ == "__main__":
+    test_offload_keeps_event_loop_responsive()
+    test_small_documents_stay_inline()
+    test_pool_propagates_errors()
+    test_runner_pool_uses_threads_only()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test the manual-command response cache: TTL, request coalescing and failure handling (no network needed)"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from utils import response_cache
+from utils.response_cache import ResponseCache
+
+
+class _Source:
+    """Slow fetch that counts its calls."""
+
+    def __init__(self, result=('item',), delay=0.05):
+        self.result = list(result)
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("source down")
+        return self.result
+
+
+def test_concurrent_callers_share_one_fetch():
+    async def run():
+        cache = ResponseCache(ttl=300)
+        nvd, ubuntu = _Source(['nvd']), _Source(['ubuntu'])
+
+        # Ten users at once, two sources each: one fetch per source, run side by side
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*(
+            asyncio.gather(cache.get(('cve', 'nvd'), nvd.fetch), cache.get(('cve', 'ubuntu'), ubuntu.fetch))
+            for _ in range(10)
+        ))
+        elapsed = loop.time() - start
+        assert all(result == [['nvd'], ['ubuntu']] for result in results)
+        assert (nvd.calls, ubuntu.calls) == (1, 1) and elapsed < 0.09, elapsed
+
+        # Served from memory afterwards
+        assert await cache.get(('cve', 'nvd'), nvd.fetch) == ['nvd'] and nvd.calls == 1
+
+        # A caller that is cancelled does not cancel the fetch the others wait for
+        cache.invalidate()
+        first = asyncio.ensure_future(cache.get('kev', nvd.fetch))
+        second = asyncio.ensure_future(cache.get('kev', nvd.fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == ['nvd'] and nvd.calls == 2
+
+    asyncio.run(run())
+    print("✅ Concurrent callers await one in-flight fetch; sources are fetched side by side")
+
+
+def test_expiry_and_failures():
+    async def run():
+        clock = [1000.0]
+        saved_monotonic = response_cache.time.monotonic
+        response_cache.time.monotonic = lambda: clock[0]
+        try:
+            cache = ResponseCache(ttl=300)
+            source = _Source(delay=0)
+            await cache.get('kev', source.fetch)
+            clock[0] += 299
+            await cache.get('kev', source.fetch)
+            assert source.calls == 1
+            clock[0] += 2
+            await cache.get('kev', source.fetch)
+            assert source.calls == 2, "Expired results are fetched again"
+
+            # Failures and empty results are not cached
+            source.fail = True
+            cache.invalidate('kev')
+            for _ in range(2):
+                try:
+                    await cache.get('kev', source.fetch)
+                    assert False, "The error reaches the caller"
+                except ConnectionError:
+                    pass
+            empty = _Source(result=[], delay=0)
+            await cache.get('empty', empty.fetch)
+            await cache.get('empty', empty.fetch)
+            assert (source.calls, empty.calls) == (4, 2)
+        finally:
+            response_cache.time.monotonic = saved_monotonic
+
+    asyncio.run(run())
+    print("✅ Cached results expire after the TTL; failures and empty results are retried")
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_fetch()
+    test_expiry_and_failures()
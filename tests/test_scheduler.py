@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Test the unified job scheduler (no network or Discord connection needed)"""
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from utils.scheduler import Scheduler, ScheduledJob
+
+
+def test_slots_follow_offset():
+    job = ScheduledJob('tech', None, interval=3 * 3600, offset=30 * 60, jitter=0, catch_up='once')
+    midnight = 1_700_006_400  # 2023-11-15 00:00:00 UTC
+    assert job.slot_before(midnight + 3600) == midnight + 30 * 60
+    assert job.next_slot(midnight + 3600) == midnight + 3 * 3600 + 30 * 60
+    job.max_jitter = 3600
+    assert job.jitter == 3 * 3600 / 4, "Jitter is capped at a quarter of the interval"
+    print("✅ Runs land on interval + offset slots from midnight UTC")
+
+
+def test_catch_up_policies():
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = f'{tmp}/scheduler_state.json'
+        with open(state_file, 'w') as f:
+            json.dump({'missed_once': 0, 'missed_skip': 0, 'up_to_date': int(time.time())}, f)
+
+        scheduler = Scheduler(state_file=state_file)
+        now = time.time()
+        once = scheduler.register('missed_once', None, interval=3600, jitter=0)
+        skip = scheduler.register('missed_skip', None, interval=3600, jitter=0, catch_up='skip')
+        fresh = scheduler.register('up_to_date', None, interval=3600, jitter=0)
+        never = scheduler.register('never_ran', None, interval=3600, jitter=0)
+
+        assert once.next_run <= now + 1, "Missed slot with 'once' runs at startup"
+        assert never.next_run <= now + 1, "A job without history runs at startup"
+        assert skip.next_run > now and skip.next_run == skip.slot_before(now) + 3600
+        assert fresh.next_run > now, "A job that ran this slot waits for the next one"
+    print("✅ Missed slots are caught up once or skipped per job")
+
+
+def test_concurrency_cap_and_pause():
+    running = 0
+    peak = 0
+    calls = []
+
+    async def make_job(name):
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            calls.append(name)
+            await asyncio.sleep(0.1)
+            running -= 1
+        return job
+
+    async def run(tmp):
+        scheduler = Scheduler(max_concurrent=2, state_file=f'{tmp}/state.json')
+        for n in range(5):
+            scheduler.register(f'job{n}', await make_job(f'job{n}'), interval=3600, jitter=0)
+        scheduler.register('paused', await make_job('paused'), interval=3600, paused=True)
+        scheduler.start()
+        await asyncio.sleep(0.5)
+
+        statuses = {job['name']: job for job in scheduler.status()}
+        assert statuses['paused']['state'] == 'paused'
+        assert all(statuses[f'job{n}']['runs'] == 1 for n in range(5)), statuses
+
+        scheduler.resume('paused', run_now=True)
+        await asyncio.sleep(0.2)
+        await scheduler.close()
+
+        with open(f'{tmp}/state.json') as f:
+            return json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = asyncio.run(run(tmp))
+
+    assert peak == 2, f"At most 2 jobs should run at once, saw {peak}"
+    assert sorted(calls) == ['job0', 'job1', 'job2', 'job3', 'job4', 'paused']
+    assert set(state) == set(calls), "Last run times are persisted for catch-up"
+    print("✅ Global concurrency cap, pause/resume and state persistence")
+
+
+def test_reschedule_before_register():
+    """NewsManager may load before the cog that owns a category's job."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scheduler = Scheduler(state_file=f'{tmp}/state.json')
+        scheduler.reschedule('tech', interval=4 * 3600, offset=30 * 60)
+        job = scheduler.register('tech', None, interval=6 * 3600)
+        assert (job.interval, job.offset) == (4 * 3600, 30 * 60)
+
+        scheduler.reschedule('tech', interval=2 * 3600)
+        assert (job.interval, job.offset) == (2 * 3600, 30 * 60)
+    print("✅ Timing set before registration is applied on register")
+
+
+if __name__ == "__main__":
+    test_slots_follow_offset()
+    test_catch_up_policies()
+    test_concurrency_cap_and_pause()
+    test_reschedule_before_register()
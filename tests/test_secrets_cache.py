@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Test that secret lookups share one cached, pooled fetch per backend and the encrypted snapshot (fake SDKs, no network needed)"""
+import json
+import os
+import sys
+import tempfile
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+from utils import secrets
+from utils.secrets import SecretsResolver, SecretsSnapshot
+
+
+class _Calls:
+    clients = 0
+    fetches = 0
+    fail = False
+
+
+def _fake_dopplersdk():
+    class _Secrets:
+        def list(self, project, config):
+            _Calls.fetches += 1
+            if _Calls.fail:
+                raise ConnectionError("doppler down")
+            return types.SimpleNamespace(secrets={
+                'DISCORD_BOT_TOKEN': {'raw': 'raw-token', 'computed': 'bot-token'},
+                'NASA_API_KEY': {'raw': 'nasa-key'},
+                'CHECK_INTERVAL': {'computed': '60'}
+            })
+
+    class DopplerSDK:
+        def __init__(self):
+            _Calls.clients += 1
+            self.secrets = _Secrets()
+
+        def set_access_token(self, token):
+            self.token = token
+
+    return types.SimpleNamespace(DopplerSDK=DopplerSDK)
+
+
+def _fake_boto3():
+    class _Client:
+        def get_secret_value(self, SecretId):
+            _Calls.fetches += 1
+            return {'SecretString': json.dumps({'api_key': f'{SecretId}-key', 'client_id': 'id'})}
+
+    def client(service):
+        _Calls.clients += 1
+        return _Client()
+
+    return types.SimpleNamespace(client=client)
+
+
+@contextmanager
+def _fakes(**env):
+    """Fake SDKs, a fresh resolver and the given environment, restored afterwards."""
+    _Calls.clients = _Calls.fetches = 0
+    _Calls.fail = False
+    saved_modules = {name: sys.modules.get(name) for name in ('dopplersdk', 'boto3')}
+    saved_env = dict(os.environ)
+    saved_resolver = secrets._resolver
+    saved_monotonic = secrets.time.monotonic
+
+    sys.modules['dopplersdk'] = _fake_dopplersdk()
+    sys.modules['boto3'] = _fake_boto3()
+    secrets._resolver = SecretsResolver(ttl=300)
+    for name in ('DOPPLER_TOKEN', 'SECRETS_MANAGER', 'SECRETS_AWS_NAME', 'DISCORD_BOT_TOKEN'):
+        os.environ.pop(name, None)
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        os.environ.clear()
+        os.environ.update(saved_env)
+        secrets._resolver = saved_resolver
+        secrets.time.monotonic = saved_monotonic
+
+
+def test_doppler_fetched_once_for_many_keys():
+    with _fakes(DOPPLER_TOKEN='dp.st.test'):
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        assert secrets.get_secret('NASA', 'api_key') == 'nasa-key'
+        assert secrets.get_secret('Bot', 'check_interval') == '60'
+        assert secrets.load_secrets_from_doppler('nasa') == {'api_key': 'nasa-key'}
+        assert (_Calls.clients, _Calls.fetches) == (1, 1), (_Calls.clients, _Calls.fetches)
+
+        # An explicit refresh re-fetches, reusing the pooled client
+        assert secrets.refresh_secrets() == 1
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        assert (_Calls.clients, _Calls.fetches) == (1, 2), (_Calls.clients, _Calls.fetches)
+    print("✅ Doppler secrets fetched once per snapshot, client reused across refreshes")
+
+
+def test_aws_client_pooled_per_process():
+    with _fakes(SECRETS_MANAGER='aws', SECRETS_AWS_NAME='penguin/prod'):
+        for key in ('api_key', 'client_id', 'api_key'):
+            assert secrets.get_secret('Discord', key, secret_name_env='SECRETS_AWS_NAME')
+        assert secrets.load_secrets_from_aws('penguin/other')['api_key'] == 'penguin/other-key'
+        # One client, one fetch per distinct secret
+        assert (_Calls.clients, _Calls.fetches) == (1, 2), (_Calls.clients, _Calls.fetches)
+    print("✅ AWS secrets fetched once per secret through one pooled client")
+
+
+def test_expiry_and_failure_backoff():
+    with _fakes(DOPPLER_TOKEN='dp.st.test', DISCORD_BOT_TOKEN='env-token'):
+        clock = [1000.0]
+        secrets.time.monotonic = lambda: clock[0]
+
+        # Failed fetch: fall back to the env var and don't hammer the backend
+        _Calls.fail = True
+        assert secrets.get_secret('Discord', 'bot_token') == 'env-token'
+        assert secrets.get_secret('Discord', 'bot_token') == 'env-token'
+        assert _Calls.fetches == 1
+
+        _Calls.fail = False
+        clock[0] += secrets.FAILURE_TTL + 1
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        assert _Calls.fetches == 2
+
+        clock[0] += 299
+        secrets.get_secret('Discord', 'bot_token')
+        assert _Calls.fetches == 2, "Still within the TTL"
+        clock[0] += 2
+        secrets.get_secret('Discord', 'bot_token')
+        assert _Calls.fetches == 3, "Expired snapshot is re-fetched"
+    print("✅ Snapshots expire after the TTL, failures are retried after a short backoff")
+
+
+def test_encrypted_snapshot_serves_cold_starts():
+    with _fakes(DOPPLER_TOKEN='dp.st.test'), tempfile.TemporaryDirectory() as tmp:
+        path = f'{tmp}/secrets.snapshot'
+
+        def new_process(ttl=300, master_key='correct horse', max_age=3600):
+            secrets._resolver = SecretsResolver(ttl=ttl, store=SecretsSnapshot(path, master_key, max_age=max_age))
+            return secrets._resolver
+
+        new_process()
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        assert _Calls.fetches == 1
+        with open(path) as f:
+            on_disk = f.read()
+        assert 'bot-token' not in on_disk and 'dp.st.test' not in on_disk, "Snapshot must be encrypted"
+        assert oct(os.stat(path).st_mode & 0o777) == '0o600'
+
+        # A fresh snapshot: the next process starts without asking the backend
+        new_process()
+        assert secrets.get_secret('NASA', 'api_key') == 'nasa-key'
+        assert _Calls.fetches == 1
+
+        # Older than the TTL: served from disk, refreshed in the background,
+        # and still served while the backend is down
+        _Calls.fail = True
+        resolver = new_process(ttl=0)
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        resolver.wait()
+        assert _Calls.fetches == 2
+
+        # Beyond max age or with the wrong master key the snapshot is not used
+        new_process(max_age=-1)
+        assert secrets.get_secret('Discord', 'bot_token') is None
+        new_process(master_key='wrong')
+        assert secrets.get_secret('Discord', 'bot_token') is None
+        assert _Calls.fetches == 4
+
+        # An explicit refresh also drops the stored copy
+        _Calls.fail = False
+        new_process()
+        secrets.refresh_secrets()
+        assert secrets.get_secret('Discord', 'bot_token') == 'bot-token'
+        assert _Calls.fetches == 5
+    print("✅ Encrypted snapshot serves cold starts and outages within its max age")
+
+
+if __name__ == "__main__":
+    test_doppler_fetched_once_for_many_keys()
+    test_aws_client_pooled_per_process()
+    test_expiry_and_failure_backoff()
+    test_encrypted_snapshot_serves_cold_starts()
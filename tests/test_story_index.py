@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test cross-source near-duplicate detection in StoryIndex (no network needed)"""
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "penguin-overlord"))
+
+import asyncio
+from utils.story_index import StoryIndex, post_story
+
+TITLE = "Hackers breach Acme Corp and steal data of 1.2 million customers"
+DESCRIPTION = "Acme Corp confirmed a data breach after a ransomware gang leaked customer records on its extortion site."
+
+REWORDED_TITLE = "Acme Corp data breach exposes 1.2 million customers"
+REWORDED_DESCRIPTION = "Acme Corp confirmed a data breach after ransomware gang leaked customer records"
+
+
+class FakeChannel:
+    """Just enough of a TextChannel for post_story."""
+
+    def __init__(self, channel_id: int = 1):
+        self.id = channel_id
+        self.sent = []
+
+    async def send(self, embed=None, **kwargs):
+        message = type('Message', (), {})()
+        message.id = len(self.sent) + 100
+        message.channel = self
+        message.jump_url = f'https://discord.com/channels/1/{self.id}/{message.id}'
+        self.sent.append((embed, kwargs))
+        return message
+
+
+def test_near_duplicate_from_other_source():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StoryIndex(f'{tmp}/stories.db')
+        index.add(TITLE, DESCRIPTION, 'https://a.example/1', 'cybersecurity', 'BleepingComputer')
+
+        match = index.find_duplicate(REWORDED_TITLE, REWORDED_DESCRIPTION, 'https://b.example/2')
+        assert match and match['source'] == 'BleepingComputer', match
+        assert index.find_duplicate("Apple releases iOS 19.1", "Bug fixes and security updates") is None
+        assert index.find_duplicate("Unrelated", "", 'https://a.example/1')['similarity'] == 1.0
+        index.close()
+    print("✅ Near-duplicate matched across sources")
+
+
+def test_window_expiry():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StoryIndex(f'{tmp}/stories.db', window_hours=1)
+        index.add(TITLE, DESCRIPTION, now=time.time() - 7200)
+        assert index.find_duplicate(TITLE, DESCRIPTION) is None
+        index.prune()
+        assert index.count() == 0
+        index.close()
+    print("✅ Stories outside the window are forgotten")
+
+
+def test_post_story_modes():
+    async def run(mode):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = StoryIndex(f'{tmp}/stories.db')
+            channel = FakeChannel()
+            first = await post_story(channel, None, index, TITLE, DESCRIPTION, 'https://a.example/1',
+                                     'cybersecurity', 'BleepingComputer', mode)
+            second = await post_story(channel, None, index, REWORDED_TITLE, REWORDED_DESCRIPTION,
+                                      'https://b.example/2', 'tech', 'SecurityWeek', mode)
+            index.close()
+            return first, second, channel.sent
+
+    first, second, sent = asyncio.run(run('suppress'))
+    assert first and second is None and len(sent) == 1
+
+    first, second, sent = asyncio.run(run('thread'))
+    assert second and sent[1][1]['reference'].message_id == first.id
+
+    _, second, sent = asyncio.run(run('off'))
+    assert second and 'reference' not in sent[1][1]
+    print("✅ post_story suppresses, threads or posts duplicates")
+
+
+def test_lookup_time_with_large_window():
+    """The LSH probe is one indexed query, so lookups stay fast as the window grows."""
+    rng = random.Random(7)
+    words = [f'word{n}' for n in range(5000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = StoryIndex(f'{tmp}/stories.db')
+        for n in range(1000):
+            index.add(' '.join(rng.sample(words, 10)), ' '.join(rng.sample(words, 20)), f'link-{n}')
+
+        queries = [(' '.join(rng.sample(words, 10)), ' '.join(rng.sample(words, 20))) for _ in range(200)]
+        start = time.perf_counter()
+        for title, description in queries:
+            index.find_duplicate(title, description)
+        per_lookup_ms = (time.perf_counter() - start) / len(queries) * 1000
+        index.close()
+    assert per_lookup_ms < 5, per_lookup_ms
+    print(f"✅ Lookup with 1000 stories: {per_lookup_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    test_near_duplicate_from_other_source()
+    test_window_expiry()
+    test_post_story_modes()
+    test_lookup_time_with_large_window()